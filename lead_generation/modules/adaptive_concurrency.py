@@ -0,0 +1,247 @@
+"""
+Adaptive Concurrency
+AIMD control of LinkedIn batch size and parallel batch count
+
+LinkedIn enrichment used a fixed 3 parallel batches of 15 URLs. That leaves the
+actor idle when the account has headroom and overloads it when runs start
+timing out. The controller grows batch size and parallelism additively while
+runs are fast and healthy, and cuts them multiplicatively on failures, 429s
+or latency above target. State is kept per Apify account.
+"""
+
+import hashlib
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Tuple
+
+from .cache_store import MISS, SupabaseCacheBackend, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limits for batch size and parallelism"""
+
+    def __init__(self, batch_size: int = 15, parallel_batches: int = 3,
+                 min_batch_size: int = 5, max_batch_size: int = 50,
+                 min_parallel: int = 1, max_parallel: int = 8,
+                 target_latency: float = 120.0, batch_step: int = 5, parallel_step: int = 1,
+                 decrease_factor: float = 0.5, window: int = 3):
+        """
+        Args:
+            batch_size / parallel_batches: Starting point (the previous fixed values)
+            target_latency: Run duration in seconds above which the actor counts as saturated
+            batch_step / parallel_step: Additive increase applied after a healthy window
+            decrease_factor: Multiplier applied on failure, 429 or timeout
+            window: Healthy runs required before each additive increase
+        """
+        self.batch_size = batch_size
+        self.parallel_batches = parallel_batches
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.min_parallel = min_parallel
+        self.max_parallel = max_parallel
+        self.target_latency = target_latency
+        self.batch_step = batch_step
+        self.parallel_step = parallel_step
+        self.decrease_factor = decrease_factor
+        self.window = window
+
+        self._healthy_streak = 0
+        self._grow_parallel_next = True
+        self._lock = threading.Lock()
+        self.stats = {'runs': 0, 'failures': 0, 'rate_limited': 0, 'slow_runs': 0,
+                      'increases': 0, 'decreases': 0}
+
+    def limits(self) -> Dict[str, int]:
+        """Return the current {'batch_size', 'parallel_batches'}"""
+        with self._lock:
+            return {'batch_size': self.batch_size, 'parallel_batches': self.parallel_batches}
+
+    def restore(self, state: Dict[str, int]):
+        """Resume from limits saved by a previous run, clamped to the configured bounds"""
+        with self._lock:
+            self.batch_size = min(max(int(state.get('batch_size', self.batch_size)), self.min_batch_size),
+                                  self.max_batch_size)
+            self.parallel_batches = min(max(int(state.get('parallel_batches', self.parallel_batches)),
+                                            self.min_parallel), self.max_parallel)
+
+    def record(self, latency: float, success: bool = True, rate_limited: bool = False):
+        """Feed back one actor run and adjust limits"""
+        self.record_wave([(latency, success, rate_limited)])
+
+    def record_wave(self, runs: List[Tuple[float, bool, bool]]):
+        """
+        Feed back the (latency, success, rate_limited) runs of one parallel wave.
+
+        Runs in a wave hit the same congestion, so the wave applies at most one
+        decrease, picked by its worst outcome.
+        """
+        with self._lock:
+            self.stats['runs'] += len(runs)
+            self.stats['rate_limited'] += sum(1 for _, _, rate_limited in runs if rate_limited)
+            self.stats['failures'] += sum(1 for _, success, _ in runs if not success)
+            slow_runs = sum(1 for latency, success, _ in runs if success and latency > self.target_latency)
+
+            if any(rate_limited for _, _, rate_limited in runs):
+                # 429s mean too many concurrent runs for the account - shed parallelism first
+                self._decrease(parallel=True, batch=False)
+            elif not all(success for _, success, _ in runs):
+                self._decrease(parallel=True, batch=True)
+            elif slow_runs:
+                # Slow but healthy runs - smaller batches finish inside the actor timeout
+                self.stats['slow_runs'] += slow_runs
+                self._decrease(parallel=False, batch=True)
+            else:
+                for _ in runs:
+                    self._healthy_streak += 1
+                    if self._healthy_streak >= self.window:
+                        self._healthy_streak = 0
+                        self._increase()
+
+    def _increase(self):
+        # Alternate the two knobs so neither runs away on its own
+        if self._grow_parallel_next and self.parallel_batches < self.max_parallel:
+            self.parallel_batches = min(self.parallel_batches + self.parallel_step, self.max_parallel)
+        elif self.batch_size < self.max_batch_size:
+            self.batch_size = min(self.batch_size + self.batch_step, self.max_batch_size)
+        elif self.parallel_batches < self.max_parallel:
+            self.parallel_batches = min(self.parallel_batches + self.parallel_step, self.max_parallel)
+        else:
+            return
+        self._grow_parallel_next = not self._grow_parallel_next
+        self.stats['increases'] += 1
+
+    def _decrease(self, parallel: bool, batch: bool):
+        self._healthy_streak = 0
+        if parallel:
+            self.parallel_batches = max(int(self.parallel_batches * self.decrease_factor), self.min_parallel)
+        if batch:
+            self.batch_size = max(int(self.batch_size * self.decrease_factor), self.min_batch_size)
+        self.stats['decreases'] += 1
+        logger.info(f"📉 Concurrency reduced to {self.parallel_batches} batches of {self.batch_size}")
+
+
+_controllers: Dict[str, AIMDController] = {}
+_controllers_lock = threading.Lock()
+
+STATE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+def _account_id(apify_key: str) -> str:
+    return hashlib.sha256((apify_key or '').encode()).hexdigest()[:16]
+
+
+def _state_cache(client) -> TTLCache:
+    return TTLCache('linkedin_concurrency', ttl_seconds=STATE_TTL_SECONDS,
+                    backend=SupabaseCacheBackend(client))
+
+
+def controller_for_account(apify_key: str, client=None, **kwargs) -> AIMDController:
+    """
+    Return the process-wide controller for an Apify account (keyed by a hash of the key).
+
+    With a Supabase client the limits learned by earlier campaigns are restored
+    from enrichment_cache, so each run starts where the last one converged.
+    """
+    account = _account_id(apify_key)
+    with _controllers_lock:
+        if account in _controllers:
+            return _controllers[account]
+        controller = AIMDController(**kwargs)
+        if client is not None:
+            state = _state_cache(client).get(account)
+            if state is not MISS and state:
+                controller.restore(state)
+                logger.info(f"⚙️ Restored LinkedIn concurrency: {controller.parallel_batches} batches "
+                            f"of {controller.batch_size}")
+        _controllers[account] = controller
+        return controller
+
+
+def save_controller_state(apify_key: str, client):
+    """Persist an account's current limits for the next campaign"""
+    account = _account_id(apify_key)
+    with _controllers_lock:
+        controller = _controllers.get(account)
+    if controller is not None:
+        _state_cache(client).set(account, controller.limits())
+
+
+RATE_LIMIT_MARKERS = ('rate limit', 'rate-limit', 'ratelimit', 'too many requests')
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Detect HTTP 429 responses raised by requests or the Apify client"""
+    status = getattr(error, 'status_code', None)
+    response = getattr(error, 'response', None)
+    if status is None and response is not None:
+        status = getattr(response, 'status_code', None)
+    if status == 429:
+        return True
+    # A bare '429' in the text could be part of an id or URL
+    message = str(error).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+def run_adaptive_batches(items: List[Any], run_batch: Callable[[List[Any]], List[Any]],
+                         controller: AIMDController, max_retries: int = 2, base_delay: float = 5.0,
+                         max_delay: float = 60.0, sleep: Callable[[float], None] = time.sleep) -> List[Any]:
+    """
+    Process items in batches whose size and parallelism follow the controller.
+
+    run_batch(batch) returns a list of results and raises on failure. Each wave
+    is cut with the limits current at that moment, and items of a failed batch
+    go back to the front of the queue (re-cut at the reduced batch size) up to
+    max_retries times, after an exponential backoff with full jitter.
+    """
+    pending = [(item, 0) for item in items]  # (item, failed attempts)
+    results: List[Any] = []
+
+    def timed(batch):
+        started = time.time()
+        try:
+            output = run_batch([item for item, _ in batch])
+            return batch, output, None, time.time() - started
+        except Exception as e:
+            return batch, None, e, time.time() - started
+
+    while pending:
+        limits = controller.limits()
+        wave = []
+        while pending and len(wave) < limits['parallel_batches']:
+            wave.append(pending[:limits['batch_size']])
+            pending = pending[limits['batch_size']:]
+
+        requeue = []
+        runs = []
+        with ThreadPoolExecutor(max_workers=len(wave)) as executor:
+            futures = [executor.submit(timed, batch) for batch in wave]
+            for future in as_completed(futures):
+                batch, output, error, latency = future.result()
+                if error is None:
+                    runs.append((latency, True, False))
+                    results.extend(output or [])
+                    continue
+
+                runs.append((latency, False, is_rate_limit_error(error)))
+                retryable = [(item, tries + 1) for item, tries in batch if tries < max_retries]
+                dropped = len(batch) - len(retryable)
+                if retryable:
+                    logger.warning(f"⚠️ Batch of {len(batch)} failed ({error}); retrying {len(retryable)} items")
+                    requeue.extend(retryable)
+                if dropped:
+                    logger.error(f"❌ {dropped} items failed after {max_retries} retries: {error}")
+
+        controller.record_wave(runs)
+        if requeue:
+            attempt = max(tries for _, tries in requeue)
+            delay = random.uniform(0, min(base_delay * 2 ** (attempt - 1), max_delay))
+            logger.info(f"⏳ Backing off {delay:.1f}s before retrying {len(requeue)} items")
+            sleep(delay)
+        pending = requeue + pending
+
+    return results
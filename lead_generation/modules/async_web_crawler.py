@@ -0,0 +1,314 @@
+"""
+Async Web Crawler
+Concurrent website fetching for the website_summaries / raw_contacts flow
+
+WebScraper.scrape_website_content fetched pages one at a time with blocking
+requests, so large contact lists spent most of their run time waiting on
+sockets. AsyncWebCrawler fetches many sites at once on a shared aiohttp
+connection pool while staying polite to each host: a per-host concurrency
+limit and minimum delay between requests, a cached robots.txt per host, a
+byte cap per page, and early abort (before the body is read) on non-HTML
+responses. Each site yields its homepage plus a few about/contact pages as
+text, with emails and phones extracted.
+
+aiohttp is optional; without it AIOHTTP_AVAILABLE is False and callers keep
+using the blocking WebScraper.
+"""
+
+import asyncio
+import html
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urldefrag, urlparse
+from urllib.robotparser import RobotFileParser
+
+from .contact_extraction import extract_contacts
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised when aiohttp is not installed
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; LeadGenBot/1.0)"
+
+HTML_CONTENT_TYPES = {'text/html', 'application/xhtml+xml'}
+
+# Links worth following from a homepage for contact details and company context
+CONTACT_PAGE_KEYWORDS = ('contact', 'about', 'team', 'staff', 'our-story', 'who-we-are')
+
+# Never request these - they can't be HTML
+SKIP_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.zip', '.mp4', '.mp3',
+    '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.css', '.js', '.ico', '.xml',
+)
+
+_HREF = re.compile(r"""href\s*=\s*["']([^"'#>]+)""", re.IGNORECASE)
+_INVISIBLE = re.compile(r"<(script|style|noscript|svg|template)\b.*?</\1\s*>|<!--.*?-->",
+                        re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class CrawlSkip(Exception):
+    """A page that was deliberately not fetched (robots, content type, status)"""
+
+
+def normalize_site_url(website: Optional[str]) -> Optional[str]:
+    """Return an absolute http(s) URL for a website field, or None"""
+    if not website or not website.strip():
+        return None
+    url = website.strip()
+    if not re.match(r'^https?://', url, re.IGNORECASE):
+        url = f"https://{url.lstrip('/')}"
+    return url if urlparse(url).netloc else None
+
+
+def html_to_text(page: str) -> str:
+    """Visible text of an HTML page, whitespace-collapsed"""
+    text = _TAG.sub(' ', _INVISIBLE.sub(' ', page))
+    return _WHITESPACE.sub(' ', html.unescape(text)).strip()
+
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower().split(':')[0]
+    return host[4:] if host.startswith('www.') else host
+
+
+def find_contact_links(page: str, base_url: str, limit: int) -> List[str]:
+    """Same-site links whose path suggests about/contact pages, in page order"""
+    if limit <= 0:
+        return []
+    site = _host(base_url)
+    links: List[str] = []
+    for href in _HREF.findall(page):
+        url, _ = urldefrag(urljoin(base_url, html.unescape(href.strip())))
+        parsed = urlparse(url)
+        path = parsed.path.lower()
+        if parsed.scheme not in ('http', 'https') or _host(url) != site:
+            continue
+        if path.endswith(SKIP_EXTENSIONS) or not any(k in path for k in CONTACT_PAGE_KEYWORDS):
+            continue
+        if url not in links and url.rstrip('/') != base_url.rstrip('/'):
+            links.append(url)
+        if len(links) >= limit:
+            break
+    return links
+
+
+class _HostGate:
+    """Per-host concurrency limit plus minimum spacing between request starts"""
+
+    def __init__(self, limit: int, delay: float):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.lock = asyncio.Lock()
+        self.delay = delay
+        self.next_start = 0.0
+
+    async def __aenter__(self):
+        await self.semaphore.acquire()
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            wait = self.next_start - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.next_start = loop.time() + self.delay
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+
+
+class RobotsCache:
+    """robots.txt rules fetched once per host and shared by every request"""
+
+    def __init__(self, user_agent: str = DEFAULT_USER_AGENT, timeout: float = 5.0):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._parsers: Dict[str, "asyncio.Task"] = {}
+
+    async def allowed(self, session, url: str) -> bool:
+        """Return whether url may be fetched; unreachable robots.txt allows everything"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin not in self._parsers:
+            self._parsers[origin] = asyncio.ensure_future(self._load(session, origin))
+        parser = await self._parsers[origin]
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+    async def _load(self, session, origin: str) -> Optional[RobotFileParser]:
+        parser = RobotFileParser()
+        try:
+            async with session.get(f"{origin}/robots.txt", timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                   allow_redirects=True) as response:
+                if response.status in (401, 403):
+                    parser.disallow_all = True
+                    return parser
+                if response.status >= 400:
+                    return None
+                body = await response.content.read(512 * 1024)
+                parser.parse(body.decode('utf-8', errors='ignore').splitlines())
+                return parser
+        except Exception as e:
+            logger.debug(f"robots.txt unavailable for {origin}: {e}")
+            return None
+
+
+class AsyncWebCrawler:
+    """Fetch many websites concurrently with per-host politeness"""
+
+    def __init__(self, max_concurrency: int = 64, per_host_limit: int = 2, per_host_delay: float = 0.5,
+                 timeout: float = 15.0, max_page_bytes: int = 1_500_000, max_pages_per_site: int = 3,
+                 max_content_chars: int = 20000, respect_robots: bool = True,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        """
+        Args:
+            max_concurrency: Sites crawled at once (also the connection pool size)
+            per_host_limit: Simultaneous requests to one host
+            per_host_delay: Minimum seconds between request starts on one host
+            timeout: Total seconds allowed per page
+            max_page_bytes: Stop reading a page body after this many bytes
+            max_pages_per_site: Homepage plus up to N-1 about/contact pages
+            max_content_chars: Cap on the combined text returned per site
+            respect_robots: Honour robots.txt (cached per host)
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for AsyncWebCrawler (pip install aiohttp)")
+
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.per_host_delay = per_host_delay
+        self.timeout = timeout
+        self.max_page_bytes = max_page_bytes
+        self.max_pages_per_site = max_pages_per_site
+        self.max_content_chars = max_content_chars
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+
+        self._gates: Dict[str, _HostGate] = {}
+        self._robots: Optional[RobotsCache] = None
+        self.stats = {'sites': 0, 'pages_fetched': 0, 'bytes_read': 0, 'robots_blocked': 0,
+                      'non_html_skipped': 0, 'truncated': 0, 'errors': 0, 'elapsed': 0.0}
+
+    def scrape_websites(self, websites: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Blocking entry point; returns {website: result} for every input website"""
+        return asyncio.run(self.scrape_websites_async(websites))
+
+    async def scrape_websites_async(self, websites: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Crawl websites concurrently; result dicts mirror scrape_website_content"""
+        started = time.time()
+        self._gates = {}
+        self._robots = RobotsCache(self.user_agent)
+        site_limit = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit,
+                                         ttl_dns_cache=300)
+        headers = {'User-Agent': self.user_agent, 'Accept': 'text/html,application/xhtml+xml'}
+
+        async with aiohttp.ClientSession(connector=connector, headers=headers,
+                                         timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            async def bounded(website):
+                async with site_limit:
+                    return website, await self._scrape_site(session, website)
+
+            pairs = await asyncio.gather(*(bounded(w) for w in dict.fromkeys(websites)))
+
+        self.stats['sites'] += len(pairs)
+        self.stats['elapsed'] += time.time() - started
+        rate = self.stats['pages_fetched'] / self.stats['elapsed'] if self.stats['elapsed'] else 0
+        logger.info(f"🌐 Crawled {len(pairs)} sites, {self.stats['pages_fetched']} pages "
+                    f"({rate:.1f} pages/s)")
+        return dict(pairs)
+
+    async def _scrape_site(self, session, website: str) -> Dict[str, Any]:
+        result = {'url': website, 'success': False, 'pages': [], 'content': '',
+                  'emails': [], 'phones': [], 'error': None}
+        url = normalize_site_url(website)
+        if not url:
+            result['error'] = 'invalid url'
+            return result
+
+        try:
+            final_url, homepage = await self._fetch(session, url)
+        except CrawlSkip as e:
+            result['error'] = str(e)
+            return result
+        except Exception as e:
+            self.stats['errors'] += 1
+            result['error'] = str(e) or type(e).__name__
+            return result
+
+        pages = [(final_url, homepage)]
+        links = find_contact_links(homepage, final_url, self.max_pages_per_site - 1)
+        if links:
+            fetched = await asyncio.gather(*(self._fetch(session, link) for link in links),
+                                           return_exceptions=True)
+            for outcome in fetched:
+                if isinstance(outcome, CrawlSkip):
+                    continue
+                if isinstance(outcome, Exception):
+                    self.stats['errors'] += 1
+                    continue
+                pages.append(outcome)
+
+        emails: Dict[str, None] = {}
+        phones: Dict[str, None] = {}
+        texts = []
+        for page_url, page in pages:
+            # Scan markup (mailto: hrefs) but not scripts, where template addresses live
+            contacts = extract_contacts(_INVISIBLE.sub(' ', page))
+            emails.update(dict.fromkeys(contacts['emails']))
+            phones.update(dict.fromkeys(contacts['phones']))
+            text = html_to_text(page)
+            texts.append(text)
+            result['pages'].append({'url': page_url, 'content': text})
+
+        result.update({'success': True, 'content': ' '.join(texts)[:self.max_content_chars],
+                       'emails': list(emails), 'phones': list(phones)})
+        return result
+
+    async def _fetch(self, session, url: str) -> Tuple[str, str]:
+        """Fetch one HTML page politely; raises CrawlSkip for pages deliberately not read"""
+        if urlparse(url).path.lower().endswith(SKIP_EXTENSIONS):
+            self.stats['non_html_skipped'] += 1
+            raise CrawlSkip(f"non-HTML url {url}")
+
+        if self.respect_robots and not await self._robots.allowed(session, url):
+            self.stats['robots_blocked'] += 1
+            raise CrawlSkip(f"blocked by robots.txt: {url}")
+
+        host = _host(url)
+        gate = self._gates.setdefault(host, _HostGate(self.per_host_limit, self.per_host_delay))
+        async with gate:
+            async with session.get(url, allow_redirects=True, max_redirects=5) as response:
+                if response.status >= 400:
+                    raise CrawlSkip(f"HTTP {response.status} for {url}")
+
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if content_type and content_type not in HTML_CONTENT_TYPES:
+                    # Abort before reading the body - the connection is released unread
+                    self.stats['non_html_skipped'] += 1
+                    raise CrawlSkip(f"non-HTML content {content_type}")
+
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    body.extend(chunk)
+                    if len(body) >= self.max_page_bytes:
+                        self.stats['truncated'] += 1
+                        del body[self.max_page_bytes:]
+                        break
+
+                self.stats['pages_fetched'] += 1
+                self.stats['bytes_read'] += len(body)
+                return str(response.url), body.decode(response.charset or 'utf-8', errors='replace')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return crawl counters plus pages per second"""
+        stats = dict(self.stats)
+        stats['pages_per_second'] = stats['pages_fetched'] / stats['elapsed'] if stats['elapsed'] else 0.0
+        return stats
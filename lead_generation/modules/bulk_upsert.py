@@ -0,0 +1,151 @@
+"""
+Bulk Upsert
+Chunked, parallel PostgREST upserts for large business saves
+
+save_businesses sent a whole ZIP's businesses - each with its full raw_data
+JSON - as one PostgREST request, which timed out on big payloads and kept the
+campaign waiting on a single round trip. Records are now split into chunks
+bounded by row count and serialized size, a small thread pool keeps several
+chunks in flight, and each chunk is retried on its own. Upserts are keyed on
+place_id, so a retried chunk is idempotent. Inserted vs updated counts are
+exact: each chunk looks up which of its keys already exist before writing.
+"""
+
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def _record_size(record: Dict[str, Any]) -> int:
+    return len(json.dumps(record, default=str, ensure_ascii=False).encode('utf-8'))
+
+
+def dedupe_records(records: List[Dict[str, Any]], key: str) -> List[Dict[str, Any]]:
+    """Drop records without a key; the last record for a repeated key wins"""
+    by_key: Dict[Any, Dict[str, Any]] = {}
+    for record in records:
+        if record.get(key):
+            by_key[record[key]] = record
+    return list(by_key.values())
+
+
+def chunk_records(records: List[Dict[str, Any]], max_rows: int, max_bytes: int) -> List[List[Dict[str, Any]]]:
+    """Split records into chunks of at most max_rows rows and roughly max_bytes of JSON"""
+    chunks: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_bytes = 0
+    for record in records:
+        size = _record_size(record)
+        if current and (len(current) >= max_rows or current_bytes + size > max_bytes):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(record)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class BulkUpserter:
+    """Upserts many rows through PostgREST in bounded, parallel, retried chunks"""
+
+    def __init__(self, client, table: str = "gmaps_businesses", on_conflict: str = "place_id",
+                 max_rows: int = 250, max_bytes: int = 2_000_000, max_workers: int = 4,
+                 max_retries: int = 3, base_delay: float = 1.0, sleep: Callable[[float], None] = time.sleep,
+                 backend=None):
+        """
+        Args:
+            client: Supabase client
+            table: Target table
+            on_conflict: Unique key column the upsert resolves on
+            max_rows: Rows per request
+            max_bytes: Approximate JSON payload per request; raw_data-heavy rows
+                make smaller chunks
+            max_workers: Chunks in flight at once
+            max_retries: Retries per chunk after the first attempt
+            base_delay: Backoff base in seconds (exponential with jitter)
+            sleep: Sleep function, injectable for tests
+            backend: Optional PostgresCopyBackend; when set, rows are written with
+                COPY + INSERT ... ON CONFLICT over a direct connection instead
+        """
+        self.client = client
+        self.table = table
+        self.on_conflict = on_conflict
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.sleep = sleep
+        self.backend = backend
+
+    def _existing_keys(self, keys: List[Any]) -> set:
+        result = (self.client.table(self.table)
+                  .select(self.on_conflict)
+                  .in_(self.on_conflict, keys)
+                  .execute())
+        return {row[self.on_conflict] for row in result.data or []}
+
+    def _upsert_chunk(self, index: int, chunk: List[Dict[str, Any]]) -> Dict[str, int]:
+        keys = [record[self.on_conflict] for record in chunk]
+        existing = None
+        attempt = 0
+        while True:
+            try:
+                # Looked up once: after a failed attempt that actually committed,
+                # a fresh lookup would report inserted rows as updated
+                if existing is None:
+                    existing = self._existing_keys(keys)
+                (self.client.table(self.table)
+                 .upsert(chunk, on_conflict=self.on_conflict)
+                 .execute())
+                updated = sum(1 for key in keys if key in existing)
+                return {'inserted': len(chunk) - updated, 'updated': updated, 'failed': 0, 'retries': attempt}
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"❌ {self.table} chunk {index + 1} ({len(chunk)} rows) failed after "
+                                 f"{attempt + 1} attempts: {e}")
+                    return {'inserted': 0, 'updated': 0, 'failed': len(chunk), 'retries': attempt}
+                attempt += 1
+                delay = random.uniform(0, self.base_delay * 2 ** attempt)
+                logger.warning(f"⚠️ {self.table} chunk {index + 1} failed ({e}); "
+                               f"retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                self.sleep(delay)
+
+    def upsert(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Upsert records; returns exact inserted / updated / failed row counts.
+
+        Records without the conflict key are skipped (counted as 'skipped');
+        duplicate keys are collapsed to the last record.
+        """
+        unique = dedupe_records(records, self.on_conflict)
+        skipped = sum(1 for record in records if not record.get(self.on_conflict))
+        chunks = chunk_records(unique, self.max_rows, self.max_bytes)
+
+        started = time.time()
+        totals = {'inserted': 0, 'updated': 0, 'failed': 0, 'retries': 0}
+        via = 'postgrest'
+        if unique and self.backend is not None:
+            try:
+                totals.update(self.backend.copy_upsert(self.table, unique, [self.on_conflict]))
+                chunks, via = [], 'copy'
+            except Exception as e:
+                # The COPY merge is one transaction, so nothing was written
+                logger.warning(f"⚠️ COPY upsert into {self.table} failed ({e}); falling back to PostgREST")
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                for counts in executor.map(lambda args: self._upsert_chunk(*args), enumerate(chunks)):
+                    for key, value in counts.items():
+                        totals[key] += value
+
+        totals.update({'saved': totals['inserted'] + totals['updated'], 'skipped': skipped,
+                       'duplicates': len(records) - skipped - len(unique), 'chunks': len(chunks), 'via': via})
+        logger.info(f"💾 {self.table}: {totals['inserted']} inserted, {totals['updated']} updated, "
+                    f"{totals['failed']} failed via {via} ({time.time() - started:.1f}s)")
+        return totals
@@ -0,0 +1,177 @@
+"""
+Cache Store
+Size-bounded LRU cache with TTLs, negative entries and optional Supabase persistence
+
+Shared by the enrichment caches (SERP results, LinkedIn profiles, Facebook
+pages, summaries). Each cache owns a namespace; entries live in memory for the
+current process and, when a Supabase client is supplied, in the
+enrichment_cache table so they survive across campaigns.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Returned by get() when a key is absent or expired (None is a valid cached value)
+MISS = object()
+
+
+def stable_hash(value: Any) -> str:
+    """sha256 of a JSON-serializable value with sorted keys, for content-addressed keys"""
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SupabaseCacheBackend:
+    """Persist cache entries in the enrichment_cache table"""
+
+    def __init__(self, client, table: str = "enrichment_cache"):
+        self.client = client
+        self.table = table
+
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return {'value', 'is_negative', 'expires_at'} for a live entry, or None"""
+        try:
+            result = (self.client.table(self.table)
+                      .select("value, is_negative, expires_at")
+                      .eq("namespace", namespace)
+                      .eq("cache_key", key)
+                      .gt("expires_at", datetime.now(timezone.utc).isoformat())
+                      .limit(1)
+                      .execute())
+        except Exception as e:
+            logger.warning(f"⚠️ Cache read failed for {namespace}: {e}")
+            return None
+
+        if not result.data:
+            return None
+        row = result.data[0]
+        expires_at = datetime.fromisoformat(row["expires_at"].replace("Z", "+00:00")).timestamp()
+        return {"value": row.get("value"), "is_negative": bool(row.get("is_negative")),
+                "expires_at": expires_at}
+
+    def set(self, namespace: str, key: str, value: Any, is_negative: bool, expires_at: float):
+        """Upsert one entry"""
+        record = {
+            "namespace": namespace,
+            "cache_key": key,
+            "value": value,
+            "is_negative": is_negative,
+            "expires_at": datetime.fromtimestamp(expires_at, tz=timezone.utc).isoformat(),
+        }
+        try:
+            self.client.table(self.table).upsert(record, on_conflict="namespace,cache_key").execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Cache write failed for {namespace}: {e}")
+
+    def delete(self, namespace: str, key: str):
+        """Remove one entry"""
+        try:
+            (self.client.table(self.table).delete()
+             .eq("namespace", namespace).eq("cache_key", key).execute())
+        except Exception as e:
+            logger.warning(f"⚠️ Cache delete failed for {namespace}: {e}")
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and negative caching"""
+
+    def __init__(self, namespace: str, ttl_seconds: float, max_entries: int = 10000,
+                 negative_ttl_seconds: Optional[float] = None, backend: Optional[SupabaseCacheBackend] = None):
+        """
+        Args:
+            namespace: Cache name, also the namespace column in enrichment_cache
+            ttl_seconds: Lifetime of positive entries
+            max_entries: In-memory LRU bound; least recently used entries are evicted first
+            negative_ttl_seconds: Lifetime of negative entries (value None); defaults to ttl_seconds
+            backend: Optional persistent store consulted on memory misses
+        """
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        self.max_entries = max_entries
+        self.backend = backend
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def _store_local(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def get(self, key: str) -> Any:
+        """Return the cached value (possibly None for a negative entry) or MISS"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats['negative_hits' if value is None else 'hits'] += 1
+                    return value
+                del self._entries[key]
+
+        if self.backend is not None:
+            stored = self.backend.get(self.namespace, key)
+            if stored is not None and stored['expires_at'] > now:
+                value = None if stored['is_negative'] else stored['value']
+                with self._lock:
+                    self._store_local(key, value, stored['expires_at'])
+                    self.stats['negative_hits' if value is None else 'hits'] += 1
+                return value
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return MISS
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Cache a value; None records a negative result with the negative TTL"""
+        if ttl_seconds is None:
+            ttl_seconds = self.negative_ttl_seconds if value is None else self.ttl_seconds
+        expires_at = time.time() + ttl_seconds
+
+        with self._lock:
+            self._store_local(key, value, expires_at)
+            self.stats['writes'] += 1
+
+        if self.backend is not None:
+            self.backend.set(self.namespace, key, value, value is None, expires_at)
+
+    def delete(self, key: str):
+        """Drop a key from memory and the persistent store"""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            self.backend.delete(self.namespace, key)
+
+    def clear(self):
+        """Drop all in-memory entries (persistent entries expire on their own)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit rate"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['negative_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['negative_hits']) / lookups, 3) if lookups else 0.0
+        return stats
+
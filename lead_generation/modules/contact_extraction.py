@@ -0,0 +1,191 @@
+"""
+Contact Extraction
+Precompiled high-throughput email and phone extraction shared by the scrapers
+
+FacebookScraper and WebScraper scanned About text, posts and page HTML with
+separate regexes compiled per call. ContactExtractor compiles its patterns
+once and runs a separate scan for each anchor: str.find over '@' for plain
+emails, one scan each for the bracketed "[at]"/"(at)" and bare " at " tokens
+of obfuscated emails ("name [at] domain [dot] com"; a bare " at " needs a
+spelled-out domain plus a capitalised AT/DOT, a bracketed [dot] or an
+email-like local part) and one for the exchange-line core of US phone
+numbers. Each hit is expanded with an anchored matcher, so the cost is a few
+fast scans rather than a regex attempt at every character. HTML entities are
+decoded first; results are normalized, filtered for asset false positives
+(logo@2x.png) and de-duplicated in order of appearance.
+"""
+
+import html
+import re
+from typing import Dict, List, Optional, Tuple
+
+_LOCAL_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-')
+_MAX_LOCAL = 64
+
+_DOT = r"(?:\s*[\[({<]\s*dot\s*[\])}>]\s*|\s+dot\s+)"
+
+# Right-hand side of an '@', matched at the character after it
+_DOMAIN = re.compile(r"(?:[A-Za-z0-9\-]+\.)+[A-Za-z]{2,24}(?![A-Za-z0-9\-])")
+
+# Obfuscated "at" tokens, scanned over the lowercased text
+_AT_BRACKET = re.compile(r"[\[({<]\s*at\s*[\])}>]")
+_AT_WORD = re.compile(r" at ")
+
+# Domain after an obfuscated "at"; a bare " at " only counts when the dots are
+# spelled out too - "find us at acme.com" is prose, not an address
+_OBFUSCATED_DOMAIN = re.compile(rf"\s*(?:[a-z0-9\-]+(?:{_DOT}|\.))+[a-z]{{2,24}}(?![a-z0-9\-])")
+_SPELLED_DOMAIN = re.compile(rf"\s*(?:[a-z0-9\-]+{_DOT})+[a-z]{{2,24}}(?![a-z0-9\-])")
+_DOT_TOKEN = re.compile(_DOT)
+# Evidence that "x at y dot com" is an address and not prose ("meet us at acme dot com")
+_BRACKET_DOT = re.compile(r"[\[({<]\s*dot\s*[\])}>]")
+_EMAIL_LIKE_LOCAL = re.compile(r"[0-9._%+\-]")
+
+# Exchange + line number ("234-5678"); starting on [2-9] keeps the scan fast
+_PHONE_CORE = re.compile(r"[2-9][0-9]{2}[ .\-]?[0-9]{4}(?![0-9A-Za-z_])")
+# Area code (and optional +1) that must end right where the core starts
+_PHONE_AREA = re.compile(
+    r"(?:(?<![\w+])\+?1[ .\-]?|(?<![\w+]))(?:\(\s*[2-9][0-9]{2}\s*\)\s*|[2-9][0-9]{2}[ .\-]?)$"
+)
+_PHONE_LOOKBACK = 16
+_NON_DIGITS = re.compile(r"\D")
+
+_VALID_EMAIL = re.compile(r"^[a-z0-9._%+\-]+@(?:[a-z0-9\-]+\.)+[a-z]{2,24}$")
+
+# "TLDs" that are really file extensions (retina assets, bundles)
+ASSET_SUFFIXES = {
+    'png', 'jpg', 'jpeg', 'gif', 'svg', 'webp', 'ico', 'bmp', 'tif', 'tiff',
+    'css', 'js', 'json', 'map', 'woff', 'woff2', 'ttf', 'mp4', 'webm', 'pdf',
+}
+
+# Placeholder and tracking addresses that appear in page templates
+IGNORED_EMAIL_DOMAINS = {
+    'example.com', 'example.org', 'domain.com', 'email.com', 'yourdomain.com',
+    'sentry.io', 'sentry.wixpress.com', 'sentry-next.wixpress.com', 'wixpress.com',
+}
+
+
+class ContactExtractor:
+    """Anchor-driven email/phone extractor over raw text or HTML"""
+
+    def __init__(self, ignored_domains: Optional[set] = None, include_obfuscated: bool = True):
+        """
+        Args:
+            ignored_domains: Email domains to drop (defaults to IGNORED_EMAIL_DOMAINS)
+            include_obfuscated: Decode "name [at] domain [dot] com" forms
+        """
+        self.ignored_domains = IGNORED_EMAIL_DOMAINS if ignored_domains is None else ignored_domains
+        self.include_obfuscated = include_obfuscated
+
+    def extract(self, text: Optional[str]) -> Dict[str, List[str]]:
+        """Return {'emails': [...], 'phones': [...]} in order of first appearance"""
+        if not text:
+            return {'emails': [], 'phones': []}
+
+        if '&' in text:
+            text = html.unescape(text)
+
+        found: List[Tuple[int, str]] = []
+        if '@' in text:
+            found.extend(self._plain_emails(text))
+        if self.include_obfuscated:
+            found.extend(self._obfuscated_emails(text))
+        found.sort()
+
+        emails: Dict[str, None] = {}
+        for _, email in found:
+            emails[email] = None
+        return {'emails': list(emails), 'phones': self._phones(text)}
+
+    def extract_emails(self, text: Optional[str]) -> List[str]:
+        """Return the emails found in text"""
+        return self.extract(text)['emails']
+
+    def extract_phones(self, text: Optional[str]) -> List[str]:
+        """Return the phone numbers found in text, formatted (555) 234-5678"""
+        return self.extract(text)['phones']
+
+    def _plain_emails(self, text: str) -> List[Tuple[int, str]]:
+        found = []
+        at = text.find('@')
+        while at != -1:
+            start = self._local_start(text, at)
+            domain = _DOMAIN.match(text, at + 1)
+            if start < at and domain:
+                email = self._clean_email(f"{text[start:at]}@{domain.group()}")
+                if email:
+                    found.append((start, email))
+            at = text.find('@', at + 1)
+        return found
+
+    def _obfuscated_emails(self, text: str) -> List[Tuple[int, str]]:
+        lowered = text.lower()
+        # Case is only checked when lowering kept offsets aligned (it almost always does)
+        original = text if len(text) == len(lowered) else None
+        found = []
+        for scanner, domain_pattern in ((_AT_BRACKET, _OBFUSCATED_DOMAIN), (_AT_WORD, _SPELLED_DOMAIN)):
+            for token in scanner.finditer(lowered):
+                local_end = token.start()
+                while local_end > 0 and lowered[local_end - 1] in ' \t':
+                    local_end -= 1
+                start = self._local_start(lowered, local_end)
+                domain = domain_pattern.match(lowered, token.end())
+                if start == local_end or not domain:
+                    continue
+                if scanner is _AT_WORD and not self._spelled_address(original, lowered, token, domain, start):
+                    continue
+                address = _DOT_TOKEN.sub('.', domain.group().strip())
+                email = self._clean_email(f"{lowered[start:local_end]}@{address}")
+                if email:
+                    found.append((start, email))
+        return found
+
+    @staticmethod
+    def _spelled_address(original: Optional[str], lowered: str, token, domain, start: int) -> bool:
+        """Whether a bare "x at y dot z" match carries enough evidence to be an address"""
+        if _BRACKET_DOT.search(domain.group()) or _EMAIL_LIKE_LOCAL.search(lowered[start:token.start()]):
+            return True
+        if original is None:
+            return False
+        if original[token.start():token.end()] == ' AT ':
+            return True
+        dots = list(_DOT_TOKEN.finditer(lowered, domain.start(), domain.end()))
+        return all('DOT' in original[d.start():d.end()] for d in dots)
+
+    @staticmethod
+    def _local_start(text: str, end: int) -> int:
+        """Walk left from end over local-part characters"""
+        start = end
+        floor = max(end - _MAX_LOCAL, 0)
+        while start > floor and text[start - 1] in _LOCAL_CHARS:
+            start -= 1
+        return start
+
+    def _clean_email(self, email: str) -> Optional[str]:
+        email = email.strip('.').lower()
+        domain = email.rsplit('@', 1)[-1]
+        if domain.rsplit('.', 1)[-1] in ASSET_SUFFIXES or domain in self.ignored_domains:
+            return None
+        if not _VALID_EMAIL.match(email) or '..' in email:
+            return None
+        return email
+
+    @staticmethod
+    def _phones(text: str) -> List[str]:
+        phones: Dict[str, None] = {}
+        for core in _PHONE_CORE.finditer(text):
+            area = _PHONE_AREA.search(text, max(core.start() - _PHONE_LOOKBACK, 0), core.start())
+            if not area:
+                continue
+            digits = _NON_DIGITS.sub('', area.group() + core.group())
+            if len(digits) == 11:
+                digits = digits[1:]
+            phones[f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"] = None
+        return list(phones)
+
+
+default_extractor = ContactExtractor()
+
+
+def extract_contacts(text: Optional[str]) -> Dict[str, List[str]]:
+    """Extract emails and phones with the shared default extractor"""
+    return default_extractor.extract(text)
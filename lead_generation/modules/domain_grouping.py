@@ -0,0 +1,188 @@
+"""
+Domain Grouping for Phase 2.5
+Clusters businesses that share a website domain so chains are enriched once
+
+Franchises and multi-location practices list the same website on every Google
+Maps location. Grouping by registrable domain lets LinkedIn search, profile
+scraping and pattern verification run for one representative per domain, with
+the result fanned out to every location.
+"""
+
+import copy
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tldextract
+    # Use the bundled suffix list only - never fetch it over the network mid-campaign
+    _extract = tldextract.TLDExtract(suffix_list_urls=(), include_psl_private_domains=True)
+except ImportError:  # pragma: no cover - exercised when tldextract is not installed
+    tldextract = None
+    _extract = None
+
+logger = logging.getLogger(__name__)
+
+
+# Multi-label public suffixes used when tldextract is not installed
+FALLBACK_PUBLIC_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'me.uk', 'ltd.uk', 'plc.uk',
+    'com.au', 'net.au', 'org.au', 'co.nz', 'org.nz', 'co.za', 'com.br',
+    'com.mx', 'co.jp', 'co.in', 'co.kr', 'com.sg', 'com.hk', 'com.tr',
+    'ca.us', 'ny.us', 'tx.us', 'fl.us',
+}
+
+# Hosting platforms where each customer owns a subdomain (PSL private section)
+FALLBACK_PRIVATE_SUFFIXES = {
+    'wixsite.com', 'squarespace.com', 'business.site', 'godaddysites.com',
+    'weebly.com', 'wordpress.com', 'blogspot.com', 'square.site',
+    'myshopify.com', 'github.io', 'webflow.io', 'carrd.co', 'netlify.app',
+    'vercel.app', 'herokuapp.com', 'site123.me', 'jimdosite.com',
+}
+
+# Domains shared by unrelated businesses - never cluster on these
+SHARED_DOMAINS = {
+    'facebook.com', 'fb.com', 'instagram.com', 'linkedin.com', 'twitter.com',
+    'x.com', 'tiktok.com', 'youtube.com', 'linktr.ee', 'yelp.com',
+    'google.com', 'goo.gl', 'g.page', 'yellowpages.com', 'nextdoor.com',
+    'vagaro.com', 'booksy.com', 'styleseat.com', 'schedulicity.com',
+    'mindbodyonline.com', 'zocdoc.com', 'healthgrades.com', 'opentable.com',
+    'toasttab.com', 'doordash.com', 'ubereats.com', 'grubhub.com',
+    'bit.ly', 'tinyurl.com',
+}
+
+
+def _fallback_registrable_domain(host: str) -> str:
+    labels = host.split('.')
+    if len(labels) < 2:
+        return host
+    for suffixes in (FALLBACK_PRIVATE_SUFFIXES, FALLBACK_PUBLIC_SUFFIXES):
+        for size in (3, 2):
+            if len(labels) > size and '.'.join(labels[-size:]) in suffixes:
+                return '.'.join(labels[-(size + 1):])
+    return '.'.join(labels[-2:])
+
+
+def normalize_domain(website: Optional[str]) -> Optional[str]:
+    """
+    Return the registrable domain of a website (public-suffix aware), or None
+    for empty, invalid or shared-platform URLs.
+
+    'https://www.smile-dental.co.uk/locations/leeds' -> 'smile-dental.co.uk'
+    'https://joes.wixsite.com/dentist'               -> 'joes.wixsite.com'
+    """
+    if not website:
+        return None
+
+    host = website.strip().lower()
+    host = re.sub(r'^[a-z][a-z0-9+.-]*://', '', host)
+    host = host.split('/')[0].split('?')[0].split('#')[0]
+    host = host.split('@')[-1].split(':')[0].strip('.')
+    if not host or '.' not in host or not re.match(r'^[a-z0-9.-]+$', host):
+        return None
+
+    if _extract is not None:
+        parts = _extract(host)
+        if not parts.domain or not parts.suffix:
+            return None
+        domain = f"{parts.domain}.{parts.suffix}"
+    else:
+        domain = _fallback_registrable_domain(host)
+
+    if domain in SHARED_DOMAINS:
+        return None
+    return domain
+
+
+def choose_representative(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pick the location most likely to enrich well: known LinkedIn URL, then most reviews, then rating"""
+    return max(members, key=lambda b: (
+        1 if b.get('linkedin_url') else 0,
+        b.get('reviews_count') or 0,
+        b.get('rating') or 0,
+    ))
+
+
+def group_by_domain(businesses: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Cluster businesses by normalized website domain.
+
+    Returns (groups, singles): groups is a list of
+    {'domain', 'representative', 'members'} for domains shared by 2+ businesses;
+    singles are businesses that enrich on their own (unique or missing domain).
+    """
+    by_domain: Dict[str, List[Dict[str, Any]]] = {}
+    singles = []
+    for business in businesses:
+        domain = normalize_domain(business.get('website'))
+        if domain:
+            by_domain.setdefault(domain, []).append(business)
+        else:
+            singles.append(business)
+
+    groups = []
+    for domain, members in by_domain.items():
+        if len(members) == 1:
+            singles.append(members[0])
+            continue
+        groups.append({
+            'domain': domain,
+            'representative': choose_representative(members),
+            'members': members,
+        })
+
+    return groups, singles
+
+
+def fan_out(groups: List[Dict[str, Any]], results: List[Dict[str, Any]],
+            id_field: str = 'business_id') -> List[Dict[str, Any]]:
+    """
+    Copy each representative's enrichment result to the other members of its group.
+
+    Copies carry the member's id in id_field and 'shared_from_business_id'
+    pointing at the representative. Results for businesses outside any group
+    are returned unchanged.
+    """
+    results_by_id = {r.get(id_field): r for r in results}
+    output = list(results)
+
+    for group in groups:
+        rep_id = group['representative'].get('id')
+        rep_result = results_by_id.get(rep_id)
+        if rep_result is None:
+            continue
+        for member in group['members']:
+            if member.get('id') == rep_id:
+                continue
+            shared = copy.deepcopy(rep_result)
+            shared[id_field] = member.get('id')
+            shared['shared_from_business_id'] = rep_id
+            output.append(shared)
+
+    return output
+
+
+def enrich_by_domain(businesses: List[Dict[str, Any]],
+                     enrich_fn: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                     id_field: str = 'business_id') -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Run enrich_fn once per distinct domain and fan results out to every location.
+
+    enrich_fn receives the representatives plus ungrouped businesses, e.g.
+    LinkedInScraperParallel.enrich_with_linkedin. Returns (results, stats).
+    """
+    groups, singles = group_by_domain(businesses)
+    to_enrich = [g['representative'] for g in groups] + singles
+
+    results = enrich_fn(to_enrich) if to_enrich else []
+    results = fan_out(groups, results, id_field=id_field)
+
+    stats = {
+        'locations': len(businesses),
+        'enriched': len(to_enrich),
+        'domain_groups': len(groups),
+        'locations_shared': sum(len(g['members']) - 1 for g in groups),
+    }
+    logger.info(f"🏢 Domain grouping: {stats['locations']} locations → {stats['enriched']} enrichments "
+                f"({stats['domain_groups']} shared domains, {stats['locations_shared']} locations reused)")
+    return results, stats
@@ -0,0 +1,199 @@
+"""
+Email Format Index
+Learns which local-part template each domain (and each business category) uses
+
+Verified addresses in gmaps_linkedin_enrichments (is_safe = true) tell us the
+mailbox format a company uses. The index counts confirmed templates per domain,
+per category and globally, blends them with the default priors, and is updated
+incrementally as new Bouncer results arrive.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from .email_verification_planner import (
+    DEFAULT_TEMPLATE_PRIORS,
+    build_candidates,
+    detect_template,
+    extract_domain,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EmailFormatIndex:
+    """Per-domain / per-category template counts with hierarchical smoothing"""
+
+    def __init__(self, prior_strength: float = 20.0, category_strength: float = 10.0,
+                 domain_strength: float = 2.0, rejection_penalty: float = 0.5):
+        """
+        Args:
+            prior_strength: Pseudo-count weight of DEFAULT_TEMPLATE_PRIORS in the global distribution
+            category_strength: Pseudo-count weight of the global distribution inside a category
+            domain_strength: Pseudo-count weight of the category distribution inside a domain;
+                kept low so a couple of confirmed addresses decide a domain's format
+            rejection_penalty: Multiplier applied per undeliverable result for a template on a domain
+        """
+        self.prior_strength = prior_strength
+        self.category_strength = category_strength
+        self.domain_strength = domain_strength
+        self.rejection_penalty = rejection_penalty
+
+        self._global = defaultdict(int)
+        self._by_category = defaultdict(lambda: defaultdict(int))
+        self._by_domain = defaultdict(lambda: defaultdict(int))
+        self._rejected = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _category_key(category: Optional[str]) -> Optional[str]:
+        return category.strip().lower() if category else None
+
+    def observe(self, email: str, full_name: str, category: Optional[str] = None,
+                is_safe: bool = True) -> Optional[str]:
+        """
+        Record one verification outcome. Returns the detected template, or None
+        when the address does not follow a name-based template (info@, office@, ...).
+        """
+        if not email or '@' not in email:
+            return None
+
+        local_part, domain = email.lower().rsplit('@', 1)
+        template = detect_template(local_part, full_name)
+        if not template:
+            return None
+
+        category_key = self._category_key(category)
+        with self._lock:
+            if is_safe:
+                self._global[template] += 1
+                self._by_domain[domain][template] += 1
+                if category_key:
+                    self._by_category[category_key][template] += 1
+            else:
+                self._rejected[domain][template] += 1
+        return template
+
+    def record_verification(self, person: Dict[str, Any], email: str, template: str,
+                            result: Dict[str, Any]):
+        """EmailVerificationPlanner on_verified hook: learn from every Bouncer result"""
+        status = result.get('status')
+        if result.get('is_safe'):
+            self.observe(email, person.get('full_name', ''), person.get('category'), is_safe=True)
+        elif status == 'undeliverable':
+            # Risky / unknown / catch-all results say nothing about the format
+            self.observe(email, person.get('full_name', ''), person.get('category'), is_safe=False)
+
+    @staticmethod
+    def _blend(base: Dict[str, float], counts: Dict[str, int], strength: float) -> Dict[str, float]:
+        total = sum(counts.values()) + strength
+        return {t: (strength * base.get(t, 0.0) + counts.get(t, 0)) / total
+                for t in set(base) | set(counts)}
+
+    def template_probabilities(self, domain: str, category: Optional[str] = None) -> Dict[str, float]:
+        """Return {template: probability} for a domain, backing off to category and global counts"""
+        domain = extract_domain(domain)
+        category_key = self._category_key(category)
+
+        with self._lock:
+            probabilities = self._blend(DEFAULT_TEMPLATE_PRIORS, self._global, self.prior_strength)
+            if category_key and category_key in self._by_category:
+                probabilities = self._blend(probabilities, self._by_category[category_key],
+                                            self.category_strength)
+            if domain in self._by_domain:
+                probabilities = self._blend(probabilities, self._by_domain[domain], self.domain_strength)
+            rejected = dict(self._rejected.get(domain, {}))
+
+        for template, count in rejected.items():
+            if template in probabilities:
+                probabilities[template] *= self.rejection_penalty ** count
+
+        total = sum(probabilities.values()) or 1.0
+        return {t: p / total for t, p in probabilities.items()}
+
+    def known_format(self, domain: str) -> Optional[str]:
+        """Return the confirmed template for a domain, if any address there has been verified"""
+        domain = extract_domain(domain)
+        with self._lock:
+            counts = self._by_domain.get(domain)
+            if not counts:
+                return None
+            return max(counts.items(), key=lambda item: item[1])[0]
+
+    def rank_patterns(self, patterns: List[str], full_name: str, domain: str,
+                      category: Optional[str] = None) -> List[str]:
+        """
+        Reorder already generated patterns so the most likely address comes first.
+
+        Patterns that do not match a name template (info@, contact@) keep their
+        relative order after the ranked ones.
+        """
+        probabilities = self.template_probabilities(domain, category)
+
+        def score(pattern: str) -> float:
+            local_part = pattern.split('@', 1)[0]
+            template = detect_template(local_part, full_name)
+            return probabilities.get(template, 0.0) if template else -1.0
+
+        return sorted(patterns, key=score, reverse=True)
+
+    def most_likely_email(self, full_name: str, domain: str,
+                          category: Optional[str] = None) -> Optional[str]:
+        """Return the single most likely address for a person at a domain"""
+        candidates = build_candidates(full_name, domain, self.template_probabilities(domain, category))
+        return candidates[0][0] if candidates else None
+
+    def load_from_supabase(self, client, page_size: int = 1000, id_chunk_size: int = 100) -> int:
+        """
+        Seed the index from verified LinkedIn enrichments.
+
+        Reads gmaps_linkedin_enrichments rows with is_safe = true page by page and
+        joins categories from gmaps_businesses in id_chunk_size lookups (UUIDs in
+        an IN (...) filter go in the URL). Returns rows learned.
+        """
+        rows = []
+        offset = 0
+        while True:
+            result = (client.table("gmaps_linkedin_enrichments")
+                      .select("business_id, person_name, primary_email")
+                      .eq("is_safe", True)
+                      .range(offset, offset + page_size - 1)
+                      .execute())
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                break
+            offset += page_size
+
+        categories = {}
+        business_ids = list({r["business_id"] for r in rows if r.get("business_id")})
+        for i in range(0, len(business_ids), id_chunk_size):
+            chunk = business_ids[i:i + id_chunk_size]
+            result = (client.table("gmaps_businesses")
+                      .select("id, category")
+                      .in_("id", chunk)
+                      .execute())
+            for business in result.data or []:
+                categories[business["id"]] = business.get("category")
+
+        learned = 0
+        for row in rows:
+            if self.observe(row.get("primary_email"), row.get("person_name") or "",
+                            categories.get(row.get("business_id"))):
+                learned += 1
+
+        logger.info(f"📚 Email format index seeded from {learned}/{len(rows)} verified emails "
+                    f"across {len(self._by_domain)} domains")
+        return learned
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return index size and the global template distribution"""
+        with self._lock:
+            return {
+                'domains': len(self._by_domain),
+                'categories': len(self._by_category),
+                'observations': sum(self._global.values()),
+                'global_counts': dict(self._global),
+            }
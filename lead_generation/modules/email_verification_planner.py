@@ -0,0 +1,284 @@
+"""
+Email Verification Planner
+Orders generated email patterns by likelihood and verifies them one rank at a time
+
+Instead of sending every generated pattern (first@, first.last@, flast@, ...) to
+Bouncer, the planner ranks each person's candidates and verifies them round by
+round. Each round sends the next most likely candidate of every person that is
+still unresolved as ONE verify_batch call, and a person drops out of later
+rounds as soon as a deliverable address is found.
+"""
+
+import logging
+import re
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Local-part templates for generated emails, keyed by template name
+EMAIL_TEMPLATES: Dict[str, Callable[[str, str], str]] = {
+    'first': lambda first, last: first,
+    'first.last': lambda first, last: f"{first}.{last}",
+    'flast': lambda first, last: f"{first[0]}{last}",
+    'firstlast': lambda first, last: f"{first}{last}",
+    'firstl': lambda first, last: f"{first}{last[0]}",
+    'first_last': lambda first, last: f"{first}_{last}",
+    'f.last': lambda first, last: f"{first[0]}.{last}",
+    'last': lambda first, last: last,
+    'last.first': lambda first, last: f"{last}.{first}",
+    'lastf': lambda first, last: f"{last}{first[0]}",
+}
+
+# Prior share of each template among verified small-business addresses.
+# Used until enough verified emails exist to learn per-domain formats.
+DEFAULT_TEMPLATE_PRIORS: Dict[str, float] = {
+    'first': 0.34,
+    'first.last': 0.22,
+    'flast': 0.16,
+    'firstlast': 0.08,
+    'firstl': 0.05,
+    'f.last': 0.04,
+    'first_last': 0.03,
+    'last': 0.03,
+    'last.first': 0.03,
+    'lastf': 0.02,
+}
+
+# Titles and credentials that show up in LinkedIn names but never in mailboxes
+NAME_NOISE = {
+    'dr', 'mr', 'mrs', 'ms', 'miss', 'prof', 'jr', 'sr', 'ii', 'iii', 'iv',
+    'md', 'dds', 'dmd', 'do', 'phd', 'mba', 'cpa', 'esq', 'rn', 'np', 'pa',
+    'dvm', 'od', 'dc', 'pt', 'lmt', 'cfp',
+}
+
+
+def normalize_name_parts(full_name: str) -> Tuple[str, str]:
+    """Split a person name into ASCII lowercase (first, last) parts for email local-parts"""
+    if not full_name:
+        return '', ''
+
+    ascii_name = unicodedata.normalize('NFKD', full_name).encode('ascii', 'ignore').decode('ascii')
+    # Drop anything after a comma ("Jane Doe, DDS") and parenthesised nicknames
+    ascii_name = re.sub(r'\(.*?\)', ' ', ascii_name.split(',')[0])
+    tokens = []
+    for raw in ascii_name.lower().split():
+        token = re.sub(r'[^a-z]', '', raw)
+        if token and token not in NAME_NOISE:
+            tokens.append(token)
+
+    if not tokens:
+        return '', ''
+    if len(tokens) == 1:
+        return tokens[0], ''
+    return tokens[0], tokens[-1]
+
+
+def extract_domain(website: str) -> str:
+    """Extract the bare host from a website URL (no scheme, www. or path)"""
+    if not website:
+        return ''
+    domain = website.strip().lower()
+    domain = re.sub(r'^[a-z][a-z0-9+.-]*://', '', domain)
+    domain = domain.split('/')[0].split('?')[0].split('#')[0].split(':')[0]
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+
+def detect_template(local_part: str, full_name: str) -> Optional[str]:
+    """Return the template name that produces local_part for this person, if any"""
+    first, last = normalize_name_parts(full_name)
+    if not first or not local_part:
+        return None
+
+    local_part = local_part.lower()
+    for template, build in EMAIL_TEMPLATES.items():
+        if not last and template != 'first':
+            continue
+        if build(first, last) == local_part:
+            return template
+    return None
+
+
+def build_candidates(full_name: str, domain: str,
+                     priors: Optional[Dict[str, float]] = None) -> List[Tuple[str, str, float]]:
+    """
+    Build (email, template, probability) candidates for a person, most likely first.
+
+    Templates that collapse to the same address (e.g. single-letter last names)
+    are merged and their probabilities summed.
+    """
+    first, last = normalize_name_parts(full_name)
+    domain = extract_domain(domain)
+    if not first or not domain:
+        return []
+
+    priors = priors or DEFAULT_TEMPLATE_PRIORS
+    merged: Dict[str, Tuple[str, float]] = {}
+
+    for template, build in EMAIL_TEMPLATES.items():
+        if not last and template != 'first':
+            continue
+        weight = priors.get(template, 0.0)
+        if weight <= 0:
+            continue
+        email = f"{build(first, last)}@{domain}"
+        if email in merged:
+            best_template, total = merged[email]
+            merged[email] = (best_template, total + weight)
+        else:
+            merged[email] = (template, weight)
+
+    total_weight = sum(weight for _, weight in merged.values()) or 1.0
+    candidates = [(email, template, weight / total_weight)
+                  for email, (template, weight) in merged.items()]
+    candidates.sort(key=lambda c: (-c[2], c[0]))
+    return candidates
+
+
+class EmailVerificationPlanner:
+    """Plan and run likelihood-ordered, early-exit Bouncer verification across a campaign"""
+
+    def __init__(self, verifier, likelihood: Optional[Callable[[str, Optional[str]], Dict[str, float]]] = None,
+                 max_candidates_per_person: int = 5, min_probability: float = 0.02,
+                 on_verified: Optional[Callable[[Dict[str, Any], str, str, Dict[str, Any]], None]] = None):
+        """
+        Args:
+            verifier: BouncerVerifier (anything with verify_batch(emails) -> List[Dict])
+            likelihood: Callable (domain, category) -> {template: weight}; defaults to the global priors
+            max_candidates_per_person: Upper bound on verification rounds per person
+            min_probability: Candidates below this share are never verified
+            on_verified: Callback (person, email, template, result) for every verification result
+        """
+        self.verifier = verifier
+        self.likelihood = likelihood or (lambda domain, category: DEFAULT_TEMPLATE_PRIORS)
+        self.max_candidates_per_person = max_candidates_per_person
+        self.min_probability = min_probability
+        self.on_verified = on_verified
+
+        self.stats = {
+            'people': 0,
+            'rounds': 0,
+            'credits_used': 0,
+            'credits_blind': 0,
+            'emails_found': 0,
+            'catch_all_domains': 0,
+        }
+
+    def plan(self, people: List[Dict[str, Any]]) -> Dict[Any, List[Tuple[str, str, float]]]:
+        """
+        Rank candidates for each person.
+
+        Each person dict needs 'key', 'full_name' and 'domain' (website or bare
+        domain) and may carry 'category'. Returns {key: [(email, template, p), ...]}.
+        """
+        plan = {}
+        for person in people:
+            domain = extract_domain(person.get('domain', ''))
+            priors = self.likelihood(domain, person.get('category')) or DEFAULT_TEMPLATE_PRIORS
+            candidates = build_candidates(person.get('full_name', ''), domain, priors)
+            candidates = [c for c in candidates if c[2] >= self.min_probability]
+            plan[person['key']] = candidates[:self.max_candidates_per_person]
+        return plan
+
+    def verify(self, people: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Verify planned candidates round by round, stopping per person at the first safe hit.
+
+        Returns {key: {'email', 'template', 'verification', 'attempts', 'status'}} where
+        status is 'found', 'catch_all', 'not_found' or 'no_candidates'.
+        """
+        plan = self.plan(people)
+        people_by_key = {person['key']: person for person in people}
+
+        self.stats['people'] += len(people)
+        self.stats['credits_blind'] += sum(len(c) for c in plan.values())
+
+        outcomes: Dict[Any, Dict[str, Any]] = {}
+        pending = []
+        for key, candidates in plan.items():
+            if candidates:
+                pending.append(key)
+                outcomes[key] = {'email': None, 'template': None, 'verification': None,
+                                 'attempts': 0, 'status': 'not_found'}
+            else:
+                outcomes[key] = {'email': None, 'template': None, 'verification': None,
+                                 'attempts': 0, 'status': 'no_candidates'}
+
+        catch_all_domains = set()
+        rank = 0
+        while pending and rank < self.max_candidates_per_person:
+            round_items = []
+            for key in pending:
+                candidates = plan[key]
+                if rank >= len(candidates):
+                    continue
+                email, template, _ = candidates[rank]
+                if email.split('@', 1)[1] in catch_all_domains:
+                    continue
+                round_items.append((key, email, template))
+
+            if not round_items:
+                break
+
+            # People at several locations of one business can share candidates
+            unique_emails = list(dict.fromkeys(email for _, email, _ in round_items))
+            logger.info(f"📧 Verification round {rank + 1}: {len(unique_emails)} emails "
+                        f"for {len(round_items)} people")
+            results = self.verifier.verify_batch(unique_emails)
+            results_by_email = {r.get('email', email): r for email, r in zip(unique_emails, results)}
+
+            self.stats['rounds'] += 1
+            self.stats['credits_used'] += len(unique_emails)
+
+            resolved = set()
+            for key, email, template in round_items:
+                result = results_by_email.get(email, {})
+                outcome = outcomes[key]
+                outcome['attempts'] += 1
+
+                if self.on_verified:
+                    self.on_verified(people_by_key[key], email, template, result)
+
+                if result.get('is_safe'):
+                    outcome.update({'email': email, 'template': template,
+                                    'verification': result, 'status': 'found'})
+                    resolved.add(key)
+                elif result.get('status') == 'accept_all':
+                    # Catch-all servers accept every pattern, so further rounds cannot tell them apart
+                    domain = email.split('@', 1)[1]
+                    if domain not in catch_all_domains:
+                        catch_all_domains.add(domain)
+                        self.stats['catch_all_domains'] += 1
+                    outcome.update({'email': email, 'template': template,
+                                    'verification': result, 'status': 'catch_all'})
+                    resolved.add(key)
+
+            pending = [key for key in pending if key not in resolved
+                       and outcomes[key]['status'] == 'not_found'
+                       and plan[key][0][0].split('@', 1)[1] not in catch_all_domains]
+            rank += 1
+
+        # People left unresolved on a catch-all domain keep that deliverability signal,
+        # with their most likely candidate as the address to send to
+        for key, outcome in outcomes.items():
+            if outcome['status'] == 'not_found' and plan[key][0][0].split('@', 1)[1] in catch_all_domains:
+                email, template, _ = plan[key][0]
+                outcome.update({'email': email, 'template': template, 'status': 'catch_all'})
+
+        found = sum(1 for o in outcomes.values() if o['status'] == 'found')
+        self.stats['emails_found'] += found
+        logger.info(f"✅ Verified {found}/{len(people)} people in {rank} rounds "
+                    f"using {self.stats['credits_used']} credits "
+                    f"(blind verification: {self.stats['credits_blind']})")
+        return outcomes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cumulative planner statistics including credits per found email"""
+        stats = dict(self.stats)
+        found = stats['emails_found']
+        stats['credits_per_found_email'] = round(stats['credits_used'] / found, 2) if found else None
+        stats['credits_saved'] = stats['credits_blind'] - stats['credits_used']
+        return stats
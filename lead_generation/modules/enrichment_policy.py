@@ -0,0 +1,239 @@
+"""
+Enrichment Policy Engine
+Decides per business which enrichment stages are worth paying for
+
+Phase 2.5 used to run LinkedIn search for every business, including ones that
+already had a usable Google Maps or Facebook email. The policy evaluates
+configurable rules against the business as it stands when a stage is about to
+run (email, email_source, category, rating, reviews_count) plus the campaign
+budget, and reports how many paid calls were skipped and what that saved.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Enrichment stages in pipeline order
+STAGES = [
+    'facebook_scrape',      # Phase 2A / 2C - Apify Facebook scraper
+    'facebook_discovery',   # Phase 2B - Google Search for Facebook page
+    'linkedin_search',      # Phase 2.5 step 1 - Google Search for LinkedIn
+    'linkedin_scrape',      # Phase 2.5 step 2 - bebity LinkedIn actor
+    'bouncer',              # Phase 2.5 step 3 - Bouncer verification
+]
+
+# Cost per call in USD. Scrape and Bouncer rates are from docs/COST_TRACKING_AUDIT_REPORT.md;
+# the Google search rate (apify~google-search-scraper, facebook_discovery and linkedin_search)
+# is an estimate - no pricing source in the repo covers it
+STAGE_COSTS = {
+    'facebook_scrape': 0.010,
+    'facebook_discovery': 0.0035,  # estimate
+    'linkedin_search': 0.0035,  # estimate
+    'linkedin_scrape': 0.010,
+    'bouncer': 0.002,
+}
+
+# Mailbox names that reach a shared inbox rather than a person
+ROLE_EMAIL_PREFIXES = {
+    'info', 'contact', 'hello', 'hi', 'office', 'admin', 'support', 'sales',
+    'frontdesk', 'front.desk', 'reception', 'appointments', 'appointment',
+    'team', 'booking', 'bookings', 'mail', 'email', 'enquiries', 'inquiries',
+    'inquiry', 'help', 'billing', 'service', 'customerservice', 'orders',
+    'marketing', 'noreply', 'no-reply', 'careers', 'jobs', 'hr', 'general',
+}
+
+# Default rules, evaluated in order; the first rule that skips a stage is credited with it
+DEFAULT_RULES = [
+    {
+        'name': 'personal_email_on_file',
+        'description': 'Skip discovery and LinkedIn if a non-role email already exists (it is still verified)',
+        'when': {'has_email': True, 'role_email': False},
+        'skip': ['facebook_scrape', 'facebook_discovery', 'linkedin_search', 'linkedin_scrape'],
+    },
+    {
+        'name': 'role_email_on_file',
+        'description': 'Skip Facebook discovery if a role email already exists; LinkedIn still finds the decision maker',
+        'when': {'has_email': True, 'role_email': True},
+        'skip': ['facebook_discovery'],
+    },
+    {
+        'name': 'no_linkedin_url',
+        'description': 'Nothing to scrape or verify without a LinkedIn URL',
+        'when': {'has_linkedin_url': False},
+        'skip': ['linkedin_scrape'],
+    },
+]
+
+
+def is_role_email(email: Optional[str]) -> bool:
+    """Return True for shared-inbox addresses such as info@ or frontdesk@"""
+    if not email or '@' not in email:
+        return False
+    local_part = email.split('@', 1)[0].lower()
+    return local_part in ROLE_EMAIL_PREFIXES or local_part.split('+', 1)[0] in ROLE_EMAIL_PREFIXES
+
+
+def _matches(business: Dict[str, Any], when: Dict[str, Any]) -> bool:
+    """Evaluate a rule's conditions (all must hold) against a business"""
+    email = business.get('email')
+    category = (business.get('category') or '').lower()
+    rating = business.get('rating')
+    reviews = business.get('reviews_count') or 0
+
+    for condition, expected in when.items():
+        if condition == 'has_email':
+            ok = bool(email) == expected
+        elif condition == 'role_email':
+            ok = bool(email) and is_role_email(email) == expected
+        elif condition == 'email_source_in':
+            ok = business.get('email_source') in expected
+        elif condition == 'has_website':
+            ok = bool(business.get('website')) == expected
+        elif condition == 'has_facebook_url':
+            ok = bool(business.get('facebook_url')) == expected
+        elif condition == 'has_linkedin_url':
+            ok = bool(business.get('linkedin_url')) == expected
+        elif condition == 'category_in':
+            ok = any(c.lower() in category for c in expected)
+        elif condition == 'category_not_in':
+            ok = not any(c.lower() in category for c in expected)
+        elif condition == 'min_rating':
+            ok = rating is not None and float(rating) >= expected
+        elif condition == 'max_rating':
+            ok = rating is not None and float(rating) <= expected
+        elif condition == 'min_reviews':
+            ok = reviews >= expected
+        elif condition == 'max_reviews':
+            ok = reviews <= expected
+        else:
+            raise ValueError(f"Unknown enrichment policy condition: {condition}")
+        if not ok:
+            return False
+    return True
+
+
+class EnrichmentPolicy:
+    """Rule-based, budget-aware selection of businesses for each enrichment stage"""
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, budget_usd: Optional[float] = None,
+                 stage_costs: Optional[Dict[str, float]] = None,
+                 priority: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        """
+        Args:
+            rules: Rule dicts {'name', 'when': {...}, 'skip': [stages]}; defaults to DEFAULT_RULES.
+                'when' may also be a callable(business) -> bool.
+            budget_usd: Enrichment budget for the campaign; None means unlimited
+            stage_costs: Override cost per call for each stage
+            priority: Sort key used to spend a limited budget on the best businesses first
+        """
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        self.budget_usd = budget_usd
+        self.stage_costs = {**STAGE_COSTS, **(stage_costs or {})}
+        self.priority = priority or (lambda b: (b.get('reviews_count') or 0, b.get('rating') or 0))
+
+        for rule in self.rules:
+            unknown = set(rule.get('skip', [])) - set(STAGES)
+            if unknown:
+                raise ValueError(f"Rule '{rule.get('name')}' skips unknown stages: {sorted(unknown)}")
+
+        self.spent_usd = 0.0
+        self.calls_run = {stage: 0 for stage in STAGES}
+        self.calls_skipped = {stage: 0 for stage in STAGES}
+        self.calls_over_budget = {stage: 0 for stage in STAGES}
+        self.skips_by_rule: Dict[str, int] = {}
+
+    def skip_reason(self, business: Dict[str, Any], stage: str) -> Optional[str]:
+        """Return the name of the first rule that skips this stage for the business, if any"""
+        for rule in self.rules:
+            if stage not in rule.get('skip', []):
+                continue
+            when = rule.get('when', {})
+            matched = when(business) if callable(when) else _matches(business, when)
+            if matched:
+                return rule.get('name', 'unnamed_rule')
+        return None
+
+    def decide(self, business: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate every stage for a business without recording anything"""
+        run, skipped = [], {}
+        for stage in STAGES:
+            reason = self.skip_reason(business, stage)
+            if reason:
+                skipped[stage] = reason
+            else:
+                run.append(stage)
+        return {'run': run, 'skipped': skipped}
+
+    def remaining_budget(self) -> Optional[float]:
+        """Return budget left in USD, or None when unlimited"""
+        if self.budget_usd is None:
+            return None
+        return max(self.budget_usd - self.spent_usd, 0.0)
+
+    def filter_for_stage(self, businesses: List[Dict[str, Any]], stage: str) -> List[Dict[str, Any]]:
+        """
+        Return the businesses that should run this stage, recording skips and spend.
+
+        Call right before each phase so rules see emails found by earlier phases.
+        With a budget, higher-priority businesses are admitted first.
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown enrichment stage: {stage}")
+
+        cost = self.stage_costs.get(stage, 0.0)
+        eligible = []
+        for business in businesses:
+            reason = self.skip_reason(business, stage)
+            if reason:
+                self._record_skip(stage, reason)
+            else:
+                eligible.append(business)
+        over_budget = 0
+
+        if self.budget_usd is None:
+            selected = eligible
+        else:
+            selected = []
+            for business in sorted(eligible, key=self.priority, reverse=True):
+                if self.spent_usd + cost > self.budget_usd + 1e-9:
+                    # Not a saving: the call was wanted but the budget ran out
+                    self.calls_over_budget[stage] += 1
+                    self.skips_by_rule['budget_exhausted'] = self.skips_by_rule.get('budget_exhausted', 0) + 1
+                    over_budget += 1
+                    continue
+                self.spent_usd += cost
+                selected.append(business)
+            # Keep the caller's original order
+            selected_ids = {id(b) for b in selected}
+            selected = [b for b in eligible if id(b) in selected_ids]
+
+        if self.budget_usd is None:
+            self.spent_usd += cost * len(selected)
+        self.calls_run[stage] += len(selected)
+
+        skipped = len(businesses) - len(eligible)
+        if skipped or over_budget:
+            logger.info(f"🧮 Policy {stage}: running {len(selected)}/{len(businesses)} "
+                        f"(skipped {skipped}, saved ${skipped * cost:.2f}, {over_budget} over budget)")
+        return selected
+
+    def _record_skip(self, stage: str, reason: str):
+        self.calls_skipped[stage] += 1
+        self.skips_by_rule[reason] = self.skips_by_rule.get(reason, 0) + 1
+
+    def get_report(self) -> Dict[str, Any]:
+        """Return calls run/skipped per stage and the dollars saved by rule skips (budget cut-offs excluded)"""
+        saved_by_stage = {stage: round(self.calls_skipped[stage] * self.stage_costs.get(stage, 0.0), 4)
+                          for stage in STAGES}
+        return {
+            'calls_run': dict(self.calls_run),
+            'calls_skipped': dict(self.calls_skipped),
+            'calls_over_budget': dict(self.calls_over_budget),
+            'skips_by_rule': dict(self.skips_by_rule),
+            'dollars_saved': round(sum(saved_by_stage.values()), 4),
+            'dollars_saved_by_stage': saved_by_stage,
+            'dollars_spent': round(self.spent_usd, 4),
+            'budget_usd': self.budget_usd,
+        }
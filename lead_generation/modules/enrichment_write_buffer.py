@@ -0,0 +1,296 @@
+"""
+Enrichment Write Buffer
+Write-behind buffering for save_facebook_enrichment / save_linkedin_enrichment
+
+Every enriched business cost at least two sequential round trips: the insert
+into gmaps_facebook_enrichments / gmaps_linkedin_enrichments, then the
+gmaps_businesses email/email_source update. The buffer collects those writes
+and flushes them through save_facebook_enrichment_atomic_batch /
+save_linkedin_enrichment_atomic_batch, one transaction per chunk. Flushes
+happen when max_rows writes are waiting, when the oldest write is max_wait
+seconds old, on flush() (call it when a campaign pauses or before a phase
+reads enrichment results back) and at interpreter exit.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_RPCS = {
+    'facebook': 'save_facebook_enrichment_atomic_batch',
+    'linkedin': 'save_linkedin_enrichment_atomic_batch',
+}
+
+FACEBOOK_ENRICHMENT_FIELDS = (
+    'facebook_url', 'page_name', 'page_likes', 'page_followers', 'emails', 'primary_email',
+    'email_sources', 'phone_numbers', 'addresses', 'enrichment_source', 'success', 'error_message', 'raw_data',
+)
+
+LINKEDIN_ENRICHMENT_FIELDS = (
+    'linkedin_url', 'profile_type', 'person_name', 'person_title', 'person_profile_url', 'company_name',
+    'location', 'connections', 'emails_found', 'emails_generated', 'primary_email', 'email_source',
+    'phone_numbers', 'phone_number', 'email_extraction_attempted', 'email_verified_source',
+    'email_quality_tier', 'error_message',
+    # Bouncer verification (20251130_003_add_all_bouncer_columns.sql)
+    'bouncer_status', 'bouncer_score', 'bouncer_reason', 'bouncer_verified_at', 'bouncer_raw_response',
+    'email_verified', 'is_safe', 'is_disposable', 'is_role_based', 'is_free_email',
+)
+
+
+def facebook_enrichment_row(business_id: str, campaign_id: str, enrichment_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Enrichment record + gmaps_businesses update, as save_facebook_enrichment writes them"""
+    enrichment = {field: enrichment_data.get(field) for field in FACEBOOK_ENRICHMENT_FIELDS}
+    enrichment.update({'business_id': business_id, 'campaign_id': campaign_id,
+                       'emails': enrichment_data.get('emails', []),
+                       'enrichment_source': enrichment_data.get('enrichment_source') or 'facebook_scraper'})
+    business_update = {
+        'business_id': business_id,
+        'enrichment_status': 'enriched' if enrichment_data.get('success') else 'failed',
+        # Saves this update stands for; the RPC adds it to enrichment_attempts
+        'attempts': 1,
+        'last_enrichment_attempt': datetime.now().isoformat(),
+    }
+    if enrichment_data.get('primary_email'):
+        business_update.update({'email': enrichment_data['primary_email'], 'email_source': 'facebook'})
+    return {'enrichment': enrichment, 'business_update': business_update}
+
+
+def linkedin_email_source(enrichment_data: Dict[str, Any]) -> str:
+    """gmaps_businesses.email_source for a LinkedIn email, from its quality tier and verification
+    (same labels as the master_leads view: verified emails are 'linkedin_verified')"""
+    if (enrichment_data.get('is_safe') or enrichment_data.get('email_quality_tier') == 'linkedin_verified'
+            or enrichment_data.get('email_verified_source') == 'linkedin_verified'):
+        return 'linkedin_verified'
+    return 'linkedin'
+
+
+def linkedin_enrichment_row(business_id: str, campaign_id: str, enrichment_data: Dict[str, Any],
+                            business_email_source: Optional[str] = None) -> Dict[str, Any]:
+    """Enrichment record + gmaps_businesses update, as save_linkedin_enrichment writes them;
+    email_source is derived from enrichment_data unless business_email_source overrides it"""
+    enrichment = {field: enrichment_data.get(field) for field in LINKEDIN_ENRICHMENT_FIELDS}
+    enrichment.update({'business_id': business_id, 'campaign_id': campaign_id})
+    business_update = {'business_id': business_id, 'linkedin_url': enrichment_data.get('linkedin_url'),
+                       'linkedin_enriched': True}
+    if enrichment_data.get('primary_email'):
+        business_update.update({'email': enrichment_data['primary_email'],
+                                'email_source': business_email_source or linkedin_email_source(enrichment_data)})
+    return {'enrichment': enrichment, 'business_update': business_update}
+
+
+def _merge_business_updates(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One business_update per business per batch (later non-null values win, attempts add up);
+    UPDATE ... FROM would otherwise apply an arbitrary one of several"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        update = row['business_update']
+        target = merged.setdefault(update['business_id'], {})
+        attempts = target.get('attempts', 0) + update.get('attempts', 0)
+        target.update({k: v for k, v in update.items() if v is not None})
+        if attempts:
+            target['attempts'] = attempts
+    result = []
+    for row in rows:
+        # Later rows for an already-merged business carry no update (the RPC skips nulls)
+        result.append({'enrichment': row['enrichment'],
+                       'business_update': merged.pop(row['business_update']['business_id'], None)})
+    return result
+
+
+class EnrichmentWriteBuffer:
+    """Size/time-flushed write-behind buffer for enrichment saves"""
+
+    def __init__(self, client, max_rows: int = 100, max_wait: float = 5.0, max_attempts: int = 3,
+                 register_atexit: bool = True, clock: Callable[[], float] = time.monotonic, backend=None):
+        """
+        Args:
+            client: Supabase client
+            max_rows: Flush once this many writes are waiting (also the rows per RPC call)
+            max_wait: Flush once the oldest waiting write is this many seconds old
+            max_attempts: Flushes a failed row is attempted before it is dropped; after the
+                first failure a chunk is bisected so only the offending rows are retried
+            register_atexit: Flush whatever is left when the interpreter exits
+            clock: Time source
+            backend: Optional PostgresCopyBackend; batch RPCs are then called over its
+                pooled direct connection instead of PostgREST
+        """
+        self.client = client
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.backend = backend
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in BATCH_RPCS}
+        self._oldest: Optional[float] = None
+        self._stop = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        self._closed = False
+
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'rpc_calls': 0, 'failed_calls': 0,
+                      'size_flushes': 0, 'timer_flushes': 0, 'manual_flushes': 0}
+
+        if register_atexit:
+            atexit.register(self.close)
+
+    def start(self) -> "EnrichmentWriteBuffer":
+        """Start the background timer that enforces max_wait"""
+        if self._timer is None:
+            self._timer = threading.Thread(target=self._run_timer, name="enrichment-write-buffer", daemon=True)
+            self._timer.start()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run_timer(self):
+        interval = max(self.max_wait / 4, 0.05)
+        while not self._stop.wait(interval):
+            if self.due():
+                self.flush('timer')
+
+    def due(self) -> bool:
+        """True when the oldest waiting write has exceeded max_wait"""
+        with self._lock:
+            return self._oldest is not None and self.clock() - self._oldest >= self.max_wait
+
+    def _add(self, kind: str, row: Dict[str, Any]) -> bool:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EnrichmentWriteBuffer is closed")
+            self._pending[kind].append(row)
+            if self._oldest is None:
+                self._oldest = self.clock()
+            self.stats['queued'] += 1
+            full = sum(len(rows) for rows in self._pending.values()) >= self.max_rows
+        if full:
+            self.flush('size')
+        return True
+
+    def save_facebook_enrichment(self, business_id: str, campaign_id: str, enrichment_data: Dict[str, Any]) -> bool:
+        """Buffered GmapsSupabaseManager.save_facebook_enrichment; True once queued"""
+        return self._add('facebook', facebook_enrichment_row(business_id, campaign_id, enrichment_data))
+
+    def save_linkedin_enrichment(self, business_id: str, campaign_id: str, enrichment_data: Dict[str, Any],
+                                 business_email_source: Optional[str] = None) -> bool:
+        """Buffered GmapsSupabaseManager.save_linkedin_enrichment; True once queued"""
+        return self._add('linkedin', linkedin_enrichment_row(business_id, campaign_id, enrichment_data,
+                                                             business_email_source))
+
+    def flush(self, reason: str = 'manual') -> int:
+        """Write everything waiting; returns enrichment rows written"""
+        with self._flush_lock:
+            with self._lock:
+                pending = {kind: rows for kind, rows in self._pending.items() if rows}
+                self._pending = {kind: [] for kind in BATCH_RPCS}
+                self._oldest = None
+                if pending:
+                    self.stats[f"{reason}_flushes"] += 1
+
+            written = 0
+            retry: Dict[str, List[Dict[str, Any]]] = {}
+            for kind, rows in pending.items():
+                fresh = [row for row in rows if not row.get('_attempts')]
+                for start in range(0, len(fresh), self.max_rows):
+                    chunk = fresh[start:start + self.max_rows]
+                    try:
+                        written += self._write(kind, chunk)
+                    except Exception as e:
+                        logger.error(f"❌ Failed to flush {len(chunk)} {kind} enrichments: {e}")
+                        retry.setdefault(kind, []).extend(chunk)
+                # Rows that failed before are bisected, so one bad row only holds back itself
+                retrying = [row for row in rows if row.get('_attempts')]
+                for start in range(0, len(retrying), self.max_rows):
+                    chunk_written, failed = self._write_bisected(kind, retrying[start:start + self.max_rows])
+                    written += chunk_written
+                    if failed:
+                        retry.setdefault(kind, []).extend(failed)
+
+            self._requeue(retry)
+            with self._lock:
+                self.stats['written'] += written
+            if written:
+                logger.info(f"💾 Flushed {written} enrichment writes ({reason})")
+            return written
+
+    def _write(self, kind: str, chunk: List[Dict[str, Any]]) -> int:
+        """One batch RPC call for chunk; returns enrichment rows inserted, raises on failure"""
+        try:
+            inserted = self._call(BATCH_RPCS[kind], _merge_business_updates(chunk))
+        except Exception:
+            self.stats['failed_calls'] += 1
+            raise
+        self.stats['rpc_calls'] += 1
+        return inserted if isinstance(inserted, int) else len(chunk)
+
+    def _write_bisected(self, kind: str, chunk: List[Dict[str, Any]]):
+        """Write chunk, splitting failed halves down to single rows; returns (written, failed rows)"""
+        try:
+            return self._write(kind, chunk), []
+        except Exception as e:
+            if len(chunk) == 1:
+                logger.error(f"❌ Failed to flush {kind} enrichment for business "
+                             f"{chunk[0]['enrichment']['business_id']}: {e}")
+                return 0, chunk
+        middle = len(chunk) // 2
+        left_written, left_failed = self._write_bisected(kind, chunk[:middle])
+        right_written, right_failed = self._write_bisected(kind, chunk[middle:])
+        return left_written + right_written, left_failed + right_failed
+
+    def _call(self, function: str, rows: List[Dict[str, Any]]) -> Any:
+        if self.backend is not None:
+            return self.backend.call_function(function, rows)
+        return self.client.rpc(function, {'p_rows': rows}).execute().data
+
+    def _requeue(self, retry: Dict[str, List[Dict[str, Any]]]):
+        """Put failed rows back for the next flush until they run out of attempts"""
+        with self._lock:
+            for kind, rows in retry.items():
+                keep = []
+                for row in rows:
+                    row['_attempts'] = attempts = row.get('_attempts', 0) + 1
+                    if attempts >= self.max_attempts:
+                        self.stats['dropped'] += 1
+                        logger.error(f"❌ Dropping {kind} enrichment for business "
+                                     f"{row['enrichment']['business_id']} after {attempts} attempts")
+                    else:
+                        keep.append(row)
+                self._pending[kind] = keep + self._pending[kind]
+                if keep and self._oldest is None:
+                    self._oldest = self.clock()
+
+    def close(self) -> Dict[str, int]:
+        """Stop the timer and flush; called automatically at exit"""
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        with self._lock:
+            already_closed, self._closed = self._closed, True
+        if not already_closed:
+            atexit.unregister(self.close)
+        # A final flush retries failed rows up to their remaining attempts
+        for _ in range(self.max_attempts):
+            self.flush('manual')
+            with self._lock:
+                if not any(self._pending.values()):
+                    break
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return buffer statistics, including writes still waiting"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['waiting'] = sum(len(rows) for rows in self._pending.values())
+            return stats
@@ -0,0 +1,183 @@
+"""
+Experiment Rollup
+Incremental rollup of icebreaker_experiments metrics from instantly_events
+
+Variant performance used to mean scanning instantly_events joined to
+gmaps_businesses. The rollup job reads only the events inserted since its
+watermark, looks up each business's variant in bulk, aggregates opens,
+replies and positive replies per (campaign, variant) in memory - each
+business counts at most once per metric - and applies the deltas together
+with the new watermark in one apply_icebreaker_experiment_deltas call.
+A/B dashboards read the precomputed rows, one per variant.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+ROLLUP_NAME = 'icebreaker_experiments'
+EPOCH = '1970-01-01T00:00:00+00:00'
+
+# Metric -> instantly_events.event_type values that count toward it
+METRIC_EVENTS = {
+    'opens': ('email_opened',),
+    'replies': ('reply_received',),
+    'positive_replies': ('lead_interested', 'lead_meeting_booked'),
+}
+EVENT_METRICS = {event: metric for metric, events in METRIC_EVENTS.items() for event in events}
+
+
+def aggregate_deltas(events: List[Dict[str, Any]], businesses: Dict[str, Dict[str, Any]],
+                     already_counted: Set[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Per-(campaign, variant) metric deltas for a batch of new events.
+
+    A business contributes at most once per metric, whether its earlier event
+    was in this batch or already rolled up (already_counted).
+    """
+    counted = set(already_counted)
+    deltas: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for event in events:
+        metric = EVENT_METRICS.get(event.get('event_type'))
+        business = businesses.get(event.get('business_id'))
+        if not metric or not business:
+            continue
+        if (event['business_id'], metric) in counted:
+            continue
+        counted.add((event['business_id'], metric))
+
+        campaign_id = event.get('campaign_id') or business.get('campaign_id')
+        if not campaign_id:
+            continue
+        variant = business.get('icebreaker_variant') or 'control'
+        row = deltas.setdefault((campaign_id, variant), {
+            'campaign_id': campaign_id, 'organization_id': event.get('organization_id'),
+            'variant_name': variant, **{m: 0 for m in METRIC_EVENTS}})
+        row[metric] += 1
+    return list(deltas.values())
+
+
+class ExperimentRollup:
+    """Watermarked incremental rollup of instantly_events into icebreaker_experiments"""
+
+    def __init__(self, client, page_size: int = 1000, id_chunk_size: int = 100, lag_seconds: float = 30,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        """
+        Args:
+            client: Supabase client
+            page_size: Rows per PostgREST page (keep at or below the API's max-rows)
+            id_chunk_size: Business ids per IN (...) filter; they travel in the URL
+            lag_seconds: Events newer than now - lag are left for the next run so
+                rows from still-open webhook transactions are not skipped
+            clock: Current time source
+        """
+        self.client = client
+        self.page_size = page_size
+        self.id_chunk_size = id_chunk_size
+        self.lag_seconds = lag_seconds
+        self.clock = clock
+
+    def get_watermark(self) -> str:
+        """created_at of the last rolled-up event (epoch before the first run)"""
+        result = (self.client.table("rollup_watermarks")
+                  .select("watermark")
+                  .eq("rollup_name", ROLLUP_NAME)
+                  .execute())
+        rows = result.data or []
+        return rows[0]['watermark'] if rows else EPOCH
+
+    def _fetch_events(self, watermark: str, cutoff: str) -> List[Dict[str, Any]]:
+        events = []
+        offset = 0
+        while True:
+            result = (self.client.table("instantly_events")
+                      .select("id, organization_id, campaign_id, business_id, event_type, created_at")
+                      .gt("created_at", watermark)
+                      .lte("created_at", cutoff)
+                      .in_("event_type", list(EVENT_METRICS))
+                      .order("created_at")
+                      .order("id")
+                      .range(offset, offset + self.page_size - 1)
+                      .execute())
+            page = result.data or []
+            events.extend(page)
+            if len(page) < self.page_size:
+                return events
+            offset += self.page_size
+
+    def _chunks(self, ids: List[str]):
+        for start in range(0, len(ids), self.id_chunk_size):
+            yield ids[start:start + self.id_chunk_size]
+
+    def _fetch_businesses(self, business_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        businesses = {}
+        for chunk in self._chunks(business_ids):
+            result = (self.client.table("gmaps_businesses")
+                      .select("id, campaign_id, icebreaker_variant")
+                      .in_("id", chunk)
+                      .execute())
+            for business in result.data or []:
+                businesses[business['id']] = business
+        return businesses
+
+    def _already_counted(self, business_ids: List[str], watermark: str) -> Set[Tuple[str, str]]:
+        """(business_id, metric) pairs already credited by earlier runs"""
+        if watermark == EPOCH:
+            return set()
+        counted = set()
+        for chunk in self._chunks(business_ids):
+            # Paged: a business can have many historical opens, and a truncated
+            # response would let already-credited businesses count again
+            offset = 0
+            while True:
+                result = (self.client.table("instantly_events")
+                          .select("business_id, event_type")
+                          .in_("business_id", chunk)
+                          .in_("event_type", list(EVENT_METRICS))
+                          .lte("created_at", watermark)
+                          .order("id")
+                          .range(offset, offset + self.page_size - 1)
+                          .execute())
+                page = result.data or []
+                for event in page:
+                    counted.add((event['business_id'], EVENT_METRICS[event['event_type']]))
+                if len(page) < self.page_size:
+                    break
+                offset += self.page_size
+        return counted
+
+    def run(self) -> Dict[str, Any]:
+        """Roll up events inserted since the watermark; returns run statistics"""
+        watermark = self.get_watermark()
+        cutoff = (self.clock() - timedelta(seconds=self.lag_seconds)).isoformat()
+        if datetime.fromisoformat(cutoff) <= datetime.fromisoformat(watermark):
+            return {'events': 0, 'deltas': 0, 'watermark': watermark}
+
+        events = self._fetch_events(watermark, cutoff)
+        business_ids = sorted({e['business_id'] for e in events if e.get('business_id')})
+        businesses = self._fetch_businesses(business_ids)
+        deltas = aggregate_deltas(events, businesses, self._already_counted(business_ids, watermark))
+
+        # Deltas and watermark commit together; an empty run still advances the watermark
+        self.client.rpc('apply_icebreaker_experiment_deltas', {
+            'p_deltas': deltas, 'p_rollup_name': ROLLUP_NAME, 'p_watermark': cutoff}).execute()
+
+        unmatched = sum(1 for e in events if e.get('business_id') not in businesses)
+        logger.info(f"📈 Rolled up {len(events)} events into {len(deltas)} experiment rows "
+                    f"({unmatched} without a matching business)")
+        return {'events': len(events), 'deltas': len(deltas), 'unmatched_events': unmatched,
+                'watermark': cutoff}
+
+
+def experiment_results(client, campaign_id: str) -> List[Dict[str, Any]]:
+    """Precomputed variant performance for a campaign - one row per variant"""
+    result = (client.table("icebreaker_experiments")
+              .select("variant_name, sample_size, opens, replies, positive_replies, "
+                      "open_rate, reply_rate, positive_reply_rate, updated_at")
+              .eq("campaign_id", campaign_id)
+              .order("variant_name")
+              .execute())
+    return result.data or []
@@ -0,0 +1,218 @@
+"""
+Facebook Enrichment Queue
+One continuous work queue feeding FacebookScraper instead of separate 2A/2C passes
+
+Phase 2A scraped pages known from Google Maps, then the actor sat idle while
+Phase 2B's Google searches ran, then Phase 2C scraped the newly found pages.
+Pages now join a single queue as soon as they are known - Phase 1 pages up
+front, Phase 2B discoveries as each search batch returns - and batches are cut
+when they reach max_batch_size or when the oldest queued page has waited
+max_wait seconds.
+"""
+
+import copy
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .facebook_page_index import canonicalize_facebook_url
+
+logger = logging.getLogger(__name__)
+
+
+_CLOSE = object()
+
+
+class FacebookEnrichmentQueue:
+    """Size/timer-batched background queue around a FacebookScraper batch call"""
+
+    def __init__(self, scrape: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                 on_result: Callable[[Dict[str, Any], Dict[str, Any]], None],
+                 max_batch_size: int = 15, max_wait: float = 20.0, max_parallel_batches: int = 2,
+                 page_cache=None):
+        """
+        Args:
+            scrape: Batch scrape call (businesses with facebook_url -> results with facebook_url)
+            on_result: Called with (business, enrichment) for every business, e.g. to
+                save_facebook_enrichment; runs on worker threads
+            max_batch_size: Cut a batch once this many pages are queued
+            max_wait: Cut a partial batch once its oldest page has waited this long (seconds)
+            max_parallel_batches: Actor runs in flight at once
+            page_cache: Optional FacebookPageCache consulted before the actor
+        """
+        self.scrape = scrape
+        self.on_result = on_result
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.page_cache = page_cache
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_parallel_batches)
+        self._dispatcher: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._queued_keys: Dict[str, str] = {}
+        self._followers: Dict[str, List[Dict[str, Any]]] = {}
+        # Settled pages: key -> (enrichment, outcome)
+        self._completed: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        self._futures = []
+        self._closed = False
+
+        self.stats = {'queued': 0, 'duplicates': 0, 'invalid_urls': 0, 'batches': 0,
+                      'size_flushes': 0, 'timer_flushes': 0, 'close_flushes': 0,
+                      'enriched': 0, 'not_found': 0, 'errors': 0}
+
+    def start(self) -> "FacebookEnrichmentQueue":
+        """Start the dispatcher thread"""
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch, name="facebook-enrichment-queue",
+                                                daemon=True)
+            self._dispatcher.start()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def put(self, business: Dict[str, Any]) -> bool:
+        """
+        Queue a business for enrichment. Returns False when its page is invalid or
+        already queued (the business then receives the shared page's result).
+        """
+        canonical = canonicalize_facebook_url(business.get('facebook_url'))
+        with self._lock:
+            # Checked under the lock so nothing is queued behind close()'s sentinel
+            if self._closed:
+                raise RuntimeError("FacebookEnrichmentQueue is closed")
+            if not canonical:
+                self.stats['invalid_urls'] += 1
+                return False
+
+            key = canonical['key']
+            if key in self._completed:
+                shared, outcome = self._completed[key]
+                deliver_now = True
+            elif key in self._queued_keys:
+                self._followers.setdefault(key, []).append(business)
+                deliver_now = False
+                shared, outcome = None, None
+            else:
+                self._queued_keys[key] = canonical['url']
+                self.stats['queued'] += 1
+                self._queue.put(business)
+                return True
+            self.stats['duplicates'] += 1
+
+        if deliver_now:
+            self._deliver(business, shared, outcome)
+        return False
+
+    def put_many(self, businesses: List[Dict[str, Any]]) -> int:
+        """Queue several businesses; returns how many new pages were queued"""
+        return sum(1 for business in businesses if self.put(business))
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush the partial batch, wait (up to timeout seconds) for in-flight batches and stop"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_CLOSE)
+        if self._dispatcher is not None:
+            # The dispatcher only hands batches to the executor, so it exits promptly;
+            # it must be done submitting before the executor shuts down
+            self._dispatcher.join()
+        if timeout is None:
+            self._executor.shutdown(wait=True)
+        else:
+            _, running = wait(self._futures, timeout)
+            if running:
+                logger.warning(f"⚠️ Facebook queue closed with {len(running)} batches still running")
+            self._executor.shutdown(wait=False)
+        logger.info(f"✅ Facebook queue drained: {self.stats['enriched']} enriched in "
+                    f"{self.stats['batches']} batches ({self.stats['size_flushes']} full, "
+                    f"{self.stats['timer_flushes']} timer, {self.stats['close_flushes']} final)")
+
+    def _dispatch(self):
+        batch: List[Dict[str, Any]] = []
+        deadline = None
+        while True:
+            timeout = None if not batch else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush(batch, 'timer_flushes')
+                batch, deadline = [], None
+                continue
+
+            if item is _CLOSE:
+                if batch:
+                    self._flush(batch, 'close_flushes')
+                return
+
+            batch.append(item)
+            if len(batch) == 1:
+                deadline = time.monotonic() + self.max_wait
+            if len(batch) >= self.max_batch_size:
+                self._flush(batch, 'size_flushes')
+                batch, deadline = [], None
+
+    def _flush(self, batch: List[Dict[str, Any]], reason: str):
+        self.stats['batches'] += 1
+        self.stats[reason] += 1
+        logger.info(f"📘 Facebook batch of {len(batch)} pages ({reason.replace('_flushes', '')})")
+        self._futures.append(self._executor.submit(self._run_batch, batch))
+
+    def _run_batch(self, batch: List[Dict[str, Any]]):
+        pairs, error = [], None
+        try:
+            if self.page_cache is not None:
+                pairs = self.page_cache.scrape_with_cache(batch, self.scrape)
+            else:
+                by_key = {canonicalize_facebook_url(b['facebook_url'])['key']: b for b in batch}
+                pairs = []
+                for result in self.scrape(batch) or []:
+                    canonical = canonicalize_facebook_url(result.get('facebook_url'))
+                    if canonical and canonical['key'] in by_key:
+                        pairs.append((by_key.pop(canonical['key']), result))
+        except Exception as e:
+            logger.error(f"❌ Facebook batch failed: {e}")
+            pairs, error = [], e
+        finally:
+            self._resolve(batch, pairs, error)
+
+    def _resolve(self, batch: List[Dict[str, Any]], pairs, error: Optional[Exception]):
+        """Settle every page of a batch: deliver its result (or a not-found/failed one) to all waiting businesses"""
+        found = {canonicalize_facebook_url(b['facebook_url'])['key']: enrichment for b, enrichment in pairs}
+        for business in batch:
+            key = canonicalize_facebook_url(business['facebook_url'])['key']
+            enrichment = found.get(key)
+            outcome = 'enriched'
+            if enrichment is None:
+                outcome = 'errors' if error else 'not_found'
+                enrichment = {'success': False, 'emails': [],
+                              'error_message': str(error) if error else 'Page not returned by scraper'}
+            with self._lock:
+                # A failed page may be queued again; found and not-found pages are settled
+                if error is None:
+                    self._completed[key] = (enrichment, outcome)
+                self._queued_keys.pop(key, None)
+                followers = self._followers.pop(key, [])
+            for recipient in [business] + followers:
+                self._deliver(recipient, enrichment, outcome)
+
+    def _deliver(self, business: Dict[str, Any], enrichment: Dict[str, Any], outcome: str = 'enriched'):
+        enrichment = copy.deepcopy(enrichment)
+        enrichment['facebook_url'] = business.get('facebook_url')
+        try:
+            self.on_result(business, enrichment)
+            with self._lock:
+                self.stats[outcome] += 1
+        except Exception as e:
+            logger.error(f"❌ Failed to handle Facebook result for {business.get('name')}: {e}")
+            with self._lock:
+                self.stats['errors'] += 1
@@ -0,0 +1,188 @@
+"""
+Facebook Page Index
+Canonical Facebook page identity plus a cross-campaign cache of page contacts
+
+The same page reaches FacebookScraper through many URL forms (m.facebook.com,
+/pages/Name/123, /pg/name/about, tracking query strings) and every campaign
+scraped it again. Pages are keyed by their numeric ID when the URL carries one
+and by lowercased vanity name otherwise; the emails and phones found on a page
+are cached under that key so gmaps_facebook_enrichments can be filled without
+calling the actor while the data is fresh.
+"""
+
+import copy
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from .cache_store import MISS, SupabaseCacheBackend, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+DAY_SECONDS = 24 * 60 * 60
+
+FACEBOOK_HOSTS = ('facebook.com', 'fb.com', 'fb.me')
+
+# First path segments that are never a business page
+FACEBOOK_NON_PAGES = {
+    'sharer', 'sharer.php', 'share', 'share.php', 'dialog', 'login', 'login.php',
+    'watch', 'events', 'groups', 'marketplace', 'story.php', 'photo.php',
+    'photo', 'photos', 'permalink.php', 'hashtag', 'help', 'policies', 'business',
+    'search', 'public', 'l.php', 'media', 'reel', 'gaming', 'home.php', 'privacy',
+    'settings', 'notifications', 'messages', 'friends', 'bookmarks', 'plugins', 'tr',
+}
+
+
+def canonicalize_facebook_url(url: Optional[str]) -> Optional[Dict[str, str]]:
+    """
+    Return {'key', 'url'} identifying a Facebook page, or None for non-page URLs.
+
+    key is 'id:<numeric id>' when the URL carries the page ID and
+    'name:<vanity>' otherwise:
+        https://m.facebook.com/pg/JoesDentistry/about/?ref=page_internal
+            -> {'key': 'name:joesdentistry', 'url': 'https://www.facebook.com/joesdentistry'}
+        https://www.facebook.com/pages/Joes-Dentistry/123456789
+            -> {'key': 'id:123456789', 'url': 'https://www.facebook.com/123456789'}
+    """
+    if not url:
+        return None
+
+    url = url.strip()
+    if not re.match(r'^[a-z][a-z0-9+.-]*://', url, re.IGNORECASE):
+        url = f"https://{url}"
+
+    parsed = urlparse(url)
+    host = (parsed.netloc or '').lower().split(':')[0]
+    if not any(host == h or host.endswith(f".{h}") for h in FACEBOOK_HOSTS):
+        return None
+
+    segments = [unquote(s) for s in parsed.path.split('/') if s]
+    query = parse_qs(parsed.query)
+    if not segments:
+        return None
+
+    first = segments[0].lower()
+    page_id = None
+    vanity = None
+
+    if first == 'profile.php':
+        page_id = (query.get('id') or [None])[0]
+    elif first in ('pages', 'people', 'p') and len(segments) >= 2:
+        # /pages/Name/123, /pages/category/Dentist/Name-123, /people/Name/100..., /p/Name-100...
+        for segment in reversed(segments[1:]):
+            match = re.search(r'(?:^|-)(\d{6,})$', segment)
+            if match:
+                page_id = match.group(1)
+                break
+        if not page_id and first == 'pages':
+            vanity = segments[-1]
+    elif first == 'pg' and len(segments) >= 2:
+        vanity = segments[1]
+    elif first in FACEBOOK_NON_PAGES:
+        return None
+    else:
+        vanity = segments[0]
+
+    if page_id and page_id.isdigit():
+        return {'key': f"id:{page_id}", 'url': f"https://www.facebook.com/{page_id}"}
+
+    if vanity:
+        vanity = vanity.lower()
+        if re.fullmatch(r'\d{6,}', vanity):
+            return {'key': f"id:{vanity}", 'url': f"https://www.facebook.com/{vanity}"}
+        if re.fullmatch(r'[a-z0-9.\-_]+', vanity):
+            return {'key': f"name:{vanity}", 'url': f"https://www.facebook.com/{vanity}"}
+    return None
+
+
+class FacebookPageCache:
+    """Cross-campaign cache of Facebook page contacts keyed by canonical page"""
+
+    # Fields of a FacebookScraper result worth reusing; business-specific fields are not cached
+    CACHED_FIELDS = ('page_name', 'emails', 'primary_email', 'email_sources', 'phone_numbers',
+                     'page_likes', 'page_followers', 'success')
+
+    def __init__(self, client=None, ttl_days: float = 14, max_entries: int = 20000):
+        """
+        Args:
+            client: Optional Supabase client for cross-campaign persistence
+            ttl_days: Freshness window for page contact data
+            max_entries: In-memory LRU bound
+        """
+        backend = SupabaseCacheBackend(client) if client is not None else None
+        self.cache = TTLCache('facebook_page', ttl_seconds=ttl_days * DAY_SECONDS,
+                              max_entries=max_entries, backend=backend)
+        self.stats = {'actor_pages_saved': 0, 'actor_pages_requested': 0}
+
+    def get(self, url: str) -> Any:
+        """Return cached page data or MISS"""
+        canonical = canonicalize_facebook_url(url)
+        return self.cache.get(canonical['key']) if canonical else MISS
+
+    def set(self, url: str, enrichment: Dict[str, Any]):
+        """Cache a successful scrape result for the page behind url"""
+        canonical = canonicalize_facebook_url(url)
+        if canonical and enrichment.get('success'):
+            self.cache.set(canonical['key'], {f: enrichment.get(f) for f in self.CACHED_FIELDS})
+
+    def scrape_with_cache(self, businesses: List[Dict[str, Any]],
+                          scrape: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+                          ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Return (business, enrichment) pairs, scraping only pages missing from the cache.
+
+        scrape receives one business per distinct uncached page (with facebook_url
+        replaced by the canonical URL) and returns FacebookScraper results carrying
+        facebook_url. Businesses sharing a page are scraped once. Each enrichment is
+        a copy with the business's own facebook_url, ready for save_facebook_enrichment.
+        """
+        by_key: Dict[str, List[Dict[str, Any]]] = {}
+        canonical_urls: Dict[str, str] = {}
+        for business in businesses:
+            canonical = canonicalize_facebook_url(business.get('facebook_url'))
+            if not canonical:
+                continue
+            by_key.setdefault(canonical['key'], []).append(business)
+            canonical_urls[canonical['key']] = canonical['url']
+
+        pages: Dict[str, Dict[str, Any]] = {}
+        to_scrape = []
+        for key, members in by_key.items():
+            cached = self.cache.get(key)
+            if cached is MISS:
+                to_scrape.append({**members[0], 'facebook_url': canonical_urls[key]})
+            else:
+                pages[key] = cached
+
+        self.stats['actor_pages_requested'] += len(to_scrape)
+        self.stats['actor_pages_saved'] += len(by_key) - len(to_scrape)
+
+        if to_scrape:
+            for result in scrape(to_scrape) or []:
+                canonical = canonicalize_facebook_url(result.get('facebook_url'))
+                if not canonical or canonical['key'] not in by_key:
+                    continue
+                pages[canonical['key']] = {f: result.get(f) for f in self.CACHED_FIELDS}
+                self.set(canonical['url'], result)
+
+        pairs = []
+        for key, members in by_key.items():
+            page = pages.get(key)
+            if page is None:
+                continue
+            for business in members:
+                enrichment = copy.deepcopy(page)
+                enrichment['facebook_url'] = business.get('facebook_url')
+                pairs.append((business, enrichment))
+
+        logger.info(f"💾 Facebook page cache: {len(by_key) - len(to_scrape)}/{len(by_key)} pages "
+                    f"served from cache, {len(to_scrape)} sent to actor")
+        return pairs
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics plus actor pages saved"""
+        stats = self.cache.get_stats()
+        stats.update(self.stats)
+        return stats
@@ -0,0 +1,302 @@
+"""
+Icebreaker Batch Mode
+Offline icebreaker generation for whole campaigns through the OpenAI Batch API
+
+Bulk runs don't need interactive latency, but realtime calls pay full price
+and compete with interactive traffic for rate limits. IcebreakerBatchJob
+writes one JSONL request per business, submits the file as a batch job
+(half price, separate limits), polls until it finishes and returns parsed
+icebreakers; save_icebreakers then writes them to gmaps_businesses through
+the bulk_update_icebreakers RPC in a handful of calls.
+
+LocalBatchBackend mirrors the Batch API in-process so the whole path runs
+offline in tests and local development.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+MAX_REQUESTS_PER_BATCH = 50000
+TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+
+def build_batch_line(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """One request line of a Batch API input file"""
+    return {'custom_id': custom_id, 'method': 'POST', 'url': BATCH_ENDPOINT, 'body': body}
+
+
+def write_batch_file(lines: List[Dict[str, Any]], path: str) -> str:
+    """Write request lines as JSONL and return the path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + '\n')
+    return path
+
+
+def parse_batch_output(text: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Map custom_id -> {'content': str, 'usage': dict} or {'error': str} from a
+    Batch API output (or error) file.
+    """
+    parsed = {}
+    for raw in (text or '').splitlines():
+        if not raw.strip():
+            continue
+        line = json.loads(raw)
+        custom_id = line.get('custom_id')
+        response = line.get('response') or {}
+        body = response.get('body') or {}
+        if line.get('error') or response.get('status_code', 200) >= 400:
+            error = line.get('error') or body.get('error') or {}
+            parsed[custom_id] = {'error': error.get('message') if isinstance(error, dict) else str(error)}
+            continue
+        try:
+            content = body['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            parsed[custom_id] = {'error': 'empty response'}
+            continue
+        parsed[custom_id] = {'content': content, 'usage': body.get('usage') or {}}
+    return parsed
+
+
+def parse_icebreaker_content(content: str) -> Dict[str, Any]:
+    """Parse the JSON icebreaker response format ({"icebreaker", "subject_line"})"""
+    data = json.loads(content)
+    return {'icebreaker': data.get('icebreaker', ''), 'subject_line': data.get('subject_line')}
+
+
+class OpenAIBatchBackend:
+    """Batch API calls on an OpenAI client"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def upload(self, path: str) -> str:
+        with open(path, 'rb') as f:
+            return self.client.files.create(file=f, purpose='batch').id
+
+    def create(self, input_file_id: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        batch = self.client.batches.create(input_file_id=input_file_id, endpoint=BATCH_ENDPOINT,
+                                           completion_window=COMPLETION_WINDOW, metadata=metadata)
+        return batch.id
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        batch = self.client.batches.retrieve(batch_id)
+        counts = getattr(batch, 'request_counts', None)
+        return {'id': batch.id, 'status': batch.status, 'output_file_id': batch.output_file_id,
+                'error_file_id': batch.error_file_id,
+                'request_counts': {'total': getattr(counts, 'total', 0), 'completed': getattr(counts, 'completed', 0),
+                                   'failed': getattr(counts, 'failed', 0)}}
+
+    def download(self, file_id: str) -> str:
+        return self.client.files.content(file_id).text
+
+
+class LocalBatchBackend:
+    """In-process stand-in for the Batch API (same interface as OpenAIBatchBackend)"""
+
+    def __init__(self, respond: Callable[[Dict[str, Any]], Dict[str, Any]], polls_until_complete: int = 1):
+        """
+        Args:
+            respond: Called with each request body; returns a chat completion body
+                (raise to record a per-request error)
+            polls_until_complete: retrieve() calls reporting in_progress before completion
+        """
+        self.respond = respond
+        self.polls_until_complete = polls_until_complete
+        self.files: Dict[str, str] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+
+    def upload(self, path: str) -> str:
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        with open(path, encoding='utf-8') as f:
+            self.files[file_id] = f.read()
+        return file_id
+
+    def create(self, input_file_id: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        total = sum(1 for line in self.files[input_file_id].splitlines() if line.strip())
+        self.batches[batch_id] = {'id': batch_id, 'status': 'validating', 'input_file_id': input_file_id,
+                                  'output_file_id': None, 'error_file_id': None, 'polls': 0,
+                                  'request_counts': {'total': total, 'completed': 0, 'failed': 0}}
+        return batch_id
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        batch = self.batches[batch_id]
+        if batch['status'] not in TERMINAL_STATUSES:
+            batch['polls'] += 1
+            batch['status'] = 'in_progress'
+            if batch['polls'] > self.polls_until_complete:
+                self._run(batch)
+        return {k: v for k, v in batch.items() if k not in ('polls', 'input_file_id')}
+
+    def download(self, file_id: str) -> str:
+        return self.files[file_id]
+
+    def _run(self, batch: Dict[str, Any]):
+        outputs, errors = [], []
+        for raw in self.files[batch['input_file_id']].splitlines():
+            if not raw.strip():
+                continue
+            request = json.loads(raw)
+            line = {'id': f"batch_req_{uuid.uuid4().hex[:12]}", 'custom_id': request['custom_id']}
+            try:
+                body = self.respond(request['body'])
+                outputs.append({**line, 'response': {'status_code': 200, 'body': body}, 'error': None})
+            except Exception as e:
+                errors.append({**line, 'response': None, 'error': {'code': 'local_error', 'message': str(e)}})
+
+        batch['output_file_id'] = self._store('\n'.join(json.dumps(o) for o in outputs))
+        if errors:
+            batch['error_file_id'] = self._store('\n'.join(json.dumps(e) for e in errors))
+        batch['request_counts'].update({'completed': len(outputs), 'failed': len(errors)})
+        batch['status'] = 'completed'
+
+    def _store(self, text: str) -> str:
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        self.files[file_id] = text
+        return file_id
+
+
+class IcebreakerBatchJob:
+    """Build, submit, poll and collect a campaign's icebreakers as batch jobs"""
+
+    def __init__(self, backend, build_messages: Callable[[Dict[str, Any]], List[Dict[str, str]]],
+                 model: str = 'gpt-4o', temperature: float = 0.5,
+                 parse_response: Callable[[str], Dict[str, Any]] = parse_icebreaker_content,
+                 work_dir: Optional[str] = None, poll_interval: float = 60.0, timeout: float = 24 * 3600,
+                 max_requests_per_batch: int = MAX_REQUESTS_PER_BATCH, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            backend: OpenAIBatchBackend or LocalBatchBackend
+            build_messages: Chat messages for one business (the realtime prompt)
+            model / temperature: Generation settings, as in realtime mode
+            parse_response: Turns the message content into {'icebreaker', 'subject_line'}
+            work_dir: Where JSONL input files are written (temp dir by default)
+            poll_interval: Seconds between status checks
+            timeout: Give up waiting after this many seconds
+            max_requests_per_batch: Split larger campaigns into several jobs
+        """
+        self.backend = backend
+        self.build_messages = build_messages
+        self.model = model
+        self.temperature = temperature
+        self.parse_response = parse_response
+        self.work_dir = work_dir or tempfile.gettempdir()
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.max_requests_per_batch = max_requests_per_batch
+        self.sleep = sleep
+
+    def build_lines(self, businesses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One JSONL request per business, keyed by business id"""
+        return [build_batch_line(str(b['id']), {
+            'model': self.model,
+            'messages': self.build_messages(b),
+            'temperature': self.temperature,
+            'response_format': {'type': 'json_object'},
+        }) for b in businesses]
+
+    def submit(self, businesses: List[Dict[str, Any]], metadata: Optional[Dict[str, str]] = None) -> List[str]:
+        """Write and submit the request files; returns batch ids"""
+        lines = self.build_lines(businesses)
+        batch_ids = []
+        for start in range(0, len(lines), self.max_requests_per_batch):
+            chunk = lines[start:start + self.max_requests_per_batch]
+            path = os.path.join(self.work_dir, f"icebreakers_{uuid.uuid4().hex[:8]}.jsonl")
+            write_batch_file(chunk, path)
+            try:
+                batch_ids.append(self.backend.create(self.backend.upload(path), metadata))
+            finally:
+                os.remove(path)
+        logger.info(f"📦 Submitted {len(lines)} icebreaker requests in {len(batch_ids)} batch job(s)")
+        return batch_ids
+
+    def wait(self, batch_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Poll until every batch reaches a terminal status; raises TimeoutError past timeout"""
+        deadline = time.time() + self.timeout
+        finished: Dict[str, Dict[str, Any]] = {}
+        while True:
+            for batch_id in batch_ids:
+                if batch_id not in finished:
+                    batch = self.backend.retrieve(batch_id)
+                    if batch['status'] in TERMINAL_STATUSES:
+                        finished[batch_id] = batch
+                        logger.info(f"📦 Batch {batch_id} {batch['status']}: {batch['request_counts']}")
+            if len(finished) == len(batch_ids):
+                return finished
+            if time.time() >= deadline:
+                raise TimeoutError(f"{len(batch_ids) - len(finished)} icebreaker batch(es) still running")
+            self.sleep(self.poll_interval)
+
+    def collect(self, batches: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Download outputs; returns ({business_id: icebreaker result}, {business_id: error})"""
+        results: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        for batch in batches.values():
+            if batch['status'] != 'completed':
+                logger.error(f"❌ Batch {batch['id']} ended {batch['status']}")
+            for file_id in (batch.get('output_file_id'), batch.get('error_file_id')):
+                if not file_id:
+                    continue
+                for custom_id, outcome in parse_batch_output(self.backend.download(file_id)).items():
+                    if 'error' in outcome:
+                        errors[custom_id] = outcome['error']
+                        continue
+                    try:
+                        result = self.parse_response(outcome['content'])
+                    except (ValueError, TypeError) as e:
+                        errors[custom_id] = f"unparseable response: {e}"
+                        continue
+                    if not result.get('icebreaker'):
+                        errors[custom_id] = 'empty icebreaker'
+                        continue
+                    result['usage'] = outcome.get('usage')
+                    results[custom_id] = result
+        return results, errors
+
+    def run(self, businesses: List[Dict[str, Any]], metadata: Optional[Dict[str, str]] = None
+            ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """submit + wait + collect"""
+        if not businesses:
+            return {}, {}
+        results, errors = self.collect(self.wait(self.submit(businesses, metadata)))
+        logger.info(f"✅ Batch icebreakers: {len(results)} generated, {len(errors)} failed")
+        return results, errors
+
+
+# gmaps_businesses.subject_line is VARCHAR(255)
+SUBJECT_LINE_MAX_LENGTH = 255
+
+
+def save_icebreakers(client, results: Dict[str, Dict[str, Any]], variant: str = 'control',
+                     chunk_size: int = 500, model: Optional[str] = None, generation_mode: str = 'batch') -> int:
+    """Bulk-write generated icebreakers to gmaps_businesses via bulk_update_icebreakers; returns rows updated"""
+    rows = [{
+        'id': business_id,
+        'icebreaker': result['icebreaker'],
+        'subject_line': (result.get('subject_line') or '')[:SUBJECT_LINE_MAX_LENGTH] or None,
+        'icebreaker_variant': variant,
+        'icebreaker_metadata': {'generation_mode': generation_mode, 'model': model},
+    } for business_id, result in results.items()]
+
+    updated = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            response = client.rpc('bulk_update_icebreakers', {'p_rows': chunk}).execute()
+            updated += response.data or 0
+        except Exception as e:
+            logger.error(f"❌ Failed to save {len(chunk)} icebreakers: {e}")
+    logger.info(f"💾 Saved {updated} {generation_mode} icebreakers")
+    return updated
@@ -0,0 +1,111 @@
+"""
+Icebreaker Cache
+Content-addressed cache for AIProcessor.generate_icebreaker results
+
+Re-exports and A/B reruns regenerated icebreakers for inputs that had not
+changed. Results are cached under a hash of everything that determines the
+output: the contact fields the prompt uses, website_summaries, organization
+data, the ICEBREAKER_PROMPT text, model, temperature and variant. A rerun
+with identical inputs costs nothing; a new prompt picked up by reload_config
+produces new keys, so stale icebreakers are never served.
+"""
+
+import copy
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .cache_store import MISS, SupabaseCacheBackend, TTLCache, stable_hash
+
+logger = logging.getLogger(__name__)
+
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Contact fields that feed the icebreaker prompt; anything else (ids, timestamps,
+# enrichment status) must not split the cache
+ICEBREAKER_CONTACT_FIELDS = (
+    'first_name', 'last_name', 'name', 'full_name', 'headline', 'title', 'job_title',
+    'company_name', 'organization', 'location', 'city', 'category', 'is_business_contact',
+    'website', 'rating', 'reviews_count',
+)
+
+
+def icebreaker_cache_key(contact: Dict[str, Any], website_summaries: Optional[List[str]], prompt: str,
+                         model: str, temperature: float, variant: str = 'control',
+                         organization_data: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of every input that determines the generated icebreaker"""
+    return stable_hash({
+        'contact': {f: contact.get(f) for f in ICEBREAKER_CONTACT_FIELDS if contact.get(f) not in (None, '')},
+        'summaries': [s.strip() for s in (website_summaries or []) if s and s.strip()],
+        'organization': organization_data or None,
+        'prompt': stable_hash(prompt or ''),
+        'model': model,
+        'temperature': round(float(temperature), 3),
+        'variant': variant or 'control',
+    })
+
+
+class IcebreakerCache:
+    """Content-addressed icebreaker results with prompt-change invalidation"""
+
+    def __init__(self, client=None, ttl_days: float = 180, max_entries: int = 50000):
+        """
+        Args:
+            client: Optional Supabase client for cross-campaign persistence
+            ttl_days: Lifetime of a cached icebreaker
+            max_entries: In-memory LRU bound
+        """
+        backend = SupabaseCacheBackend(client) if client is not None else None
+        self.cache = TTLCache('icebreaker', ttl_seconds=ttl_days * DAY_SECONDS,
+                              max_entries=max_entries, backend=backend)
+        self._prompt_fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+        self.stats = {'icebreakers_reused': 0, 'icebreakers_generated': 0, 'prompt_changes': 0}
+
+    def sync_prompt(self, prompt: str) -> bool:
+        """
+        Record the prompt currently in effect (call after reload_config).
+
+        Returns True when it changed; the in-memory entries for the old prompt
+        are dropped since they can no longer be hit.
+        """
+        fingerprint = stable_hash(prompt or '')
+        with self._lock:
+            changed = self._prompt_fingerprint is not None and fingerprint != self._prompt_fingerprint
+            self._prompt_fingerprint = fingerprint
+        if changed:
+            self.cache.clear()
+            self.stats['prompt_changes'] += 1
+            logger.info("🧊 ICEBREAKER_PROMPT changed - icebreaker cache invalidated")
+        return changed
+
+    def generate_with_cache(self, contact: Dict[str, Any], website_summaries: Optional[List[str]],
+                            generate: Callable[[], Dict[str, Any]], prompt: str, model: str,
+                            temperature: float, variant: str = 'control',
+                            organization_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Return a cached generate_icebreaker result or call generate() and cache it.
+
+        Only successful results (an icebreaker and no error) are cached, so a
+        failed or quota-limited call is retried on the next run.
+        """
+        self.sync_prompt(prompt)
+        key = icebreaker_cache_key(contact, website_summaries, prompt, model, temperature,
+                                   variant, organization_data)
+        cached = self.cache.get(key)
+        if cached is not MISS:
+            self.stats['icebreakers_reused'] += 1
+            return copy.deepcopy(cached)
+
+        result = generate()
+        self.stats['icebreakers_generated'] += 1
+        if isinstance(result, dict) and result.get('icebreaker') and not result.get('error'):
+            self.cache.set(key, copy.deepcopy(result))
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics plus icebreakers reused vs generated"""
+        stats = self.cache.get_stats()
+        stats.update(self.stats)
+        return stats
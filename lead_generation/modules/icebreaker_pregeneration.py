@@ -0,0 +1,148 @@
+"""
+Icebreaker Pre-generation
+Background icebreaker generation overlapped with the rest of a campaign
+
+Icebreakers were generated after enrichment or on demand at export time, so
+exports waited on OpenAI. A business is now handed to IcebreakerPregenerator
+as soon as its best email is settled; generation runs on a small thread pool
+while Bouncer verification and LinkedIn work continue, and results are written
+in bulk (bulk_update_icebreakers) with their icebreaker_variant. By the time
+the campaign completes, the icebreakers are already stored.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .icebreaker_batch import save_icebreakers
+
+logger = logging.getLogger(__name__)
+
+
+class IcebreakerPregenerator:
+    """Thread-pool icebreaker generation fed by the campaign as emails settle"""
+
+    def __init__(self, generate: Callable[[Dict[str, Any]], Dict[str, Any]], client=None,
+                 variant: Union[str, Callable[[Dict[str, Any]], str]] = 'control',
+                 max_workers: int = 4, save_batch_size: int = 50, model: Optional[str] = None,
+                 save: Optional[Callable[[Dict[str, Dict[str, Any]], str], int]] = None):
+        """
+        Args:
+            generate: generate(business) -> {'icebreaker', 'subject_line', ...}, e.g. a
+                wrapper around generate_icebreaker or IcebreakerRouter.generate_icebreaker;
+                business['icebreaker_variant'] holds the variant whose prompt to use
+            client: Supabase client used for bulk_update_icebreakers saves
+            variant: Variant name, or variant(business) -> name for A/B assignment
+            max_workers: Icebreakers generated concurrently
+            save_batch_size: Write results once this many are pending
+            model: Model name recorded in icebreaker_metadata
+            save: Override for the writer, save(results, variant) -> rows updated
+        """
+        if client is None and save is None:
+            raise ValueError("IcebreakerPregenerator needs a Supabase client or a save callable")
+        self.generate = generate
+        self.variant = variant
+        self.save_batch_size = save_batch_size
+        self.model = model
+        self.save = save or (lambda results, variant: save_icebreakers(
+            client, results, variant=variant, model=model, generation_mode='pregenerated'))
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="icebreaker-pregen")
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._seen = set()
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._pending_count = 0
+        self._closed = False
+
+        self.stats = {'submitted': 0, 'duplicates': 0, 'skipped_no_email': 0, 'skipped_existing': 0,
+                      'generated': 0, 'failed': 0, 'saved': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _variant_for(self, business: Dict[str, Any]) -> str:
+        return self.variant(business) if callable(self.variant) else self.variant
+
+    def submit(self, business: Dict[str, Any], force: bool = False) -> bool:
+        """
+        Queue a business whose best email is settled.
+
+        Returns False when it was skipped: no id or email, already submitted,
+        already has an icebreaker (unless force), or the pregenerator is closed.
+        """
+        business_id = business.get('id')
+        with self._lock:
+            if self._closed or not business_id:
+                return False
+            if not business.get('email'):
+                self.stats['skipped_no_email'] += 1
+                return False
+            if business.get('icebreaker') and not force:
+                self.stats['skipped_existing'] += 1
+                return False
+            if business_id in self._seen:
+                self.stats['duplicates'] += 1
+                return False
+            self._seen.add(business_id)
+            self.stats['submitted'] += 1
+            # Resolved once, so the prompt that generates the text and the stored
+            # icebreaker_variant cannot disagree
+            variant = self._variant_for(business)
+            # Snapshot: the campaign keeps mutating its business dicts
+            self._executor.submit(self._run, {**business, 'icebreaker_variant': variant}, variant)
+        return True
+
+    def submit_many(self, businesses: List[Dict[str, Any]]) -> int:
+        """Queue several businesses; returns how many were accepted"""
+        return sum(1 for business in businesses if self.submit(business))
+
+    def _run(self, business: Dict[str, Any], variant: str):
+        try:
+            result = self.generate(business)
+        except Exception as e:
+            logger.warning(f"⚠️ Icebreaker pre-generation failed for {business.get('name')}: {e}")
+            result = None
+
+        with self._lock:
+            if not isinstance(result, dict) or not result.get('icebreaker') or result.get('error'):
+                self.stats['failed'] += 1
+                return
+            self.stats['generated'] += 1
+            self._pending.setdefault(variant, {})[business['id']] = result
+            self._pending_count += 1
+            full = self._pending_count >= self.save_batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write pending results, one bulk call per variant; returns rows updated"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending, self._pending_count = self._pending, {}, 0
+            saved = 0
+            for variant, results in pending.items():
+                saved += self.save(results, variant) or 0
+            with self._lock:
+                self.stats['saved'] += saved
+            return saved
+
+    def close(self, wait: bool = True) -> Dict[str, int]:
+        """Stop accepting work, finish (or cancel) in-flight generation, save the rest"""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self.flush()
+        stats = self.get_stats()
+        logger.info(f"💬 Pre-generated {stats['generated']} icebreakers "
+                    f"({stats['saved']} saved, {stats['failed']} failed)")
+        return stats
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return pre-generation statistics"""
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,137 @@
+"""
+Icebreaker Prompt
+Cache-friendly icebreaker prompt assembly and cached-token accounting
+
+OpenAI only reuses a cached prompt prefix (1,024+ tokens) when it matches
+exactly from the first token. Messages are assembled as a byte-stable prefix -
+system instructions, ICEBREAKER_PROMPT, organization/product context serialized
+with sorted keys, optional example - followed by a single per-contact suffix,
+so adding organization context keeps the prefix identical across contacts.
+The layout of scripts/maintenance/generate_icebreaker.py already caches as
+well for the same content (see scripts/maintenance/benchmark_prompt_cache.py).
+PromptCacheStats records cached vs uncached prompt tokens from each response's
+usage.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+SYSTEM_INSTRUCTIONS = "You're a helpful, intelligent sales assistant."
+
+# USD per 1K tokens: (input, cached input, output)
+MODEL_PRICING = {
+    'gpt-4o': (0.0025, 0.00125, 0.01),
+    'gpt-4o-mini': (0.00015, 0.000075, 0.0006),
+}
+
+# Contact fields rendered into the per-contact suffix, in this order
+CONTACT_PROMPT_FIELDS = (
+    ('first_name', 'First name'), ('last_name', 'Last name'), ('headline', 'Headline'),
+    ('title', 'Title'), ('company_name', 'Company'), ('name', 'Business'), ('category', 'Category'),
+    ('location', 'Location'), ('city', 'City'), ('rating', 'Rating'), ('reviews_count', 'Reviews'),
+)
+
+
+def format_organization_context(organization_data: Optional[Dict[str, Any]]) -> str:
+    """Deterministic rendering of organization/product config (sorted keys, no volatile fields)"""
+    if not organization_data:
+        return ''
+    stable = {k: v for k, v in organization_data.items()
+              if v not in (None, '', [], {}) and k not in ('id', 'created_at', 'updated_at')}
+    return json.dumps(stable, sort_keys=True, ensure_ascii=False, indent=0)
+
+
+def build_static_prefix(prompt: str, organization_data: Optional[Dict[str, Any]] = None,
+                        example: Optional[str] = None) -> List[Dict[str, str]]:
+    """Messages shared by every contact of an organization - must not contain per-contact data"""
+    system = SYSTEM_INSTRUCTIONS
+    context = format_organization_context(organization_data)
+    if context:
+        system = f"{system}\n\nOrganization and product context:\n{context}"
+    messages = [{'role': 'system', 'content': system}, {'role': 'user', 'content': prompt}]
+    if example:
+        messages.append({'role': 'assistant', 'content': example})
+    return messages
+
+
+def build_contact_suffix(contact: Dict[str, Any], website_summaries: Optional[List[str]] = None) -> Dict[str, str]:
+    """The single per-contact message appended after the static prefix"""
+    profile = '\n'.join(f"{label}: {contact[field]}" for field, label in CONTACT_PROMPT_FIELDS
+                        if contact.get(field) not in (None, ''))
+    website = '\n'.join(s.strip() for s in (website_summaries or []) if s and s.strip())
+    return {'role': 'user', 'content': f"Profile:\n{profile}\n\nWebsite:\n{website}"}
+
+
+def build_icebreaker_messages(prompt: str, contact: Dict[str, Any], website_summaries: Optional[List[str]] = None,
+                              organization_data: Optional[Dict[str, Any]] = None,
+                              example: Optional[str] = None) -> List[Dict[str, str]]:
+    """Static prefix + per-contact suffix, ready for chat.completions.create"""
+    return build_static_prefix(prompt, organization_data, example) + [build_contact_suffix(contact, website_summaries)]
+
+
+def prefix_fingerprint(messages: List[Dict[str, str]]) -> str:
+    """Hash of everything before the last message; identical across contacts when the prefix is stable"""
+    return hashlib.sha256(json.dumps(messages[:-1], sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def _get(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def prompt_cache_usage(usage: Any) -> Dict[str, int]:
+    """Split a response's usage (object or dict) into cached / uncached prompt tokens"""
+    prompt_tokens = _get(usage, 'prompt_tokens') or 0
+    cached = _get(_get(usage, 'prompt_tokens_details'), 'cached_tokens') or 0
+    return {'prompt_tokens': prompt_tokens, 'cached_tokens': cached,
+            'uncached_tokens': prompt_tokens - cached,
+            'completion_tokens': _get(usage, 'completion_tokens') or 0}
+
+
+def estimate_cost(model: str, uncached_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+    """USD for one call at MODEL_PRICING rates (gpt-4o rates for unknown models)"""
+    input_price, cached_price, output_price = MODEL_PRICING.get(model, MODEL_PRICING['gpt-4o'])
+    return (uncached_tokens * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1000
+
+
+class PromptCacheStats:
+    """Accumulates cached vs uncached prompt tokens, cost and latency across calls"""
+
+    def __init__(self, model: str = 'gpt-4o'):
+        self.model = model
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.latency = 0.0
+
+    def record(self, usage: Any, latency: float = 0.0) -> Dict[str, int]:
+        """Record one response's usage; returns its cached/uncached split"""
+        split = prompt_cache_usage(usage)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += split['prompt_tokens']
+            self.cached_tokens += split['cached_tokens']
+            self.completion_tokens += split['completion_tokens']
+            self.cost += estimate_cost(self.model, split['uncached_tokens'], split['cached_tokens'],
+                                       split['completion_tokens'])
+            self.latency += latency
+        return split
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals plus cache hit ratio, cost and average latency"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'prompt_tokens': self.prompt_tokens,
+                'cached_tokens': self.cached_tokens,
+                'cache_hit_ratio': self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+                'completion_tokens': self.completion_tokens,
+                'cost_usd': round(self.cost, 6),
+                'avg_latency': self.latency / self.calls if self.calls else 0.0,
+            }
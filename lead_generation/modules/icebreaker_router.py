@@ -0,0 +1,209 @@
+"""
+Icebreaker Router
+Model cascade for icebreakers: template fast path, small model, then large model
+
+Every contact went to AI_MODEL_ICEBREAKER, including contacts with nothing to
+personalize on, where the basic fallback template was just as good. The router
+scores how much usable signal a contact carries (role, company, category,
+location, reviews, website summaries) and sends sparse contacts to a
+deterministic template, ordinary ones to a small model and only rich ones to
+the large model. A small-model answer that fails validation escalates to the
+large model; a failed model call falls back to the template. Every routing
+decision is logged and latency is tracked per tier.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .openai_client import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+TIERS = ('template', 'small', 'large')
+
+# Signal points per contact feature
+SIGNAL_WEIGHTS = {
+    'role': 1,           # headline / title / job_title
+    'company': 1,        # company_name / name
+    'category': 1,
+    'location': 1,       # city / location
+    'reviews': 1,        # rating with a meaningful number of reviews
+    'summary': 2,        # website summaries with real content
+    'rich_summary': 2,   # website summaries long enough to quote a specific detail
+}
+
+SUMMARY_MIN_TOKENS = 25
+RICH_SUMMARY_TOKENS = 150
+MIN_REVIEWS = 10
+MAX_ICEBREAKER_WORDS = 80
+
+
+def signal_score(contact: Dict[str, Any], website_summaries: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Score how much personalizable signal a contact carries"""
+    features = []
+    if any(contact.get(f) for f in ('headline', 'title', 'job_title')):
+        features.append('role')
+    if contact.get('company_name') or contact.get('name'):
+        features.append('company')
+    if contact.get('category'):
+        features.append('category')
+    if contact.get('city') or contact.get('location'):
+        features.append('location')
+    if contact.get('rating') and (contact.get('reviews_count') or 0) >= MIN_REVIEWS:
+        features.append('reviews')
+
+    summary_tokens = sum(count_tokens(s) for s in (website_summaries or []) if s and s.strip())
+    if summary_tokens >= SUMMARY_MIN_TOKENS:
+        features.append('summary')
+    if summary_tokens >= RICH_SUMMARY_TOKENS:
+        features.append('rich_summary')
+
+    return {'score': sum(SIGNAL_WEIGHTS[f] for f in features), 'features': features,
+            'summary_tokens': summary_tokens}
+
+
+def template_icebreaker(contact: Dict[str, Any]) -> Dict[str, Any]:
+    """Deterministic icebreaker built from whatever fields the contact has"""
+    first_name = (contact.get('first_name') or '').strip()
+    business = (contact.get('company_name') or contact.get('name') or '').strip()
+    category = (contact.get('category') or '').strip().lower()
+    city = (contact.get('city') or contact.get('location') or '').strip()
+
+    greeting = f"Hi {first_name}," if first_name else "Hi there,"
+    if business and category and city:
+        line = f"I came across {business} while looking at {category} businesses in {city}."
+    elif business and city:
+        line = f"I came across {business} while looking at businesses in {city}."
+    elif business:
+        line = f"I came across {business} and wanted to reach out."
+    else:
+        line = "I came across your business and wanted to reach out."
+
+    return {
+        'icebreaker': f"{greeting} {line}",
+        'subject_line': f"Quick question about {business}" if business else "Quick question",
+    }
+
+
+def is_usable_icebreaker(result: Any) -> bool:
+    """A model result worth keeping: non-empty, no error, not a rambling essay"""
+    if not isinstance(result, dict) or result.get('error'):
+        return False
+    icebreaker = (result.get('icebreaker') or '').strip()
+    return bool(icebreaker) and len(icebreaker.split()) <= MAX_ICEBREAKER_WORDS
+
+
+class IcebreakerRouter:
+    """Routes each contact to the cheapest tier that can personalize it"""
+
+    def __init__(self, generate: Callable[[str, Dict[str, Any], Optional[List[str]]], Dict[str, Any]],
+                 small_model: str = 'gpt-4o-mini', large_model: str = 'gpt-4o',
+                 template_max_score: int = 2, large_min_score: int = 6,
+                 template: Callable[[Dict[str, Any]], Dict[str, Any]] = template_icebreaker,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            generate: Model call, generate(model, contact, website_summaries) -> icebreaker dict
+            small_model: Model for contacts with ordinary signal
+            large_model: Model for rich contacts and escalations (AI_MODEL_ICEBREAKER)
+            template_max_score: Contacts scoring at or below this use the template
+            large_min_score: Contacts scoring at or above this go straight to the large model
+            template: Deterministic fallback, template(contact) -> icebreaker dict
+            clock: Time source for latency tracking
+        """
+        self.generate = generate
+        self.models = {'small': small_model, 'large': large_model}
+        self.template_max_score = template_max_score
+        self.large_min_score = large_min_score
+        self.template = template
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.stats = {tier: {'calls': 0, 'served': 0, 'failures': 0, 'latency': 0.0} for tier in TIERS}
+        self.escalations = 0
+        self.routed = {tier: 0 for tier in TIERS}
+
+    def route(self, contact: Dict[str, Any], website_summaries: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Choose a tier for a contact without calling anything"""
+        signal = signal_score(contact, website_summaries)
+        if signal['score'] <= self.template_max_score:
+            tier = 'template'
+        elif signal['score'] >= self.large_min_score:
+            tier = 'large'
+        else:
+            tier = 'small'
+        return {'tier': tier, **signal}
+
+    def _record(self, tier: str, latency: float, served: bool, failed: bool = False):
+        with self._lock:
+            stats = self.stats[tier]
+            stats['calls'] += 1
+            stats['latency'] += latency
+            stats['served'] += int(served)
+            stats['failures'] += int(failed)
+
+    def _call_model(self, tier: str, contact: Dict[str, Any],
+                    website_summaries: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+        started = self.clock()
+        try:
+            result = self.generate(self.models[tier], contact, website_summaries)
+        except Exception as e:
+            self._record(tier, self.clock() - started, served=False, failed=True)
+            logger.warning(f"⚠️ Icebreaker {tier} tier ({self.models[tier]}) failed: {e}")
+            return None
+        usable = is_usable_icebreaker(result)
+        self._record(tier, self.clock() - started, served=usable, failed=not usable)
+        return result if usable else None
+
+    def generate_icebreaker(self, contact: Dict[str, Any],
+                            website_summaries: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Generate an icebreaker through the cascade.
+
+        The result carries a 'routing' entry (tier served, initial tier, score,
+        model) suitable for icebreaker_metadata.
+        """
+        decision = self.route(contact, website_summaries)
+        tier = decision['tier']
+        result = None
+        with self._lock:
+            self.routed[tier] += 1
+
+        if tier == 'small':
+            result = self._call_model('small', contact, website_summaries)
+            if result is None:
+                with self._lock:
+                    self.escalations += 1
+                tier = 'large'
+        if tier == 'large' and result is None:
+            result = self._call_model('large', contact, website_summaries)
+        if result is None:
+            started = self.clock()
+            result = self.template(contact)
+            self._record('template', self.clock() - started, served=True)
+            tier = 'template'
+
+        result = dict(result)
+        result['routing'] = {'tier': tier, 'initial_tier': decision['tier'], 'score': decision['score'],
+                             'model': self.models.get(tier)}
+        logger.info(f"🧭 Icebreaker routed to {decision['tier']} (score {decision['score']}, "
+                    f"{', '.join(decision['features']) or 'no signal'}) -> served by {tier}")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Routing decisions, calls, served results, failures and average latency per tier"""
+        with self._lock:
+            tiers = {tier: dict(s, avg_latency=s['latency'] / s['calls'] if s['calls'] else 0.0)
+                     for tier, s in self.stats.items()}
+            return {'tiers': tiers, 'escalations': self.escalations, 'routed': dict(self.routed),
+                    'served': {tier: s['served'] for tier, s in self.stats.items()}}
+
+    def log_summary(self):
+        """Log per-tier volume and latency"""
+        stats = self.get_stats()
+        for tier, s in stats['tiers'].items():
+            logger.info(f"🧭 {tier:<8} served {s['served']:>5}  failures {s['failures']:>4}  "
+                        f"avg latency {s['avg_latency']:.2f}s")
+        logger.info(f"🧭 routed {stats['routed']}, escalations small -> large: {stats['escalations']}")
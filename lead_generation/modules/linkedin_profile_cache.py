@@ -0,0 +1,158 @@
+"""
+LinkedIn Profile Cache
+Reuses bebity actor results for the same company page / profile across campaigns
+
+The LinkedIn actor is the most expensive per-item call in the pipeline, and the
+same pages get scraped again by every campaign and organization that meets the
+business. Profiles are cached under their canonical URL (no tracking params,
+locale subdomains or trailing slashes) for a freshness TTL; a hit skips the
+actor and goes straight to _process_linkedin_profile.
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from .cache_store import MISS, SupabaseCacheBackend, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Path prefixes that identify a scrapeable entity
+LINKEDIN_ENTITY_TYPES = {'company', 'in', 'school', 'showcase'}
+
+# Keys the actor uses for the source URL of each item
+# inputUrl echoes the URL we sent; the others may hold a redirected/resolved URL
+PROFILE_URL_FIELDS = ('inputUrl', 'url', 'linkedinUrl', 'linkedin_url', 'companyUrl', 'profileUrl')
+
+
+def canonicalize_linkedin_url(url: Optional[str]) -> Optional[str]:
+    """
+    Return https://www.linkedin.com/<type>/<slug> for a LinkedIn page, or None.
+
+    'https://uk.linkedin.com/company/Acme-Corp/about/?trk=public' ->
+    'https://www.linkedin.com/company/acme-corp'
+    """
+    if not url:
+        return None
+
+    url = url.strip()
+    if not re.match(r'^[a-z][a-z0-9+.-]*://', url, re.IGNORECASE):
+        url = f"https://{url}"
+
+    parsed = urlparse(url)
+    host = (parsed.netloc or '').lower().split(':')[0]
+    if host != 'linkedin.com' and not host.endswith('.linkedin.com'):
+        return None
+
+    segments = [unquote(s) for s in parsed.path.split('/') if s]
+    if len(segments) < 2 or segments[0].lower() not in LINKEDIN_ENTITY_TYPES:
+        return None
+
+    entity_type = segments[0].lower()
+    slug = segments[1].strip().lower()
+    if not slug:
+        return None
+    return f"https://www.linkedin.com/{entity_type}/{slug}"
+
+
+class LinkedInProfileCache:
+    """Freshness-bounded cache of LinkedIn actor items keyed by canonical URL"""
+
+    def __init__(self, client=None, ttl_days: float = 30, negative_ttl_days: float = 7,
+                 max_entries: int = 20000):
+        """
+        Args:
+            client: Optional Supabase client for cross-campaign persistence
+            ttl_days: Freshness window for scraped profiles
+            negative_ttl_days: How long to remember URLs the actor returned nothing for
+            max_entries: In-memory LRU bound
+        """
+        backend = SupabaseCacheBackend(client) if client is not None else None
+        self.cache = TTLCache('linkedin_profile', ttl_seconds=ttl_days * DAY_SECONDS,
+                              negative_ttl_seconds=negative_ttl_days * DAY_SECONDS,
+                              max_entries=max_entries, backend=backend)
+        self.stats = {'actor_items_saved': 0, 'actor_items_requested': 0}
+
+    def get(self, url: str) -> Any:
+        """Return cached profile data (None for a known-empty profile) or MISS"""
+        canonical = canonicalize_linkedin_url(url)
+        if not canonical:
+            return MISS
+        return self.cache.get(canonical)
+
+    def set(self, url: str, profile: Optional[Dict[str, Any]]):
+        """Cache profile data for a URL; None records that the actor found nothing"""
+        canonical = canonicalize_linkedin_url(url)
+        if canonical:
+            self.cache.set(canonical, profile)
+
+    def split_cached(self, urls: List[str]) -> Tuple[Dict[str, Optional[Dict[str, Any]]], List[str]]:
+        """
+        Split URLs into cached profiles and canonical URLs that still need scraping.
+
+        Returns ({original_url: profile_or_None}, [canonical urls to scrape]).
+        Duplicate URL forms of the same page are scraped once.
+        """
+        cached, to_scrape = {}, []
+        for url in urls:
+            canonical = canonicalize_linkedin_url(url)
+            if not canonical:
+                continue
+            profile = self.cache.get(canonical)
+            if profile is MISS:
+                if canonical not in to_scrape:
+                    to_scrape.append(canonical)
+            else:
+                cached[url] = profile
+        return cached, to_scrape
+
+    def scrape_with_cache(self, urls: List[str],
+                          scrape: Callable[[List[str]], List[Dict[str, Any]]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Return {original_url: profile_or_None}, calling scrape() only for cache misses.
+
+        scrape receives canonical URLs (e.g. LinkedInScraperParallel.scrape_linkedin_profiles)
+        and returns actor items; items are matched back by any of their URL fields. When the
+        actor returns nothing for a whole batch it is treated as a failure and no
+        negative entries are written.
+        """
+        cached, to_scrape = self.split_cached(urls)
+        self.stats['actor_items_requested'] += len(to_scrape)
+        self.stats['actor_items_saved'] += len(urls) - len(to_scrape)
+
+        scraped: Dict[str, Optional[Dict[str, Any]]] = {}
+        if to_scrape:
+            items = scrape(to_scrape) or []
+            for item in items:
+                # An item matches a request through any of its URL fields
+                for field in PROFILE_URL_FIELDS:
+                    canonical = canonicalize_linkedin_url(item.get(field))
+                    if canonical:
+                        scraped.setdefault(canonical, item)
+
+            for canonical in to_scrape:
+                if canonical in scraped:
+                    self.cache.set(canonical, scraped[canonical])
+                elif items:
+                    self.cache.set(canonical, None)
+
+        results = dict(cached)
+        for url in urls:
+            if url in results:
+                continue
+            canonical = canonicalize_linkedin_url(url)
+            results[url] = scraped.get(canonical) if canonical else None
+
+        logger.info(f"💾 LinkedIn profile cache: {len(urls) - len(to_scrape)}/{len(urls)} served from cache, "
+                    f"{len(to_scrape)} sent to actor")
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache statistics plus actor items saved"""
+        stats = self.cache.get_stats()
+        stats.update(self.stats)
+        return stats
@@ -0,0 +1,286 @@
+"""
+OpenAI Client
+Concurrent chat completions with RPM/TPM admission control and jittered 429 backoff
+
+AIProcessor, ai_generator.generate_icebreaker and CoverageAnalyzer called
+OpenAI synchronously, one request at a time, and failed on the first 429.
+ConcurrentOpenAIClient runs requests from a thread pool and admits each one
+against per-model request and token budgets: tokens are estimated before
+sending (tiktoken when installed, a character heuristic otherwise), reconciled
+with the usage OpenAI reports, and 429s are retried with full-jitter
+exponential backoff that also pauses every other request for that model.
+Quota exhaustion (insufficient_quota) is not retried.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .adaptive_concurrency import is_rate_limit_error
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised when tiktoken is not installed
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+
+# Tier-1 limits per model; pass rpm/tpm or model_limits for the account's actual tier
+DEFAULT_MODEL_LIMITS = {
+    'gpt-4o': {'rpm': 500, 'tpm': 30000},
+    'gpt-4o-mini': {'rpm': 500, 'tpm': 200000},
+    'gpt-3.5-turbo': {'rpm': 3500, 'tpm': 200000},
+}
+FALLBACK_LIMITS = {'rpm': 500, 'tpm': 30000}
+
+# Per-message framing overhead in the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_encoders: Dict[str, Any] = {}
+_encoders_lock = threading.Lock()
+
+
+def _encoder(model: str):
+    with _encoders_lock:
+        if model not in _encoders:
+            try:
+                _encoders[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _encoders[model] = tiktoken.get_encoding('o200k_base')
+        return _encoders[model]
+
+
+def count_tokens(text: str, model: str = 'gpt-4o') -> int:
+    """Token count of text (tiktoken when installed, ~4 characters per token otherwise)"""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_encoder(model).encode(text))
+    return len(text) // 4 + 1
+
+
+def estimate_request_tokens(messages: List[Dict[str, Any]], model: str, max_tokens: Optional[int],
+                            default_completion_tokens: int = 400) -> int:
+    """Tokens a request counts against TPM: prompt plus the completion allowance"""
+    prompt = sum(count_tokens(str(m.get('content') or ''), model) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+    return prompt + (max_tokens or default_completion_tokens)
+
+
+def is_quota_error(error: Exception) -> bool:
+    """insufficient_quota also arrives as a 429 but waiting won't fix it"""
+    return 'insufficient_quota' in str(error) or 'exceeded your current quota' in str(error).lower()
+
+
+def _is_retryable(error: Exception) -> bool:
+    status = getattr(error, 'status_code', None)
+    if status is not None and status >= 500:
+        return True
+    name = type(error).__name__
+    return is_rate_limit_error(error) or name in ('APIConnectionError', 'APITimeoutError', 'Timeout')
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        value = headers.get('retry-after-ms')
+        if value is not None:
+            return float(value) / 1000
+        value = headers.get('retry-after')
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Request and token buckets refilled continuously over a one-minute window"""
+
+    def __init__(self, rpm: int, tpm: int, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.clock = clock
+        self.sleep = sleep
+        self.requests = float(rpm)
+        self.tokens = float(tpm)
+        self.paused_until = 0.0
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = max(now - self.updated, 0)
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+        self.updated = now
+
+    def try_acquire(self, tokens: int) -> float:
+        """Debit one request and tokens and return 0, or return seconds to wait"""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            if now < self.paused_until:
+                return self.paused_until - now
+            # A request larger than the whole budget is admitted once the bucket is full
+            tokens = min(tokens, self.tpm)
+            if self.requests >= 1 and self.tokens >= tokens:
+                self.requests -= 1
+                self.tokens -= tokens
+                return 0.0
+            wait_requests = max(1 - self.requests, 0) * 60 / self.rpm
+            wait_tokens = max(tokens - self.tokens, 0) * 60 / self.tpm
+            return max(wait_requests, wait_tokens, 0.01)
+
+    def acquire(self, tokens: int) -> float:
+        """Block until admitted; returns seconds spent waiting"""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return waited
+            self.sleep(wait)
+            waited += wait
+
+    def adjust(self, delta_tokens: int):
+        """Reconcile an estimate with actual usage (positive = used more than estimated)"""
+        with self._lock:
+            self.tokens = min(self.tpm, self.tokens - delta_tokens)
+
+    def pause(self, seconds: float):
+        """Hold every request for this model, e.g. after a 429"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+class ConcurrentOpenAIClient:
+    """Thread-safe chat completions client shared by all OpenAI callers"""
+
+    def __init__(self, api_key: Optional[str] = None, client=None, max_workers: int = 16,
+                 rpm: Optional[int] = None, tpm: Optional[int] = None,
+                 model_limits: Optional[Dict[str, Dict[str, int]]] = None,
+                 default_completion_tokens: int = 400, max_retries: int = 6,
+                 base_delay: float = 1.0, max_delay: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            api_key: OpenAI key (ignored when client is given)
+            client: Pre-built OpenAI client; built with max_retries=0 otherwise so retries happen here
+            max_workers: Requests in flight for chat_many
+            rpm / tpm: Override limits for every model
+            model_limits: Per-model {'rpm', 'tpm'} (defaults to DEFAULT_MODEL_LIMITS)
+            default_completion_tokens: Completion allowance when max_tokens is not set
+            max_retries: Retries for 429 / 5xx / connection errors
+            base_delay / max_delay: Exponential backoff bounds (full jitter)
+            clock / sleep: Time source and sleep, injectable for tests
+        """
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, max_retries=0)
+        self.client = client
+        self.max_workers = max_workers
+        self.rpm = rpm
+        self.tpm = tpm
+        self.model_limits = model_limits or DEFAULT_MODEL_LIMITS
+        self.default_completion_tokens = default_completion_tokens
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._limiters_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited': 0, 'failed': 0,
+                      'tokens_estimated': 0, 'tokens_used': 0, 'admission_wait_seconds': 0.0}
+
+    def limiter_for(self, model: str) -> RateLimiter:
+        """Return the shared limiter for a model"""
+        with self._limiters_lock:
+            if model not in self._limiters:
+                limits = self.model_limits.get(model) or self.model_limits.get(model.split('-20')[0]) \
+                    or FALLBACK_LIMITS
+                self._limiters[model] = RateLimiter(self.rpm or limits['rpm'], self.tpm or limits['tpm'],
+                                                    clock=self.clock, sleep=self.sleep)
+            return self._limiters[model]
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    def chat(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> Any:
+        """chat.completions.create with admission control and 429 backoff"""
+        limiter = self.limiter_for(model)
+        estimate = estimate_request_tokens(messages, model, kwargs.get('max_tokens'),
+                                           self.default_completion_tokens)
+
+        attempt = 0
+        while True:
+            waited = limiter.acquire(estimate)
+            self._count(requests=1, tokens_estimated=estimate, admission_wait_seconds=waited)
+            try:
+                response = self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+            except Exception as e:
+                # The attempt consumed no tokens; give its estimate back before the next acquire
+                limiter.adjust(-estimate)
+                if is_quota_error(e) or not _is_retryable(e) or attempt >= self.max_retries:
+                    self._count(failed=1)
+                    raise
+                attempt += 1
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                if is_rate_limit_error(e):
+                    self._count(rate_limited=1)
+                    limiter.pause(delay)
+                self._count(retries=1)
+                logger.warning(f"⚠️ OpenAI {model} request failed ({type(e).__name__}); "
+                               f"retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                self.sleep(delay)
+                continue
+
+            usage = getattr(response, 'usage', None)
+            used = getattr(usage, 'total_tokens', None) if usage is not None else None
+            if used is not None:
+                limiter.adjust(used - estimate)
+                self._count(tokens_used=used)
+            return response
+
+    def chat_many(self, requests: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Run many chat requests concurrently; each request is a dict of chat() kwargs
+        (model, messages, ...). Returns responses in input order, with the exception
+        in place of a response for requests that failed.
+        """
+        def run(request):
+            try:
+                return self.chat(**request)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(run, requests))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return request, retry and token counters"""
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+_shared_clients: Dict[str, ConcurrentOpenAIClient] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_client(api_key: str, **kwargs) -> ConcurrentOpenAIClient:
+    """
+    Process-wide client per API key, so AIProcessor, ai_generator and
+    CoverageAnalyzer draw on one set of RPM/TPM budgets.
+    """
+    with _shared_lock:
+        if api_key not in _shared_clients:
+            _shared_clients[api_key] = ConcurrentOpenAIClient(api_key=api_key, **kwargs)
+        return _shared_clients[api_key]
@@ -0,0 +1,223 @@
+"""
+Postgres COPY Backend
+Direct PostgreSQL bulk writes alongside PostgREST
+
+Every Python write went through supabase-py/PostgREST as JSON over HTTPS -
+the slowest way to move 100k rows. When SUPABASE_DB_URL is set and psycopg2 is
+installed, bulk paths can write over a pooled direct connection instead: rows
+are streamed with COPY into a temporary staging table, then merged with one
+INSERT ... ON CONFLICT ... DO UPDATE that reports exact inserted/updated
+counts. Callers keep their existing signatures and fall back to PostgREST
+when the backend is not configured.
+"""
+
+import io
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import psycopg2
+    import psycopg2.pool
+    PSYCOPG2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    psycopg2 = None
+    PSYCOPG2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+DSN_ENV_VAR = "SUPABASE_DB_URL"
+
+
+def quote_ident(name: str) -> str:
+    """Quote a table or column identifier (schema-qualified names allowed)"""
+    return '.'.join('"' + part.replace('"', '""') + '"' for part in name.split('.'))
+
+
+def array_literal(values: Sequence[Any]) -> str:
+    """Postgres array literal for a list of scalars"""
+    items = []
+    for value in values:
+        if value is None:
+            items.append('NULL')
+        else:
+            text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+            items.append(f'"{text}"')
+    return '{' + ','.join(items) + '}'
+
+
+def copy_value(value: Any, data_type: str) -> Any:
+    """Render a Python value for COPY ... (FORMAT csv) into a column of data_type"""
+    if value is None:
+        return None
+    if data_type in ('json', 'jsonb'):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    if data_type == 'ARRAY' and isinstance(value, (list, tuple)):
+        return array_literal(value)
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    return str(value)
+
+
+def build_copy_csv(records: List[Dict[str, Any]], columns: List[str], types: Dict[str, str]) -> io.StringIO:
+    """CSV body for COPY: NULL is an unquoted empty field, every value is quoted (so '' stays '')"""
+    buffer = io.StringIO()
+    for record in records:
+        fields = []
+        for column in columns:
+            value = copy_value(record.get(column), types.get(column, 'text'))
+            fields.append('' if value is None else '"' + value.replace('"', '""') + '"')
+        buffer.write(','.join(fields) + '\n')
+    buffer.seek(0)
+    return buffer
+
+
+def build_merge_sql(table: str, staging: str, columns: List[str], conflict_columns: List[str],
+                    update_columns: Optional[List[str]] = None) -> str:
+    """INSERT ... SELECT FROM staging ON CONFLICT ... RETURNING whether each row was inserted"""
+    update_columns = [c for c in (update_columns or columns) if c not in conflict_columns]
+    column_list = ', '.join(quote_ident(c) for c in columns)
+    conflict = ', '.join(quote_ident(c) for c in conflict_columns)
+    if update_columns:
+        action = 'DO UPDATE SET ' + ', '.join(f"{quote_ident(c)} = EXCLUDED.{quote_ident(c)}"
+                                              for c in update_columns)
+    else:
+        action = 'DO NOTHING'
+    # xmax = 0 only for freshly inserted tuples
+    return (f"INSERT INTO {quote_ident(table)} ({column_list}) "
+            f"SELECT {column_list} FROM {quote_ident(staging)} "
+            f"ON CONFLICT ({conflict}) {action} "
+            f"RETURNING (xmax = 0) AS inserted")
+
+
+class PostgresCopyBackend:
+    """Pooled direct Postgres connection for COPY-based bulk upserts"""
+
+    def __init__(self, dsn: str, min_connections: int = 1, max_connections: int = 4,
+                 connect_timeout: int = 10):
+        """
+        Args:
+            dsn: Postgres connection string (Supabase: Settings -> Database)
+            min_connections: Connections opened up front
+            max_connections: Pool ceiling; bulk writers share it across threads
+            connect_timeout: Seconds to wait for a new connection
+        """
+        if not PSYCOPG2_AVAILABLE:
+            raise ImportError("psycopg2 is required for the Postgres COPY backend (pip install psycopg2-binary)")
+        self.pool = psycopg2.pool.ThreadedConnectionPool(min_connections, max_connections, dsn,
+                                                         connect_timeout=connect_timeout)
+        self._types: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection; commits on success, rolls back on error"""
+        conn = self.pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def column_types(self, conn, table: str) -> Dict[str, str]:
+        """information_schema data types per column, cached per table"""
+        with self._lock:
+            if table in self._types:
+                return self._types[table]
+        schema, _, name = table.rpartition('.')
+        with conn.cursor() as cur:
+            cur.execute("SELECT column_name, data_type FROM information_schema.columns "
+                        "WHERE table_schema = %s AND table_name = %s", (schema or 'public', name))
+            types = dict(cur.fetchall())
+        with self._lock:
+            self._types[table] = types
+        return types
+
+    def copy_upsert(self, table: str, records: List[Dict[str, Any]], conflict_columns: List[str],
+                    update_columns: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        COPY records into a staging table and merge them into table.
+
+        Records missing a conflict key are skipped and records repeating one
+        are collapsed (last wins). Returns
+        exact inserted / updated counts; rows skipped by DO NOTHING count as
+        neither.
+        """
+        unique: Dict[tuple, Dict[str, Any]] = {}
+        for record in records:
+            key = tuple(record.get(c) for c in conflict_columns)
+            if all(part is not None for part in key):
+                unique[key] = record
+        rows = list(unique.values())
+        if not rows:
+            return {'inserted': 0, 'updated': 0}
+
+        columns: List[str] = []
+        for record in rows:
+            columns.extend(c for c in record if c not in columns)
+
+        staging = f"_copy_stage_{table.replace('.', '_')}"
+        with self.connection() as conn:
+            types = self.column_types(conn, table)
+            unknown = [c for c in columns if c not in types]
+            if unknown:
+                raise ValueError(f"Unknown columns for {table}: {', '.join(unknown)}")
+            column_list = ', '.join(quote_ident(c) for c in columns)
+            with conn.cursor() as cur:
+                # Only the written columns, typed like the target, without its NOT NULL constraints
+                cur.execute(f"CREATE TEMP TABLE {quote_ident(staging)} ON COMMIT DROP AS "
+                            f"SELECT {column_list} FROM {quote_ident(table)} WITH NO DATA")
+                cur.copy_expert(f"COPY {quote_ident(staging)} ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                                build_copy_csv(rows, columns, types))
+                cur.execute(build_merge_sql(table, staging, columns, conflict_columns, update_columns))
+                results = cur.fetchall()
+
+        inserted = sum(1 for (was_inserted,) in results if was_inserted)
+        logger.info(f"🐘 COPY {table}: {inserted} inserted, {len(results) - inserted} updated")
+        return {'inserted': inserted, 'updated': len(results) - inserted}
+
+    def call_function(self, name: str, payload: Any) -> Any:
+        """Call a single-JSONB-argument database function (e.g. a batch RPC) and return its result"""
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT {quote_ident(name)}(%s::jsonb)", (json.dumps(payload, default=str),))
+                return cur.fetchone()[0]
+
+    def close(self):
+        """Close every pooled connection"""
+        self.pool.closeall()
+
+
+_shared_backend: Optional[PostgresCopyBackend] = None
+_shared_lock = threading.Lock()
+
+
+def get_copy_backend() -> Optional[PostgresCopyBackend]:
+    """
+    Shared backend when SUPABASE_DB_URL is set and psycopg2 is installed,
+    otherwise None (callers stay on PostgREST).
+    """
+    global _shared_backend
+    dsn = os.getenv(DSN_ENV_VAR)
+    if not dsn:
+        return None
+    if not PSYCOPG2_AVAILABLE:
+        logger.warning(f"⚠️ {DSN_ENV_VAR} is set but psycopg2 is not installed - using PostgREST")
+        return None
+    with _shared_lock:
+        if _shared_backend is None:
+            _shared_backend = PostgresCopyBackend(dsn)
+            logger.info("🐘 Direct Postgres COPY backend enabled")
+        return _shared_backend
@@ -0,0 +1,82 @@
+"""
+SERP Cache
+Remembers Google Search discovery answers across campaigns, including "nothing found"
+
+find_linkedin_url and Facebook discovery re-ran identical Google queries every
+time a business reappeared in a new campaign. Answers are cached under a
+normalized (site, name, city) key; negative answers are cached too so a
+"no LinkedIn found" result is not re-bought on every run.
+"""
+
+import logging
+import re
+import unicodedata
+from typing import Any, Callable, Optional
+
+from .cache_store import MISS, SupabaseCacheBackend, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def normalize_query_part(text: Optional[str]) -> str:
+    """Casefold, strip accents and punctuation, and collapse whitespace"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    text = text.casefold().replace('&', ' and ')
+    text = re.sub(r"['’`]", '', text)
+    text = re.sub(r'[^a-z0-9]+', ' ', text)
+    return ' '.join(text.split())
+
+
+def serp_key(business_name: str, city: Optional[str], site: str) -> str:
+    """Build the cache key for a discovery query ('linkedin.com|joes dentistry|miami')"""
+    return f"{site.lower()}|{normalize_query_part(business_name)}|{normalize_query_part(city)}"
+
+
+class SerpCache:
+    """TTL + LRU cache of discovery answers keyed by normalized query"""
+
+    def __init__(self, client=None, ttl_days: float = 60, negative_ttl_days: float = 30,
+                 max_entries: int = 50000):
+        """
+        Args:
+            client: Optional Supabase client for cross-campaign persistence
+            ttl_days: Lifetime of positive answers
+            negative_ttl_days: Lifetime of "not found" answers
+            max_entries: In-memory LRU bound
+        """
+        backend = SupabaseCacheBackend(client) if client is not None else None
+        self.cache = TTLCache('serp', ttl_seconds=ttl_days * DAY_SECONDS,
+                              negative_ttl_seconds=negative_ttl_days * DAY_SECONDS,
+                              max_entries=max_entries, backend=backend)
+
+    def get(self, business_name: str, city: Optional[str], site: str) -> Any:
+        """Return the cached answer (None means cached "not found") or MISS"""
+        return self.cache.get(serp_key(business_name, city, site))
+
+    def set(self, business_name: str, city: Optional[str], site: str, answer: Any):
+        """Cache an answer; pass None to record that nothing was found"""
+        self.cache.set(serp_key(business_name, city, site), answer)
+
+    def cached_lookup(self, business_name: str, city: Optional[str], site: str,
+                      fetch: Callable[[], Any]) -> Any:
+        """
+        Return the cached answer or call fetch() and cache its result.
+
+        fetch should raise on transport errors so failures are never cached as
+        "not found"; e.g. wrap find_linkedin_url's Apify call.
+        """
+        answer = self.get(business_name, city, site)
+        if answer is not MISS:
+            return answer
+        answer = fetch()
+        self.set(business_name, city, site, answer)
+        return answer
+
+    def get_stats(self):
+        """Return cache hit/miss statistics"""
+        return self.cache.get_stats()
@@ -0,0 +1,261 @@
+"""
+Unified SERP Discovery
+One Google search per business finds its Facebook, LinkedIn and Instagram URLs
+
+Phase 2B searched `"[Name]" site:facebook.com [City]` and Phase 2.5 step 1
+searched `"[Name]" site:linkedin.com [City]` separately - two Google Search
+actor calls per business. This stage runs a single OR-combined query per
+business and pulls every social URL from the same organic results, feeding
+both FacebookScraper and LinkedInScraperParallel.
+"""
+
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .cache_store import MISS
+from .facebook_page_index import canonicalize_facebook_url
+
+logger = logging.getLogger(__name__)
+
+
+GOOGLE_SEARCH_ACTOR = "apify~google-search-scraper"
+
+SOCIAL_SITES = ['facebook.com', 'linkedin.com', 'instagram.com']
+
+INSTAGRAM_NON_PROFILES = {'p', 'reel', 'reels', 'explore', 'stories', 'tv', 'accounts', 'about', 'developer'}
+
+# Words too common in business names to count as evidence of a match
+NAME_STOPWORDS = {
+    'the', 'and', 'of', 'in', 'at', 'for', 'llc', 'inc', 'co', 'company', 'corp',
+    'ltd', 'pllc', 'pc', 'pa', 'group', 'services', 'service', 'center', 'centre',
+}
+
+
+def build_combined_query(business_name: str, city: Optional[str] = None) -> str:
+    """Build one OR-combined query covering every social site"""
+    sites = ' OR '.join(f"site:{site}" for site in SOCIAL_SITES)
+    query = f'"{business_name}"'
+    if city:
+        query += f" {city}"
+    return f"{query} ({sites})"
+
+
+def _name_tokens(text: str) -> set:
+    return {t for t in re.findall(r'[a-z0-9]+', (text or '').lower())
+            if len(t) > 1 and t not in NAME_STOPWORDS}
+
+
+def facebook_page_url(url: str) -> Optional[str]:
+    """Reduce a Facebook result URL to its canonical page URL, or None for non-page URLs"""
+    canonical = canonicalize_facebook_url(url)
+    return canonical['url'] if canonical else None
+
+
+def linkedin_profile_url(url: str) -> Optional[Dict[str, str]]:
+    """Reduce a LinkedIn result URL to a company page or personal profile"""
+    parsed = urlparse(url)
+    host = (parsed.netloc or '').lower()
+    if not host.endswith('linkedin.com'):
+        return None
+
+    segments = [s for s in parsed.path.split('/') if s]
+    if len(segments) >= 2 and segments[0] == 'company':
+        return {'url': f"https://www.linkedin.com/company/{segments[1]}", 'profile_type': 'company'}
+    if len(segments) >= 2 and segments[0] == 'in':
+        return {'url': f"https://www.linkedin.com/in/{segments[1]}", 'profile_type': 'personal'}
+    return None
+
+
+def instagram_profile_url(url: str) -> Optional[str]:
+    """Reduce an Instagram result URL to a profile, or None for posts/reels"""
+    parsed = urlparse(url)
+    host = (parsed.netloc or '').lower()
+    if not host.endswith('instagram.com'):
+        return None
+
+    segments = [s for s in parsed.path.split('/') if s]
+    if not segments or segments[0].lower() in INSTAGRAM_NON_PROFILES:
+        return None
+    return f"https://www.instagram.com/{segments[0]}"
+
+
+def extract_social_urls(business_name: str, organic_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Pick the best Facebook, LinkedIn and Instagram URL from one result page.
+
+    A result only counts when its title or URL shares a significant token with
+    the business name; among matches the highest ranked result wins, and
+    LinkedIn company pages beat personal profiles.
+    """
+    wanted = _name_tokens(business_name)
+    found = {'facebook_url': None, 'linkedin_url': None, 'linkedin_profile_type': None,
+             'instagram_url': None}
+
+    for result in organic_results:
+        url = result.get('url') or ''
+        haystack = _name_tokens(f"{result.get('title', '')} {url}")
+        if wanted and not (wanted & haystack):
+            continue
+
+        if not found['facebook_url']:
+            found['facebook_url'] = facebook_page_url(url)
+
+        linkedin = linkedin_profile_url(url)
+        if linkedin and (not found['linkedin_url'] or
+                         (found['linkedin_profile_type'] == 'personal' and linkedin['profile_type'] == 'company')):
+            found['linkedin_url'] = linkedin['url']
+            found['linkedin_profile_type'] = linkedin['profile_type']
+
+        if not found['instagram_url']:
+            found['instagram_url'] = instagram_profile_url(url)
+
+    return found
+
+
+class UnifiedSerpDiscovery:
+    """Batch Google searches that discover all social URLs for a list of businesses"""
+
+    def __init__(self, apify_key: str, actor_id: str = GOOGLE_SEARCH_ACTOR,
+                 batch_size: int = 15, max_parallel_batches: int = 3,
+                 results_per_page: int = 10, timeout: int = 300, cache=None):
+        """
+        Args:
+            cache: Optional SerpCache; cached answers (including "nothing found")
+                skip the actor call entirely
+        """
+        self.apify_key = apify_key
+        self.actor_id = actor_id
+        self.batch_size = batch_size
+        self.max_parallel_batches = max_parallel_batches
+        self.results_per_page = results_per_page
+        self.timeout = timeout
+        self.cache = cache
+
+        self.stats = {'queries': 0, 'cache_hits': 0, 'actor_calls': 0, 'facebook_found': 0,
+                      'linkedin_found': 0, 'instagram_found': 0, 'errors': 0}
+
+    def _run_search(self, queries: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Run one actor call for a batch of newline-separated queries"""
+        url = f"https://api.apify.com/v2/acts/{self.actor_id}/run-sync-get-dataset-items"
+        payload = {
+            "queries": "\n".join(queries),
+            "maxPagesPerQuery": 1,
+            "resultsPerPage": self.results_per_page,
+            "languageCode": "en",
+            "mobileResults": False,
+        }
+        try:
+            response = requests.post(url, json=payload, params={"token": self.apify_key},
+                                     timeout=self.timeout)
+            self.stats['actor_calls'] += 1
+            if response.status_code not in (200, 201):
+                logger.error(f"❌ Google Search actor returned {response.status_code}")
+                self.stats['errors'] += 1
+                return {}
+            items = response.json()
+        except Exception as e:
+            logger.error(f"❌ Google Search batch failed: {e}")
+            self.stats['errors'] += 1
+            return {}
+
+        # Every query in a successful batch gets an entry, so "no results" is distinguishable from a failed batch
+        results = {query: [] for query in queries}
+        for item in items or []:
+            term = (item.get('searchQuery') or {}).get('term')
+            if term:
+                results.setdefault(term, []).extend(item.get('organicResults') or [])
+        return results
+
+    def discover(self, businesses: List[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Discover social URLs for businesses in parallel batches.
+
+        Returns {business_id: {'facebook_url', 'linkedin_url', 'linkedin_profile_type',
+        'instagram_url', 'query'}} for every business searched.
+        """
+        discovered = {}
+        queries = {}
+        for business in businesses:
+            name = business.get('name')
+            if not name:
+                continue
+            if self.cache is not None:
+                cached = self.cache.get(name, business.get('city'), 'social')
+                if cached is not MISS:
+                    self.stats['cache_hits'] += 1
+                    discovered[business['id']] = self._cached_answer(cached)
+                    continue
+            queries[business['id']] = build_combined_query(name, business.get('city'))
+
+        if not queries:
+            return discovered
+
+        unique_queries = list(dict.fromkeys(queries.values()))
+        batches = [unique_queries[i:i + self.batch_size]
+                   for i in range(0, len(unique_queries), self.batch_size)]
+        logger.info(f"🔎 Unified discovery: {len(unique_queries)} queries in {len(batches)} batches")
+
+        results_by_query: Dict[str, List[Dict[str, Any]]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_parallel_batches) as executor:
+            for batch_results in executor.map(self._run_search, batches):
+                results_by_query.update(batch_results)
+        self.stats['queries'] += len(unique_queries)
+
+        by_id = {b['id']: b for b in businesses}
+        for business_id, query in queries.items():
+            business = by_id[business_id]
+            found = extract_social_urls(business['name'], results_by_query.get(query, []))
+            if self.cache is not None and query in results_by_query:
+                has_any = any(found[f] for f in ('facebook_url', 'linkedin_url', 'instagram_url'))
+                self.cache.set(business['name'], business.get('city'), 'social', found if has_any else None)
+            found['query'] = query
+            discovered[business_id] = found
+            for field, stat in (('facebook_url', 'facebook_found'), ('linkedin_url', 'linkedin_found'),
+                                ('instagram_url', 'instagram_found')):
+                if found[field]:
+                    self.stats[stat] += 1
+
+        logger.info(f"✅ Discovery found Facebook: {self.stats['facebook_found']}, "
+                    f"LinkedIn: {self.stats['linkedin_found']}, Instagram: {self.stats['instagram_found']}")
+        return discovered
+
+    @staticmethod
+    def _cached_answer(cached: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        answer = {'facebook_url': None, 'linkedin_url': None, 'linkedin_profile_type': None,
+                  'instagram_url': None}
+        answer.update(cached or {})
+        answer['query'] = None
+        return answer
+
+
+def apply_discoveries(businesses: List[Dict[str, Any]],
+                      discovered: Dict[Any, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fill missing social URLs on business dicts and split them by consumer.
+
+    Returns {'facebook': businesses with a newly found Facebook page (for
+    FacebookScraper), 'linkedin': businesses with a LinkedIn URL (lets
+    LinkedInScraperParallel skip find_linkedin_url)}.
+    """
+    needs_facebook, has_linkedin = [], []
+    for business in businesses:
+        found = discovered.get(business.get('id'))
+        if not found:
+            continue
+        if found['facebook_url'] and not business.get('facebook_url'):
+            business['facebook_url'] = found['facebook_url']
+            business['needs_enrichment'] = True
+            needs_facebook.append(business)
+        if found['instagram_url'] and not business.get('instagram_url'):
+            business['instagram_url'] = found['instagram_url']
+        if found['linkedin_url']:
+            if not business.get('linkedin_url'):
+                business['linkedin_url'] = found['linkedin_url']
+            has_linkedin.append(business)
+
+    return {'facebook': needs_facebook, 'linkedin': has_linkedin}
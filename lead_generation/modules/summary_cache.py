@@ -0,0 +1,125 @@
+"""
+Website Summary Cache
+Reuses LLM website summaries across contacts and campaigns
+
+AIProcessor re-summarized the same company website for every colleague in
+raw_contacts and again in every campaign. Summaries are cached under
+(domain, content hash, summary prompt version): contacts sharing a website
+reuse one summary, and a page is only re-summarized when its content changes
+or the summary prompt is revised.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .cache_store import MISS, SupabaseCacheBackend, TTLCache
+from .domain_grouping import normalize_domain
+
+logger = logging.getLogger(__name__)
+
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Bump whenever the website summary prompt changes so old summaries are not reused
+SUMMARY_PROMPT_VERSION = "1"
+
+
+def content_hash(content: Optional[str]) -> str:
+    """sha256 of page text with whitespace collapsed, so re-renders hash the same"""
+    normalized = ' '.join((content or '').split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def prompt_version(prompt_text: str) -> str:
+    """Derive a version string from the summary prompt text itself"""
+    return hashlib.sha256(prompt_text.encode('utf-8')).hexdigest()[:12]
+
+
+def _site_key(website: str) -> str:
+    domain = normalize_domain(website)
+    if domain:
+        return domain
+    # Shared platforms (facebook.com pages, linktr.ee) - keep the full path
+    return re.sub(r'^[a-z][a-z0-9+.-]*://(www\.)?', '', website.strip().lower()).rstrip('/')
+
+
+class WebsiteSummaryCache:
+    """Summary cache keyed by (domain, content hash, prompt version)"""
+
+    def __init__(self, client=None, ttl_days: float = 90, max_entries: int = 20000,
+                 version: str = SUMMARY_PROMPT_VERSION):
+        """
+        Args:
+            client: Optional Supabase client for cross-campaign persistence
+            ttl_days: Upper bound on summary age even when content is unchanged
+            max_entries: In-memory LRU bound
+            version: Summary prompt version (SUMMARY_PROMPT_VERSION or prompt_version(text))
+        """
+        backend = SupabaseCacheBackend(client) if client is not None else None
+        self.cache = TTLCache('website_summary', ttl_seconds=ttl_days * DAY_SECONDS,
+                              max_entries=max_entries, backend=backend)
+        self.version = version
+        self._inflight: Dict[str, threading.Lock] = {}
+        self._inflight_lock = threading.Lock()
+        self.stats = {'summaries_reused': 0, 'summaries_generated': 0}
+
+    def key(self, website: str, content: str) -> str:
+        """Cache key for one page of a website"""
+        return f"{_site_key(website)}|{content_hash(content)}|{self.version}"
+
+    def get(self, website: str, content: str):
+        """Return the cached summary for this page content or MISS"""
+        return self.cache.get(self.key(website, content))
+
+    def set(self, website: str, content: str, summary: str):
+        """Cache a summary for this page content"""
+        if summary:
+            self.cache.set(self.key(website, content), summary)
+
+    def get_or_summarize(self, website: str, content: str, summarize: Callable[[str], Optional[str]]
+                         ) -> Optional[str]:
+        """
+        Return the cached summary or call summarize(content) and cache it.
+
+        Concurrent callers for the same page wait for the first summary instead
+        of each paying for one. Empty summaries (LLM failures) are not cached.
+        """
+        if not content or not content.strip():
+            return None
+
+        key = self.key(website, content)
+        summary = self.cache.get(key)
+        if summary is not MISS:
+            self.stats['summaries_reused'] += 1
+            return summary
+
+        with self._inflight_lock:
+            lock = self._inflight.setdefault(key, threading.Lock())
+        with lock:
+            summary = self.cache.get(key)
+            if summary is not MISS:
+                self.stats['summaries_reused'] += 1
+                return summary
+            summary = summarize(content)
+            self.stats['summaries_generated'] += 1
+            if summary:
+                self.cache.set(key, summary)
+
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        return summary
+
+    def summarize_pages(self, website: str, pages: List[str], summarize: Callable[[str], Optional[str]]
+                        ) -> List[str]:
+        """Summaries for each page of a website (the website_summaries list), skipping failures"""
+        summaries = [self.get_or_summarize(website, page, summarize) for page in pages]
+        return [summary for summary in summaries if summary]
+
+    def get_stats(self):
+        """Return cache statistics plus summaries reused vs generated"""
+        stats = self.cache.get_stats()
+        stats.update(self.stats)
+        return stats
@@ -0,0 +1,160 @@
+"""
+Summary Trimming
+Token-budgeted selection of website_summaries before icebreaker generation
+
+generate_icebreaker received every summary the scraper produced, sometimes
+several long pages, and paid for all of it on every call. Summaries are split
+into sentences, ranked by relevance to the contact (headline, company,
+category, city) with a BM25-style score plus a small bonus for leading and
+concrete sentences, and the best sentences are kept - in their original order -
+until the token budget is spent. Inputs already under budget pass through
+unchanged.
+"""
+
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .openai_client import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TOKEN_BUDGET = 350
+
+# Contact fields whose words make a sentence relevant, with weights
+QUERY_FIELDS = {
+    'headline': 2.0, 'title': 2.0, 'job_title': 2.0, 'company_name': 1.5, 'name': 1.5,
+    'category': 1.5, 'city': 1.0, 'location': 1.0,
+}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'they', 'this', 'to', 'was', 'we', 'with',
+    'you', 'your', 'llc', 'inc', 'co',
+}
+
+# Abbreviations that end in a period without ending the sentence
+ABBREVIATIONS = {'dr', 'mr', 'mrs', 'ms', 'st', 'ave', 'inc', 'jr', 'sr', 'co', 'ltd', 'vs', 'no', 'mt', 'ft'}
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+@lru_cache(maxsize=50000)
+def sentence_tokens(sentence: str, model: str = 'gpt-4o') -> int:
+    """Token count of a sentence, cached - colleagues share the same summaries"""
+    return count_tokens(sentence, model)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a summary into sentences"""
+    sentences: List[str] = []
+    for piece in _SENTENCE_END.split(' '.join((text or '').split())):
+        if sentences and sentences[-1].rsplit(' ', 1)[-1].rstrip('.').lower() in ABBREVIATIONS:
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        elif piece.strip():
+            sentences.append(piece.strip())
+    return sentences
+
+
+def truncate_to_tokens(text: str, token_budget: int, model: str = 'gpt-4o') -> str:
+    """Longest word-boundary prefix of text within token_budget"""
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(' '.join(words[:middle]), model) <= token_budget:
+            low = middle
+        else:
+            high = middle - 1
+    return ' '.join(words[:low])
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD.findall((text or '').lower()) if w not in STOPWORDS and len(w) > 1]
+
+
+def contact_query(contact: Dict[str, Any]) -> Dict[str, float]:
+    """Weighted query terms drawn from the contact"""
+    query: Dict[str, float] = {}
+    for field, weight in QUERY_FIELDS.items():
+        for term in _terms(str(contact.get(field) or '')):
+            query[term] = max(query.get(term, 0.0), weight)
+    return query
+
+
+def _score_sentences(sentences: List[Dict[str, Any]], query: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+    docs = [_terms(s['text']) for s in sentences]
+    avg_len = sum(len(d) for d in docs) / len(docs) if docs else 1
+    doc_freq: Dict[str, int] = {}
+    for terms in docs:
+        for term in set(terms):
+            doc_freq[term] = doc_freq.get(term, 0) + 1
+
+    n = len(docs)
+    for sentence, terms in zip(sentences, docs):
+        score = 0.0
+        for term, weight in query.items():
+            tf = terms.count(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (n - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += weight * idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(terms) / (avg_len or 1)))
+        # Leading sentences usually say what the company does; numbers are concrete hooks
+        score += 0.5 / (1 + sentence['position'])
+        if re.search(r"\d", sentence['text']):
+            score += 0.2
+        sentence['score'] = score
+
+
+def trim_summaries(website_summaries: Optional[List[str]], contact: Dict[str, Any],
+                   token_budget: int = DEFAULT_TOKEN_BUDGET, model: str = 'gpt-4o') -> List[str]:
+    """
+    Return website_summaries trimmed to token_budget.
+
+    Sentences are chosen by relevance to the contact, duplicates across
+    summaries are dropped, and the chosen sentences keep their original
+    summary and order. When no whole sentence fits (e.g. a summary without
+    sentence breaks), the top-ranked sentence is cut to the budget instead.
+    """
+    summaries = [s for s in (website_summaries or []) if s and s.strip()]
+    total = sum(sentence_tokens(s, model) for s in summaries)
+    if total <= token_budget:
+        return summaries
+
+    sentences: List[Dict[str, Any]] = []
+    seen = set()
+    for summary_index, summary in enumerate(summaries):
+        for position, text in enumerate(split_sentences(summary)):
+            normalized = ' '.join(_terms(text))
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            sentences.append({'summary': summary_index, 'position': position, 'text': text,
+                              'tokens': sentence_tokens(text, model)})
+
+    _score_sentences(sentences, contact_query(contact))
+
+    chosen = []
+    used = 0
+    for sentence in sorted(sentences, key=lambda s: s['score'], reverse=True):
+        if used + sentence['tokens'] <= token_budget:
+            chosen.append(sentence)
+            used += sentence['tokens']
+
+    if not chosen and sentences:
+        best = max(sentences, key=lambda s: s['score'])
+        text = truncate_to_tokens(best['text'], token_budget, model)
+        if text:
+            chosen.append({**best, 'text': text})
+            used = count_tokens(text, model)
+
+    trimmed: Dict[int, List[str]] = {}
+    for sentence in sorted(chosen, key=lambda s: (s['summary'], s['position'])):
+        trimmed.setdefault(sentence['summary'], []).append(sentence['text'])
+
+    logger.debug(f"✂️ website_summaries trimmed {total} -> {used} tokens")
+    return [' '.join(parts) for _, parts in sorted(trimmed.items())]
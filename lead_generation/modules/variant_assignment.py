@@ -0,0 +1,134 @@
+"""
+Variant Assignment
+Deterministic hash-based A/B assignment of icebreaker variants
+
+icebreaker_variant defaulted to 'control' and nothing assigned variants in a
+reproducible way. Each business is placed in a weighted bucket by hashing
+(experiment id, place_id): the same business always lands in the same variant
+for an experiment, reruns are idempotent, and no assignment table is needed. A
+campaign is assigned in one pass, then written with one bulk UPDATE per
+variant chunk (id IN (...)) and a single upsert of icebreaker_experiments
+sample sizes - never a round trip per row.
+"""
+
+import bisect
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+HASH_SPACE = 2 ** 64
+
+
+def bucket_fraction(experiment_id: str, unit_id: str) -> float:
+    """Uniform value in [0, 1) derived from sha256(experiment_id:unit_id)"""
+    digest = hashlib.sha256(f"{experiment_id}:{unit_id}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') / HASH_SPACE
+
+
+class VariantAssigner:
+    """Maps units (place_ids) to weighted variants for one experiment"""
+
+    def __init__(self, experiment_id: str, variants: Dict[str, float]):
+        """
+        Args:
+            experiment_id: Salt for the hash; a new id reshuffles every unit
+            variants: Variant name -> weight (weights need not sum to 1)
+        """
+        weights = {name: float(weight) for name, weight in variants.items() if weight and weight > 0}
+        if not weights:
+            raise ValueError("At least one variant needs a positive weight")
+        self.experiment_id = str(experiment_id)
+        # Sorted names keep assignments stable regardless of dict order
+        self.names = sorted(weights)
+        total = sum(weights.values())
+        self.boundaries = []
+        cumulative = 0.0
+        for name in self.names:
+            cumulative += weights[name] / total
+            self.boundaries.append(cumulative)
+        self.boundaries[-1] = 1.0
+
+    def assign(self, unit_id: str) -> str:
+        """Variant for a unit"""
+        index = bisect.bisect_right(self.boundaries, bucket_fraction(self.experiment_id, unit_id))
+        return self.names[min(index, len(self.names) - 1)]
+
+    def assign_many(self, businesses: List[Dict[str, Any]], unit_field: str = 'place_id') -> Dict[str, List[str]]:
+        """
+        Assign businesses in one pass; returns variant -> business ids.
+
+        Businesses without a place_id fall back to their id as the hash unit.
+        """
+        assignments: Dict[str, List[str]] = {name: [] for name in self.names}
+        for business in businesses:
+            unit = business.get(unit_field) or business.get('id')
+            if unit and business.get('id'):
+                assignments[self.assign(str(unit))].append(business['id'])
+        return assignments
+
+
+def apply_assignments(client, campaign_id: str, assignments: Dict[str, List[str]],
+                      organization_id: Optional[str] = None, chunk_size: int = 100) -> Dict[str, int]:
+    """
+    Write assignments: bulk UPDATE of gmaps_businesses.icebreaker_variant per
+    variant chunk, then one upsert of icebreaker_experiments.sample_size.
+
+    sample_size is the absolute number of businesses assigned, so assign the
+    whole campaign on each run. Experiment rows of variants no longer in
+    assignments are kept for their results but set to sample_size 0. Business ids go in the PATCH URL, hence the
+    small chunks. organization_id is only written when given, so an upsert never
+    clears it on an existing experiment row.
+    """
+    for variant, business_ids in assignments.items():
+        for start in range(0, len(business_ids), chunk_size):
+            chunk = business_ids[start:start + chunk_size]
+            (client.table("gmaps_businesses")
+             .update({"icebreaker_variant": variant})
+             .in_("id", chunk)
+             .execute())
+
+    counts = {variant: len(ids) for variant, ids in assignments.items()}
+    rows = [{"campaign_id": campaign_id, "variant_name": variant, "sample_size": count}
+            for variant, count in counts.items()]
+    if organization_id is not None:
+        for row in rows:
+            row["organization_id"] = organization_id
+    if rows:
+        (client.table("icebreaker_experiments")
+         .upsert(rows, on_conflict="campaign_id,variant_name")
+         .execute())
+
+    removed = (client.table("icebreaker_experiments")
+               .update({"sample_size": 0})
+               .eq("campaign_id", campaign_id))
+    if counts:
+        removed = removed.not_.in_("variant_name", list(counts))
+    removed.execute()
+    return counts
+
+
+def assign_campaign(client, campaign_id: str, experiment_id: str, variants: Dict[str, float],
+                    organization_id: Optional[str] = None, page_size: int = 1000) -> Dict[str, int]:
+    """Load a campaign's businesses page by page, assign variants and write them in bulk"""
+    businesses = []
+    offset = 0
+    while True:
+        result = (client.table("gmaps_businesses")
+                  .select("id, place_id")
+                  .eq("campaign_id", campaign_id)
+                  .range(offset, offset + page_size - 1)
+                  .execute())
+        page = result.data or []
+        businesses.extend(page)
+        if len(page) < page_size:
+            break
+        offset += page_size
+
+    assignments = VariantAssigner(experiment_id, variants).assign_many(businesses)
+    counts = apply_assignments(client, campaign_id, assignments, organization_id)
+    logger.info(f"🧪 Assigned {len(businesses)} businesses in campaign {campaign_id} to variants: "
+                + ', '.join(f"{v}={n}" for v, n in counts.items()))
+    return counts
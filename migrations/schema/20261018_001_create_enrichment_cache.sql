@@ -0,0 +1,53 @@
+-- ============================================================================
+-- Migration: Create enrichment_cache table for cross-campaign result caching
+-- Date: 2026-10-18
+-- Description: Key/value store used by the Python enrichment caches (SERP
+--              discovery answers first). Entries are namespaced per cache and
+--              expire via expires_at; is_negative marks cached "not found"
+--              answers so they are not re-bought on every campaign.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS enrichment_cache (
+    namespace VARCHAR(50) NOT NULL,     -- 'serp', ...
+    cache_key TEXT NOT NULL,            -- normalized key, e.g. 'linkedin.com|joes dentistry|miami'
+    value JSONB,                        -- cached answer (NULL for negative entries)
+    is_negative BOOLEAN DEFAULT FALSE,  -- TRUE when the lookup found nothing
+    expires_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (namespace, cache_key)
+);
+
+-- Expiry sweeps
+CREATE INDEX IF NOT EXISTS idx_enrichment_cache_expires
+ON enrichment_cache(expires_at);
+
+CREATE OR REPLACE FUNCTION update_enrichment_cache_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_enrichment_cache_updated_at ON enrichment_cache;
+
+CREATE TRIGGER trigger_enrichment_cache_updated_at
+    BEFORE UPDATE ON enrichment_cache
+    FOR EACH ROW
+    EXECUTE FUNCTION update_enrichment_cache_updated_at();
+
+-- Remove expired entries (run from a scheduled job or manually)
+CREATE OR REPLACE FUNCTION purge_expired_enrichment_cache()
+RETURNS INTEGER AS $$
+DECLARE
+    deleted_count INTEGER;
+BEGIN
+    DELETE FROM enrichment_cache WHERE expires_at < NOW();
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+    RETURN deleted_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE enrichment_cache IS 'Cross-campaign cache for paid enrichment lookups (Google Search, LinkedIn, Facebook)';
+COMMENT ON COLUMN enrichment_cache.is_negative IS 'TRUE when the cached answer is "nothing found"';
@@ -0,0 +1,38 @@
+-- ============================================================================
+-- Migration: Create bulk_update_icebreakers RPC
+-- Date: 2026-10-18
+-- Description: Writes many generated icebreakers to gmaps_businesses in one
+--              statement. Used by the offline (Batch API) icebreaker mode,
+--              which returns results for a whole campaign at once; row-by-row
+--              PATCH requests would take longer than the batch itself.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION bulk_update_icebreakers(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    -- p_rows: [{"id", "icebreaker", "subject_line", "icebreaker_variant", "icebreaker_metadata"}, ...]
+    UPDATE gmaps_businesses b
+    SET icebreaker = r.icebreaker,
+        -- Over-long model output is cut to the column width instead of failing the whole chunk
+        subject_line = COALESCE(LEFT(r.subject_line, 255), b.subject_line),
+        icebreaker_variant = COALESCE(r.icebreaker_variant, b.icebreaker_variant),
+        icebreaker_metadata = COALESCE(b.icebreaker_metadata, '{}'::jsonb) || COALESCE(r.icebreaker_metadata, '{}'::jsonb),
+        icebreaker_generated_at = NOW()
+    FROM jsonb_to_recordset(p_rows) AS r(
+        id UUID,
+        icebreaker TEXT,
+        subject_line TEXT,
+        icebreaker_variant VARCHAR(50),
+        icebreaker_metadata JSONB
+    )
+    WHERE b.id = r.id
+      AND r.icebreaker IS NOT NULL;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION bulk_update_icebreakers(JSONB) IS 'Set icebreaker, subject_line and variant for many gmaps_businesses rows in one call; returns rows updated';
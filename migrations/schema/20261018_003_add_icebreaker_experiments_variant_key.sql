@@ -0,0 +1,13 @@
+-- ============================================================================
+-- Migration: Unique (campaign_id, variant_name) on icebreaker_experiments
+-- Date: 2026-10-18
+-- Description: Variant assignment upserts one experiments row per campaign and
+--              variant (on_conflict=campaign_id,variant_name) instead of
+--              looking rows up first. Fails if duplicate rows already exist;
+--              merge them before applying.
+-- ============================================================================
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_experiments_campaign_variant
+ON icebreaker_experiments(campaign_id, variant_name);
+
+COMMENT ON INDEX idx_experiments_campaign_variant IS 'One experiments row per campaign and variant; upsert target for variant assignment';
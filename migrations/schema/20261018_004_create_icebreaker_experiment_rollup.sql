@@ -0,0 +1,69 @@
+-- ============================================================================
+-- Migration: Incremental rollup of icebreaker_experiments from instantly_events
+-- Date: 2026-10-18
+-- Description: icebreaker_experiments opens/replies/rates were only updated
+--              "by trigger or manually". The Python rollup job reads new
+--              instantly_events since a watermark, aggregates per
+--              (campaign, variant) and applies the deltas plus the new
+--              watermark in one call, so a run is applied exactly once.
+--              Requires idx_experiments_campaign_variant (20261018_003).
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    rollup_name VARCHAR(100) PRIMARY KEY,   -- 'icebreaker_experiments', ...
+    watermark TIMESTAMPTZ NOT NULL,         -- instantly_events.created_at already rolled up
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_instantly_events_created
+ON instantly_events(created_at);
+
+CREATE OR REPLACE FUNCTION apply_icebreaker_experiment_deltas(
+    p_deltas JSONB,
+    p_rollup_name TEXT,
+    p_watermark TIMESTAMPTZ
+)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    -- p_deltas: [{"campaign_id", "organization_id", "variant_name", "opens", "replies", "positive_replies"}, ...]
+    INSERT INTO icebreaker_experiments (campaign_id, organization_id, variant_name, opens, replies, positive_replies)
+    SELECT d.campaign_id, d.organization_id, d.variant_name,
+           COALESCE(d.opens, 0), COALESCE(d.replies, 0), COALESCE(d.positive_replies, 0)
+    FROM jsonb_to_recordset(p_deltas) AS d(
+        campaign_id UUID,
+        organization_id UUID,
+        variant_name VARCHAR(50),
+        opens INTEGER,
+        replies INTEGER,
+        positive_replies INTEGER
+    )
+    ON CONFLICT (campaign_id, variant_name) DO UPDATE
+    SET opens = icebreaker_experiments.opens + EXCLUDED.opens,
+        replies = icebreaker_experiments.replies + EXCLUDED.replies,
+        positive_replies = icebreaker_experiments.positive_replies + EXCLUDED.positive_replies;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+
+    -- Recompute rates for the rows just touched
+    UPDATE icebreaker_experiments e
+    SET open_rate = LEAST(e.opens::DECIMAL / NULLIF(e.sample_size, 0), 9.9999),
+        reply_rate = LEAST(e.replies::DECIMAL / NULLIF(e.sample_size, 0), 9.9999),
+        positive_reply_rate = LEAST(e.positive_replies::DECIMAL / NULLIF(e.sample_size, 0), 9.9999)
+    FROM jsonb_to_recordset(p_deltas) AS d(campaign_id UUID, variant_name VARCHAR(50))
+    WHERE e.campaign_id = d.campaign_id
+      AND e.variant_name = d.variant_name;
+
+    INSERT INTO rollup_watermarks (rollup_name, watermark, updated_at)
+    VALUES (p_rollup_name, p_watermark, NOW())
+    ON CONFLICT (rollup_name) DO UPDATE
+    SET watermark = GREATEST(rollup_watermarks.watermark, EXCLUDED.watermark),
+        updated_at = NOW();
+
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON TABLE rollup_watermarks IS 'High-water marks for incremental rollup jobs';
+COMMENT ON FUNCTION apply_icebreaker_experiment_deltas(JSONB, TEXT, TIMESTAMPTZ) IS 'Add per-(campaign, variant) engagement deltas to icebreaker_experiments, recompute rates and advance the rollup watermark atomically';
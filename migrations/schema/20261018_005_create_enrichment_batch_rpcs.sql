@@ -0,0 +1,119 @@
+-- ============================================================================
+-- Migration: Array versions of the atomic enrichment save RPCs
+-- Date: 2026-10-18
+-- Description: save_facebook_enrichment / save_linkedin_enrichment cost two
+--              round trips per business (enrichment INSERT, then
+--              gmaps_businesses UPDATE). The write-behind buffer in
+--              lead_generation/modules/enrichment_write_buffer.py flushes
+--              many enrichments at once through these functions - the batch
+--              form of save_facebook_enrichment_atomic /
+--              save_linkedin_enrichment_atomic planned in
+--              RPC_MIGRATION_CATALOG.md. Each call is one transaction: the
+--              enrichment rows and the business updates commit together.
+-- ============================================================================
+
+-- p_rows: [{"enrichment": {...gmaps_facebook_enrichments columns...},
+--           "business_update": {"business_id", "email", "email_source", "enrichment_status",
+--                               "attempts", "last_enrichment_attempt"} | null}, ...]
+-- business_update is null for later rows of a business already updated in the same batch;
+-- "attempts" is how many saves that update stands for. enrichment_attempts is incremented by it;
+-- this deliberately differs from save_facebook_enrichment, which sets enrichment_attempts = 1 on
+-- every save, so buffered rows keep a true count of Facebook enrichment tries per business
+CREATE OR REPLACE FUNCTION save_facebook_enrichment_atomic_batch(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    inserted_count INTEGER;
+BEGIN
+    INSERT INTO gmaps_facebook_enrichments (
+        business_id, campaign_id, facebook_url, page_name, page_likes, page_followers,
+        emails, primary_email, email_sources, phone_numbers, addresses,
+        enrichment_source, success, error_message, raw_data
+    )
+    SELECT e.business_id, e.campaign_id, e.facebook_url, e.page_name, e.page_likes, e.page_followers,
+           COALESCE(e.emails, '{}'), e.primary_email, e.email_sources, e.phone_numbers, e.addresses,
+           e.enrichment_source, COALESCE(e.success, FALSE), e.error_message, e.raw_data
+    FROM jsonb_populate_recordset(
+        NULL::gmaps_facebook_enrichments,
+        (SELECT jsonb_agg(r->'enrichment') FROM jsonb_array_elements(p_rows) r)
+    ) AS e;
+
+    GET DIAGNOSTICS inserted_count = ROW_COUNT;
+
+    UPDATE gmaps_businesses b
+    SET enrichment_status = COALESCE(u.enrichment_status, b.enrichment_status),
+        enrichment_attempts = COALESCE(b.enrichment_attempts, 0) + COALESCE(u.attempts, 1),
+        last_enrichment_attempt = COALESCE(u.last_enrichment_attempt, b.last_enrichment_attempt),
+        email = COALESCE(u.email, b.email),
+        email_source = CASE WHEN u.email IS NOT NULL THEN u.email_source ELSE b.email_source END
+    FROM jsonb_to_recordset(
+        (SELECT COALESCE(jsonb_agg(r->'business_update'), '[]'::jsonb)
+         FROM jsonb_array_elements(p_rows) r
+         WHERE jsonb_typeof(r->'business_update') = 'object')
+    ) AS u(
+        business_id UUID,
+        email TEXT,
+        email_source VARCHAR(50),
+        enrichment_status VARCHAR(50),
+        attempts INTEGER,
+        last_enrichment_attempt TIMESTAMPTZ
+    )
+    WHERE b.id = u.business_id;
+
+    RETURN inserted_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- p_rows: [{"enrichment": {...gmaps_linkedin_enrichments columns...},
+--           "business_update": {"business_id", "linkedin_url", "linkedin_enriched", "email", "email_source"} | null}, ...]
+CREATE OR REPLACE FUNCTION save_linkedin_enrichment_atomic_batch(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    inserted_count INTEGER;
+BEGIN
+    INSERT INTO gmaps_linkedin_enrichments (
+        business_id, campaign_id, linkedin_url, profile_type, person_name, person_title,
+        person_profile_url, company_name, location, connections, emails_found, emails_generated,
+        primary_email, email_source, phone_numbers, phone_number, email_extraction_attempted,
+        email_verified_source, email_quality_tier, error_message,
+        bouncer_status, bouncer_score, bouncer_reason, bouncer_verified_at, bouncer_raw_response,
+        email_verified, is_safe, is_disposable, is_role_based, is_free_email
+    )
+    SELECT e.business_id, e.campaign_id, e.linkedin_url, e.profile_type, e.person_name, e.person_title,
+           e.person_profile_url, e.company_name, e.location, e.connections, e.emails_found, e.emails_generated,
+           e.primary_email, e.email_source, e.phone_numbers, e.phone_number,
+           COALESCE(e.email_extraction_attempted, FALSE), e.email_verified_source, e.email_quality_tier,
+           e.error_message,
+           e.bouncer_status, e.bouncer_score, e.bouncer_reason, e.bouncer_verified_at, e.bouncer_raw_response,
+           COALESCE(e.email_verified, FALSE), COALESCE(e.is_safe, FALSE), COALESCE(e.is_disposable, FALSE),
+           COALESCE(e.is_role_based, FALSE), COALESCE(e.is_free_email, FALSE)
+    FROM jsonb_populate_recordset(
+        NULL::gmaps_linkedin_enrichments,
+        (SELECT jsonb_agg(r->'enrichment') FROM jsonb_array_elements(p_rows) r)
+    ) AS e;
+
+    GET DIAGNOSTICS inserted_count = ROW_COUNT;
+
+    UPDATE gmaps_businesses b
+    SET linkedin_url = COALESCE(u.linkedin_url, b.linkedin_url),
+        linkedin_enriched = COALESCE(u.linkedin_enriched, b.linkedin_enriched),
+        email = COALESCE(u.email, b.email),
+        email_source = CASE WHEN u.email IS NOT NULL THEN u.email_source ELSE b.email_source END
+    FROM jsonb_to_recordset(
+        (SELECT COALESCE(jsonb_agg(r->'business_update'), '[]'::jsonb)
+         FROM jsonb_array_elements(p_rows) r
+         WHERE jsonb_typeof(r->'business_update') = 'object')
+    ) AS u(
+        business_id UUID,
+        linkedin_url TEXT,
+        linkedin_enriched BOOLEAN,
+        email TEXT,
+        email_source VARCHAR(50)
+    )
+    WHERE b.id = u.business_id;
+
+    RETURN inserted_count;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION save_facebook_enrichment_atomic_batch(JSONB) IS 'Insert many Facebook enrichments and apply their gmaps_businesses updates in one transaction; returns enrichments inserted';
+COMMENT ON FUNCTION save_linkedin_enrichment_atomic_batch(JSONB) IS 'Insert many LinkedIn enrichments and apply their gmaps_businesses updates in one transaction; returns enrichments inserted';
@@ -17,12 +17,14 @@ Requirements:
     - uszipcode library (pip install uszipcode)
     - supabase library (pip install supabase)
     - SUPABASE_URL and SUPABASE_KEY environment variables
+    - Optional: SUPABASE_DB_URL (+ psycopg2) to load with COPY over a direct
+      Postgres connection instead of PostgREST
 """
 
 import os
 import sys
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -30,6 +32,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from dotenv import load_dotenv
 from supabase import create_client
 
+from lead_generation.modules.postgres_copy import get_copy_backend
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -89,12 +93,28 @@ def convert_to_record(zc: Any) -> Dict[str, Any]:
     }
 
 
-def batch_upsert(supabase, records: List[Dict], batch_size: int = 1000) -> int:
-    """Batch upsert records to zip_demographics table."""
+def batch_upsert(supabase, records: List[Dict], batch_size: int = 1000) -> Tuple[int, int]:
+    """Batch upsert records to zip_demographics table.
+
+    Uses COPY + INSERT ... ON CONFLICT over a direct Postgres connection when
+    SUPABASE_DB_URL is configured, otherwise PostgREST upserts of batch_size rows.
+    Returns (imported, errors).
+    """
     total = len(records)
     imported = 0
     errors = 0
 
+    try:
+        # Connecting happens here too, so a bad SUPABASE_DB_URL also falls back
+        backend = get_copy_backend()
+        if backend is not None:
+            logger.info(f"Starting COPY upsert of {total} records...")
+            counts = backend.copy_upsert('zip_demographics', records, ['zip_code'])
+            logger.info(f"COPY complete: {counts['inserted']:,} inserted, {counts['updated']:,} updated")
+            return counts['inserted'] + counts['updated'], 0
+    except Exception as e:
+        logger.error(f"COPY upsert failed, falling back to PostgREST: {e}")
+
     logger.info(f"Starting batch upsert of {total} records (batch size: {batch_size})...")
 
     for i in range(0, total, batch_size):
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Contact Extraction Benchmark
+Measures ContactExtractor throughput (MB/s) against the per-call regex approach
+
+Usage:
+    python scripts/maintenance/benchmark_contact_extraction.py [corpus_dir] [--repeat N]
+
+corpus_dir holds captured pages (.html/.txt, e.g. saved Facebook About pages
+and website HTML). Without it a synthetic corpus of business pages with plain,
+obfuscated and entity-encoded contacts is generated.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from lead_generation.modules.contact_extraction import ContactExtractor
+
+
+def load_corpus(corpus_dir: str):
+    """Load every .html/.htm/.txt page under corpus_dir"""
+    pages = []
+    for path in sorted(Path(corpus_dir).rglob('*')):
+        if path.suffix.lower() in ('.html', '.htm', '.txt') and path.is_file():
+            pages.append(path.read_text(encoding='utf-8', errors='ignore'))
+    return pages
+
+
+def synthetic_corpus(pages: int = 400, seed: int = 7):
+    """Generate business-like pages: markup, prose and a few contacts each"""
+    rng = random.Random(seed)
+    words = ('family owned dental practice serving the greater area since with friendly staff '
+             'call today schedule appointment our team offers free estimates licensed insured '
+             'hours monday friday saturday location parking reviews gallery services').split()
+    contacts = [
+        'info@{d}.com', 'office [at] {d} [dot] com', 'sales(at){d}(dot)net',
+        'owner&#64;{d}.com', '<a href="mailto:hello@{d}.com">Email us</a>',
+        '({a}) {b}-{c}', '{a}.{b}.{c}', '+1 {a} {b} {c}', 'logo@2x.png',
+    ]
+    corpus = []
+    for n in range(pages):
+        domain = f"business{n}"
+        parts = ['<html><head><style>.x{color:red}</style></head><body><div class="about">']
+        for _ in range(rng.randint(300, 900)):
+            parts.append(rng.choice(words))
+            if rng.random() < 0.004:
+                parts.append(rng.choice(contacts).format(
+                    d=domain, a=rng.randint(201, 989), b=rng.randint(201, 989), c=rng.randint(1000, 9999)))
+            if rng.random() < 0.05:
+                parts.append('</p><p class="text">')
+        parts.append('</div></body></html>')
+        corpus.append(' '.join(parts))
+    return corpus
+
+
+def legacy_extract(text: str):
+    """Per-call re.findall patterns, as the scrapers did before ContactExtractor (re caches the compiles)"""
+    emails = set(re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text))
+    for pattern in (r'\(\d{3}\)\s*\d{3}-\d{4}', r'\d{3}-\d{3}-\d{4}', r'\d{3}\.\d{3}\.\d{4}'):
+        re.findall(pattern, text)
+    return emails
+
+
+def measure(name: str, fn, corpus, repeat: int):
+    total_bytes = sum(len(page.encode('utf-8')) for page in corpus) * repeat
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in corpus:
+            fn(page)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<20} {total_bytes / elapsed / 1_000_000:8.2f} MB/s  ({elapsed:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark contact extraction throughput')
+    parser.add_argument('corpus_dir', nargs='?', help='Directory of captured pages')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir) if args.corpus_dir else synthetic_corpus()
+    if not corpus:
+        print(f"No pages found in {args.corpus_dir}")
+        return 1
+
+    size_mb = sum(len(page.encode('utf-8')) for page in corpus) / 1_000_000
+    print(f"Corpus: {len(corpus)} pages, {size_mb:.1f} MB, {args.repeat} passes")
+
+    extractor = ContactExtractor()
+    found = [extractor.extract(page) for page in corpus]
+    print(f"Found {sum(len(f['emails']) for f in found)} emails, "
+          f"{sum(len(f['phones']) for f in found)} phones")
+
+    measure('ContactExtractor', extractor.extract, corpus, args.repeat)
+    measure('per-call regexes', legacy_extract, corpus, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Prompt Cache Benchmark
+Compares the legacy and prefix-stable icebreaker prompt layouts on a 1k-contact run
+
+Usage:
+    python scripts/maintenance/benchmark_prompt_cache.py [--contacts 1000] [--prompt-file PATH]
+    python scripts/maintenance/benchmark_prompt_cache.py --live --api-key sk-... --contacts 200
+
+Offline mode simulates the provider prompt cache (exact prefix match, 1,024
+token minimum, 128-token increments) and reports tokens and cost per layout.
+--live sends real requests through ConcurrentOpenAIClient and reports the
+cached tokens OpenAI returned, cost and average latency.
+
+The legacy layout is the one scripts/maintenance/generate_icebreaker.py sends:
+system line, ICEBREAKER_PROMPT, the few-shot example, then the profile and
+website summaries. Both layouts get identical content: the same example, no
+organization context and only the legacy profile fields. With a simulated
+cache they cache the same share of prompt tokens and cost the same.
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from lead_generation.modules.icebreaker_prompt import (
+    PromptCacheStats,
+    build_icebreaker_messages,
+)
+from lead_generation.modules.openai_client import count_tokens
+
+CACHE_MIN_TOKENS = 1024
+CACHE_INCREMENT = 128
+COMPLETION_TOKENS = 120
+
+ORGANIZATION = {
+    'product_name': 'Example Lead Engine',
+    'product_description': 'Finds and verifies decision-maker emails for local businesses and writes '
+                           'personalized first lines for outreach.',
+    'value_proposition': 'Book more meetings without buying stale lists.',
+    'target_audience': 'Agencies and B2B service providers selling to local businesses',
+    'tone': 'casual, specific, no fluff',
+}
+
+# Few-shot example sent as the assistant turn by scripts/maintenance/generate_icebreaker.py
+EXAMPLE = '{"icebreaker":"Hey Aina,\\\\n\\\\nLove what you\'re doing at Maki. Also doing some outsourcing right now, wanted to run something by you.\\\\n\\\\nSo I hope you\'ll forgive me, but I creeped you/Maki quite a bit. I know that discretion is important to you guys (or at least I\'m assuming this given the part on your website about white-labelling your services) and I put something together a few months ago that I think could help. To make a long story short, it\'s an outreach system that uses AI to find people hiring website devs. Then pitches them with templates (actually makes them a white-labelled demo website). Costs just a few cents to run, very high converting, and I think it\'s in line with Maki\'s emphasis on scalability."}'
+
+GUIDANCE = [
+    "Open with something specific you noticed about their business, never a generic compliment.",
+    "Keep the icebreaker under 60 words and write like a person, not a marketer.",
+    "Reference the website or reviews only when the detail is concrete.",
+    "Do not mention AI, scraping, or that you researched them with software.",
+    "End with a soft transition to why you're reaching out.",
+    "Return JSON with keys icebreaker and subject_line.",
+]
+
+
+def synthetic_prompt(target_tokens: int = 1400) -> str:
+    lines = ["You write cold email icebreakers for local businesses.", ""]
+    n = 0
+    while count_tokens('\n'.join(lines)) < target_tokens:
+        lines.append(f"{n + 1}. {GUIDANCE[n % len(GUIDANCE)]} (rule {n + 1})")
+        n += 1
+    return '\n'.join(lines)
+
+
+def synthetic_contacts(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    first = ['Sarah', 'Mike', 'Jennifer', 'Luis', 'Priya', 'Tom', 'Aisha', 'Ken']
+    categories = ['Dentist', 'Plumber', 'HVAC contractor', 'Law firm', 'Med spa', 'Roofer']
+    cities = ['Miami, FL', 'Austin, TX', 'Denver, CO', 'Phoenix, AZ', 'Columbus, OH']
+    contacts = []
+    for n in range(count):
+        category = rng.choice(categories)
+        contacts.append({
+            'first_name': rng.choice(first),
+            'name': f"{rng.choice(['Bright', 'Summit', 'Oak', 'Blue'])} {category} {n}",
+            'category': category,
+            'city': rng.choice(cities),
+            'rating': round(rng.uniform(3.8, 5.0), 1),
+            'reviews_count': rng.randint(5, 900),
+            'website_summaries': [f"{category} serving {rng.choice(cities)} since {rng.randint(1980, 2020)}. "
+                                  f"Known for {rng.choice(['same-day service', 'family care', 'free estimates'])}."],
+        })
+    return contacts
+
+
+def legacy_profile(contact):
+    """The contact fields the legacy layout puts in its profile line"""
+    return {field: contact.get(field) for field in ('first_name', 'last_name', 'headline')}
+
+
+def legacy_messages(prompt, contact):
+    """Message layout of scripts/maintenance/generate_icebreaker.py"""
+    profile = f"{contact.get('first_name', '')} {contact.get('last_name', '')} {contact.get('headline', '')}"
+    website_content = "\\n".join(contact.get('website_summaries', []))
+    return [{'role': 'system', 'content': "You're a helpful, intelligent sales assistant."},
+            {'role': 'user', 'content': prompt},
+            {'role': 'assistant', 'content': EXAMPLE},
+            {'role': 'user', 'content': f"Profile: {profile}\n\nWebsite: {website_content}"}]
+
+
+def render(messages):
+    return ''.join(f"<{m['role']}>{m['content']}" for m in messages)
+
+
+def simulated_cached_tokens(previous: str, current: str) -> int:
+    if not previous:
+        return 0
+    common = 0
+    for a, b in zip(previous, current):
+        if a != b:
+            break
+        common += 1
+    prefix_tokens = count_tokens(current[:common])
+    if prefix_tokens < CACHE_MIN_TOKENS:
+        return 0
+    return CACHE_MIN_TOKENS + (prefix_tokens - CACHE_MIN_TOKENS) // CACHE_INCREMENT * CACHE_INCREMENT
+
+
+def run_offline(name, build, contacts, model):
+    stats = PromptCacheStats(model)
+    previous = ''
+    for contact in contacts:
+        text = render(build(contact))
+        prompt_tokens = count_tokens(text)
+        cached = simulated_cached_tokens(previous, text)
+        stats.record({'prompt_tokens': prompt_tokens, 'completion_tokens': COMPLETION_TOKENS,
+                      'prompt_tokens_details': {'cached_tokens': cached}})
+        previous = text
+    report(name, stats.get_stats())
+
+
+def run_live(name, build, contacts, model, api_key):
+    from lead_generation.modules.openai_client import ConcurrentOpenAIClient
+
+    client = ConcurrentOpenAIClient(api_key=api_key, max_workers=8)
+    stats = PromptCacheStats(model)
+
+    def call(contact):
+        started = time.time()
+        response = client.chat(model, build(contact), max_tokens=COMPLETION_TOKENS,
+                               response_format={'type': 'json_object'})
+        stats.record(response.usage, time.time() - started)
+
+    # Warm the cache with one request, then fan out
+    call(contacts[0])
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(call, contacts[1:]))
+    report(name, stats.get_stats())
+
+
+def report(name, stats):
+    print(f"{name:<16} prompt={stats['prompt_tokens']:>9,}  cached={stats['cached_tokens']:>9,} "
+          f"({stats['cache_hit_ratio']:.0%})  cost=${stats['cost_usd']:.4f}"
+          + (f"  avg latency={stats['avg_latency']:.2f}s" if stats['avg_latency'] else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark icebreaker prompt caching')
+    parser.add_argument('--contacts', type=int, default=1000)
+    parser.add_argument('--prompt-file', help='ICEBREAKER_PROMPT text to benchmark with')
+    parser.add_argument('--model', default='gpt-4o')
+    parser.add_argument('--live', action='store_true', help='Send real requests')
+    parser.add_argument('--api-key', help='OpenAI key for --live')
+    args = parser.parse_args()
+
+    prompt = Path(args.prompt_file).read_text() if args.prompt_file else synthetic_prompt()
+    contacts = synthetic_contacts(args.contacts)
+    layouts = {
+        'legacy': lambda c: legacy_messages(prompt, c),
+        # Same content as legacy: no organization context, only the profile fields legacy sends
+        'stable-prefix': lambda c: build_icebreaker_messages(prompt, legacy_profile(c), c['website_summaries'],
+                                                             example=EXAMPLE),
+    }
+
+    print(f"{len(contacts)} contacts, prompt {count_tokens(prompt)} tokens, model {args.model}, "
+          f"{'live' if args.live else 'simulated cache'}")
+    for name, build in layouts.items():
+        if args.live:
+            if not args.api_key:
+                parser.error('--live requires --api-key')
+            run_live(name, build, contacts, args.model, args.api_key)
+        else:
+            run_offline(name, build, contacts, args.model)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Adaptive Concurrency
+Tests AIMD adjustments and adaptive batch execution
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.adaptive_concurrency import (
+    AIMDController,
+    controller_for_account,
+    is_rate_limit_error,
+    run_adaptive_batches,
+)
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class TestAIMDController(unittest.TestCase):
+    """Test additive increase and multiplicative decrease"""
+
+    def test_additive_increase_after_healthy_window(self):
+        controller = AIMDController(batch_size=15, parallel_batches=3, window=2)
+        for _ in range(4):
+            controller.record(latency=10)
+
+        self.assertEqual(controller.limits(), {'batch_size': 20, 'parallel_batches': 4})
+
+    def test_rate_limit_halves_parallelism(self):
+        controller = AIMDController(batch_size=20, parallel_batches=6)
+        controller.record(latency=5, success=False, rate_limited=True)
+
+        self.assertEqual(controller.limits(), {'batch_size': 20, 'parallel_batches': 3})
+
+    def test_slow_runs_shrink_batches_to_floor(self):
+        controller = AIMDController(batch_size=15, parallel_batches=3, min_batch_size=5, target_latency=60)
+        for _ in range(3):
+            controller.record(latency=200)
+
+        self.assertEqual(controller.limits(), {'batch_size': 5, 'parallel_batches': 3})
+
+    def test_restore_clamps_state(self):
+        controller = AIMDController(max_batch_size=50, max_parallel=8)
+        controller.restore({'batch_size': 500, 'parallel_batches': 0})
+
+        self.assertEqual(controller.limits(), {'batch_size': 50, 'parallel_batches': 1})
+
+    def test_controllers_are_per_account(self):
+        self.assertIs(controller_for_account('key-a'), controller_for_account('key-a'))
+        self.assertIsNot(controller_for_account('key-a'), controller_for_account('key-b'))
+
+    def test_rate_limit_detection(self):
+        self.assertTrue(is_rate_limit_error(RateLimited()))
+        response_error = Exception('boom')
+        response_error.response = Mock(status_code=429)
+        self.assertTrue(is_rate_limit_error(response_error))
+        self.assertFalse(is_rate_limit_error(Exception('Network Error')))
+        self.assertFalse(is_rate_limit_error(Exception('Run 4293ab failed for linkedin.com/in/x-429')))
+        self.assertTrue(is_rate_limit_error(Exception('Too Many Requests')))
+
+    def test_wave_of_failures_decreases_once(self):
+        controller = AIMDController(batch_size=20, parallel_batches=8)
+        controller.record_wave([(5, False, True)] * 4)
+
+        self.assertEqual(controller.limits(), {'batch_size': 20, 'parallel_batches': 4})
+        self.assertEqual(controller.stats['decreases'], 1)
+        self.assertEqual(controller.stats['rate_limited'], 4)
+
+
+class TestAdaptiveBatches(unittest.TestCase):
+    """Test batch execution driven by the controller"""
+
+    def test_all_items_processed_with_growing_batches(self):
+        controller = AIMDController(batch_size=5, parallel_batches=1, window=1, min_batch_size=1)
+        sizes = []
+
+        def run_batch(batch):
+            sizes.append(len(batch))
+            return [item * 2 for item in batch]
+
+        results = run_adaptive_batches(list(range(60)), run_batch, controller)
+
+        self.assertEqual(sorted(results), [i * 2 for i in range(60)])
+        self.assertGreater(max(sizes), 5)
+
+    def test_failed_batches_are_retried_smaller(self):
+        controller = AIMDController(batch_size=10, parallel_batches=2, min_batch_size=2)
+        lock = threading.Lock()
+        calls = {'n': 0}
+
+        def run_batch(batch):
+            with lock:
+                calls['n'] += 1
+                first = calls['n'] == 1
+            if first:
+                raise RateLimited('429 Too Many Requests')
+            return batch
+
+        sleeps = []
+        results = run_adaptive_batches(list(range(20)), run_batch, controller, sleep=sleeps.append)
+
+        self.assertEqual(sorted(results), list(range(20)))
+        self.assertEqual(controller.stats['rate_limited'], 1)
+        self.assertEqual(len(sleeps), 1)
+        self.assertLessEqual(sleeps[0], 5.0)
+
+    def test_items_dropped_after_max_retries(self):
+        controller = AIMDController(batch_size=5, parallel_batches=1, min_batch_size=1)
+
+        run_batch = Mock(side_effect=Exception('actor crashed'))
+
+        results = run_adaptive_batches([1, 2, 3], run_batch, controller, max_retries=1, sleep=lambda s: None)
+
+        self.assertEqual(results, [])
+        # Every item is attempted exactly twice, retries re-cut at the reduced batch size
+        attempted = [item for call in run_batch.call_args_list for item in call.args[0]]
+        self.assertEqual(sorted(attempted), [1, 1, 2, 2, 3, 3])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Async Web Crawler
+Tests page parsing helpers and crawling against a local HTTP server
+"""
+
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.async_web_crawler import (
+    AIOHTTP_AVAILABLE,
+    AsyncWebCrawler,
+    find_contact_links,
+    html_to_text,
+    normalize_site_url,
+)
+
+
+PAGES = {
+    '/': ('text/html; charset=utf-8',
+          '<html><head><script>var x = "a@b.com";</script></head><body><h1>Joe&#39;s Dentistry</h1>'
+          '<a href="/contact-us">Contact</a> <a href="/about">About</a> <a href="/brochure-about.pdf">PDF</a>'
+          '<a href="/private/about">Staff</a> <a href="https://other.com/contact">Elsewhere</a></body></html>'),
+    '/contact-us': ('text/html', '<p>Email office@joesdentistry.com or call (555) 234-5678</p>'),
+    '/about': ('text/html', '<p>Family practice since 1998.</p>'),
+    '/private/about': ('text/html', '<p>secret@joesdentistry.com</p>'),
+    '/file': ('application/pdf', '%PDF-1.4 ' + 'x' * 1000),
+    '/big': ('text/html', '<p>' + 'filler ' * 20000 + '</p>'),
+    '/robots.txt': ('text/plain', 'User-agent: *\nDisallow: /private/\n'),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        _Handler.requests.append((self.path, time.monotonic()))
+        content_type, body = PAGES.get(self.path, ('text/html', None))
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPageHelpers(unittest.TestCase):
+    """Test URL normalization, text extraction and link selection"""
+
+    def test_normalize_site_url(self):
+        self.assertEqual(normalize_site_url('joesdentistry.com'), 'https://joesdentistry.com')
+        self.assertEqual(normalize_site_url('http://joesdentistry.com/'), 'http://joesdentistry.com/')
+        self.assertIsNone(normalize_site_url('  '))
+
+    def test_html_to_text_drops_scripts_and_tags(self):
+        text = html_to_text(PAGES['/'][1])
+        self.assertIn("Joe's Dentistry", text)
+        self.assertNotIn('a@b.com', text)
+        self.assertNotIn('<', text)
+
+    def test_find_contact_links(self):
+        links = find_contact_links(PAGES['/'][1], 'https://www.joesdentistry.com/', limit=5)
+        self.assertEqual(links, ['https://www.joesdentistry.com/contact-us', 'https://www.joesdentistry.com/about',
+                                 'https://www.joesdentistry.com/private/about'])
+        self.assertEqual(len(find_contact_links(PAGES['/'][1], 'https://joesdentistry.com/', limit=1)), 1)
+        self.assertEqual(find_contact_links(PAGES['/'][1], 'https://joesdentistry.com/', limit=0), [])
+
+
+@unittest.skipUnless(AIOHTTP_AVAILABLE, 'aiohttp not installed')
+class TestAsyncWebCrawler(unittest.TestCase):
+    """Test crawling against a local server"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _Handler.requests = []
+
+    def test_site_crawl_collects_contact_pages(self):
+        crawler = AsyncWebCrawler(per_host_delay=0, max_pages_per_site=4)
+        result = crawler.scrape_websites([self.base])[self.base]
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['emails'], ['office@joesdentistry.com'])
+        self.assertEqual(result['phones'], ['(555) 234-5678'])
+        self.assertIn('Family practice', result['content'])
+        self.assertEqual(crawler.get_stats()['robots_blocked'], 1)
+        requested = [path for path, _ in _Handler.requests]
+        self.assertNotIn('/private/about', requested)
+        self.assertNotIn('/brochure-about.pdf', requested)
+        self.assertEqual(requested.count('/robots.txt'), 1)
+
+    def test_non_html_aborted(self):
+        crawler = AsyncWebCrawler(per_host_delay=0, respect_robots=False)
+        result = crawler.scrape_websites([f"{self.base}/file"])[f"{self.base}/file"]
+
+        self.assertFalse(result['success'])
+        self.assertIn('non-HTML', result['error'])
+        self.assertEqual(crawler.get_stats()['bytes_read'], 0)
+
+    def test_page_size_cap(self):
+        crawler = AsyncWebCrawler(per_host_delay=0, respect_robots=False, max_page_bytes=10000)
+        crawler.scrape_websites([f"{self.base}/big"])
+
+        self.assertEqual(crawler.get_stats()['truncated'], 1)
+        self.assertEqual(crawler.get_stats()['bytes_read'], 10000)
+
+    def test_per_host_delay(self):
+        crawler = AsyncWebCrawler(per_host_delay=0.1, respect_robots=False, max_pages_per_site=1)
+        crawler.scrape_websites([f"{self.base}/about", f"{self.base}/contact-us", f"{self.base}/big"])
+
+        starts = sorted(t for _, t in _Handler.requests)
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        self.assertEqual(len(starts), 3)
+        self.assertTrue(all(gap >= 0.08 for gap in gaps), gaps)
+
+    def test_unreachable_site(self):
+        crawler = AsyncWebCrawler(timeout=2, respect_robots=False)
+        result = crawler.scrape_websites(['http://127.0.0.1:1'])['http://127.0.0.1:1']
+
+        self.assertFalse(result['success'])
+        self.assertTrue(result['error'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Bulk Upsert
+Tests chunking, retries and exact inserted/updated counts
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.bulk_upsert import BulkUpserter, chunk_records, dedupe_records
+
+
+STORE_LOCK = threading.Lock()
+
+
+def record(n, raw_size=10):
+    return {'place_id': f"p{n}", 'name': f"Business {n}", 'raw_data': {'blob': 'x' * raw_size}}
+
+
+class FakeTable:
+    """In-memory gmaps_businesses supporting the select/in_/upsert chains used"""
+
+    def __init__(self, store, failures):
+        self.store = store
+        self.failures = failures
+        self.op = None
+
+    def select(self, columns):
+        self.op = ('select', columns)
+        return self
+
+    def in_(self, column, values):
+        self.op = ('in', column, values)
+        return self
+
+    def upsert(self, rows, on_conflict):
+        self.op = ('upsert', rows, on_conflict)
+        return self
+
+    def execute(self):
+        if self.op[0] == 'in':
+            return Mock(data=[{'place_id': v} for v in self.op[2] if v in self.store])
+        rows = self.op[1]
+        with STORE_LOCK:
+            if self.failures.get(rows[0]['place_id'], 0) > 0:
+                self.failures[rows[0]['place_id']] -= 1
+                raise TimeoutError('statement timeout')
+            for row in rows:
+                self.store[row['place_id']] = row
+        return Mock(data=rows)
+
+
+class FakeClient:
+    def __init__(self, existing=(), failures=None):
+        self.store = {key: {'place_id': key} for key in existing}
+        self.failures = failures or {}
+
+    def table(self, name):
+        return FakeTable(self.store, self.failures)
+
+
+class TestChunking(unittest.TestCase):
+    """Test chunk boundaries"""
+
+    def test_row_and_byte_limits(self):
+        self.assertEqual([len(c) for c in chunk_records([record(n) for n in range(5)], 2, 10 ** 6)], [2, 2, 1])
+        heavy = [record(n, raw_size=600) for n in range(4)]
+        self.assertEqual([len(c) for c in chunk_records(heavy, 100, 1500)], [2, 2])
+
+    def test_dedupe(self):
+        records = [record(1), dict(record(1), name='newer'), {'name': 'no place id'}]
+        self.assertEqual(dedupe_records(records, 'place_id'), [dict(record(1), name='newer')])
+
+
+class TestBulkUpserter(unittest.TestCase):
+    """Test parallel upserts"""
+
+    def test_exact_counts(self):
+        client = FakeClient(existing=['p0', 'p1', 'p2'])
+        totals = BulkUpserter(client, max_rows=4).upsert([record(n) for n in range(10)] + [{'name': 'x'}])
+
+        self.assertEqual((totals['inserted'], totals['updated'], totals['failed']), (7, 3, 0))
+        self.assertEqual((totals['saved'], totals['skipped'], totals['chunks']), (10, 1, 3))
+        self.assertEqual(len(client.store), 10)
+
+    def test_retry_is_idempotent(self):
+        client = FakeClient(failures={'p0': 2})
+        sleep = Mock()
+        totals = BulkUpserter(client, max_rows=5, sleep=sleep).upsert([record(n) for n in range(10)])
+
+        self.assertEqual((totals['inserted'], totals['updated'], totals['retries']), (10, 0, 2))
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_chunk_gives_up_after_retries(self):
+        client = FakeClient(failures={'p0': 10})
+        totals = BulkUpserter(client, max_rows=5, max_retries=1, sleep=Mock()).upsert(
+            [record(n) for n in range(10)])
+
+        self.assertEqual((totals['inserted'], totals['failed']), (5, 5))
+
+    def test_copy_backend_used_when_configured(self):
+        client = FakeClient()
+        backend = Mock()
+        backend.copy_upsert.return_value = {'inserted': 2, 'updated': 1}
+        totals = BulkUpserter(client, backend=backend).upsert([record(n) for n in range(3)])
+
+        self.assertEqual((totals['saved'], totals['via']), (3, 'copy'))
+        self.assertEqual(backend.copy_upsert.call_args.args[2], ['place_id'])
+        self.assertEqual(client.store, {})
+
+    def test_copy_failure_falls_back_to_postgrest(self):
+        client = FakeClient()
+        backend = Mock()
+        backend.copy_upsert.side_effect = ConnectionError('no route to host')
+        totals = BulkUpserter(client, backend=backend).upsert([record(n) for n in range(3)])
+
+        self.assertEqual((totals['inserted'], totals['via']), (3, 'postgrest'))
+
+    def test_empty(self):
+        totals = BulkUpserter(FakeClient()).upsert([])
+        self.assertEqual((totals['saved'], totals['chunks']), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Contact Extraction
+Tests plain, obfuscated and entity-encoded emails plus phone formats
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.contact_extraction import ContactExtractor, extract_contacts
+
+
+class TestEmailExtraction(unittest.TestCase):
+    """Test email detection and normalization"""
+
+    def setUp(self):
+        self.extractor = ContactExtractor()
+
+    def test_plain_and_mailto(self):
+        text = 'Write to Info@JoesDentistry.com. <a href="mailto:billing@joesdentistry.com">Billing</a>'
+        self.assertEqual(self.extractor.extract_emails(text),
+                         ['info@joesdentistry.com', 'billing@joesdentistry.com'])
+
+    def test_obfuscated_forms(self):
+        text = ('joe [at] joesdentistry [dot] com, office(at)smile(dot)co(dot)uk, '
+                'hello {at} acme.com, Mary AT acme DOT net')
+        self.assertEqual(self.extractor.extract_emails(text),
+                         ['joe@joesdentistry.com', 'office@smile.co.uk', 'hello@acme.com', 'mary@acme.net'])
+
+    def test_bare_at_in_prose_ignored(self):
+        self.assertEqual(self.extractor.extract_emails('Find us at joesdentistry.com or visit us at noon'), [])
+
+    def test_spelled_form_in_prose_ignored(self):
+        self.assertEqual(self.extractor.extract_emails('Meet us at acme dot com'), [])
+        self.assertEqual(self.extractor.extract_emails('Come at noon dot com'), [])
+
+    def test_spelled_form_with_evidence(self):
+        self.assertEqual(self.extractor.extract_emails('jane.doe at acme dot com'), ['jane.doe@acme.com'])
+        self.assertEqual(self.extractor.extract_emails('jane at acme [dot] com'), ['jane@acme.com'])
+        self.assertEqual(self.extractor.extract_emails('jane at acme DOT com'), ['jane@acme.com'])
+
+    def test_html_entities_decoded(self):
+        self.assertEqual(self.extractor.extract_emails('contact&#64;acme.com or sales&commat;acme.com'),
+                         ['contact@acme.com', 'sales@acme.com'])
+
+    def test_assets_and_placeholders_filtered(self):
+        text = '<img src="logo@2x.png"> you@example.com sentry@sentry.wixpress.com real@acme.com'
+        self.assertEqual(self.extractor.extract_emails(text), ['real@acme.com'])
+
+    def test_deduplicated_in_page_order(self):
+        text = 'b@acme.com then a [at] acme [dot] com then B@ACME.COM'
+        self.assertEqual(self.extractor.extract_emails(text), ['b@acme.com', 'a@acme.com'])
+
+    def test_obfuscation_can_be_disabled(self):
+        extractor = ContactExtractor(include_obfuscated=False)
+        self.assertEqual(extractor.extract_emails('joe [at] acme [dot] com'), [])
+
+
+class TestPhoneExtraction(unittest.TestCase):
+    """Test US phone detection"""
+
+    def test_common_formats_normalized(self):
+        text = 'Call (555) 234-5678, 555.345.6789, +1 555 456 7890, 1-800-555-2345 or tel:+15552345678'
+        self.assertEqual(extract_contacts(text)['phones'],
+                         ['(555) 234-5678', '(555) 345-6789', '(555) 456-7890', '(800) 555-2345'])
+
+    def test_non_phone_numbers_ignored(self):
+        text = 'Since 2004-2024, zip 90210, order #98765432101, id=a555-234-5678, 555-123-4567'
+        self.assertEqual(extract_contacts(text)['phones'], [])
+
+    def test_empty_input(self):
+        self.assertEqual(extract_contacts(None), {'emails': [], 'phones': []})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Domain Grouping
+Tests domain normalization, chain clustering and result fan-out
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.domain_grouping import (
+    enrich_by_domain,
+    group_by_domain,
+    normalize_domain,
+)
+
+
+class TestDomainNormalization(unittest.TestCase):
+    """Test registrable-domain extraction"""
+
+    def test_subdomains_and_paths_collapse(self):
+        self.assertEqual(normalize_domain('https://www.acme-dental.com/locations/austin'), 'acme-dental.com')
+        self.assertEqual(normalize_domain('http://austin.acme-dental.com'), 'acme-dental.com')
+        self.assertEqual(normalize_domain('ACME-DENTAL.COM:443/?utm_source=gmb'), 'acme-dental.com')
+
+    def test_multi_label_public_suffix(self):
+        self.assertEqual(normalize_domain('https://leeds.smile-dental.co.uk/'), 'smile-dental.co.uk')
+
+    def test_hosting_platform_keeps_customer_subdomain(self):
+        self.assertEqual(normalize_domain('https://joes.wixsite.com/dentist'), 'joes.wixsite.com')
+
+    def test_shared_platforms_and_invalid_urls(self):
+        for website in ['https://www.facebook.com/joesdentist', 'https://linktr.ee/joes',
+                        '', None, 'not a url']:
+            self.assertIsNone(normalize_domain(website), website)
+
+
+class TestGroupingAndFanOut(unittest.TestCase):
+    """Test clustering by domain and fan-out of representative results"""
+
+    def setUp(self):
+        self.businesses = [
+            {'id': 'b1', 'name': 'Acme Dental North', 'website': 'https://acme-dental.com/north', 'reviews_count': 10},
+            {'id': 'b2', 'name': 'Acme Dental South', 'website': 'https://www.acme-dental.com/south', 'reviews_count': 90},
+            {'id': 'b3', 'name': 'Acme Dental East', 'website': 'acme-dental.com', 'reviews_count': 40},
+            {'id': 'b4', 'name': 'Solo Spa', 'website': 'https://solospa.com'},
+            {'id': 'b5', 'name': 'Facebook Only', 'website': 'https://facebook.com/fbonly'},
+        ]
+
+    def test_group_by_domain(self):
+        groups, singles = group_by_domain(self.businesses)
+
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0]['domain'], 'acme-dental.com')
+        self.assertEqual(groups[0]['representative']['id'], 'b2')
+        self.assertEqual(sorted(b['id'] for b in singles), ['b4', 'b5'])
+
+    def test_enrich_once_per_domain(self):
+        enriched_ids = []
+
+        def enrich(batch):
+            enriched_ids.extend(b['id'] for b in batch)
+            return [{'business_id': b['id'], 'primary_email': f"owner@{b['id']}.com"} for b in batch]
+
+        results, stats = enrich_by_domain(self.businesses, enrich)
+
+        self.assertEqual(sorted(enriched_ids), ['b2', 'b4', 'b5'])
+        self.assertEqual(len(results), 5)
+        by_id = {r['business_id']: r for r in results}
+        self.assertEqual(by_id['b1']['primary_email'], 'owner@b2.com')
+        self.assertEqual(by_id['b1']['shared_from_business_id'], 'b2')
+        self.assertNotIn('shared_from_business_id', by_id['b2'])
+        self.assertEqual(stats['locations_shared'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Email Format Index
+Tests per-domain format learning, category back-off and pattern re-ranking
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.email_format_index import EmailFormatIndex
+from lead_generation.modules.email_verification_planner import EmailVerificationPlanner
+
+
+class TestFormatLearning(unittest.TestCase):
+    """Test template learning per domain and category"""
+
+    def setUp(self):
+        self.index = EmailFormatIndex()
+
+    def test_domain_format_wins_after_one_confirmation(self):
+        self.index.observe('jdoe@acme.com', 'John Doe', 'Dentist')
+
+        self.assertEqual(self.index.known_format('https://www.acme.com'), 'flast')
+        self.assertEqual(self.index.most_likely_email('Jane Smith', 'acme.com'), 'jsmith@acme.com')
+
+    def test_role_addresses_are_ignored(self):
+        self.assertIsNone(self.index.observe('info@acme.com', 'John Doe'))
+        self.assertEqual(self.index.get_stats()['observations'], 0)
+
+    def test_category_back_off_for_unseen_domain(self):
+        for i, name in enumerate(['Ann Lee', 'Bob Ray', 'Cal Fox', 'Dee Kim', 'Eve Poe',
+                                  'Fay Orr', 'Gus Ng', 'Hal Wu', 'Ida Li', 'Jo Yu',
+                                  'Kai Do', 'Lu Xi']):
+            first, last = name.lower().split()
+            self.index.observe(f"{first}.{last}@clinic{i}.com", name, 'Dentist')
+
+        dentist = self.index.template_probabilities('newclinic.com', 'dentist')
+        self.assertEqual(max(dentist, key=dentist.get), 'first.last')
+
+    def test_rejections_demote_template(self):
+        before = self.index.template_probabilities('acme.com')['first']
+        self.index.observe('john@acme.com', 'John Doe', is_safe=False)
+        after = self.index.template_probabilities('acme.com')['first']
+        self.assertLess(after, before)
+
+    def test_rank_patterns_puts_most_likely_first(self):
+        self.index.observe('doej@acme.com', 'Jim Doe')
+        patterns = ['john@acme.com', 'john.doe@acme.com', 'doej@acme.com', 'info@acme.com']
+
+        ranked = self.index.rank_patterns(patterns, 'John Doe', 'acme.com')
+
+        self.assertEqual(ranked[0], 'doej@acme.com')
+        self.assertEqual(ranked[-1], 'info@acme.com')
+
+
+class TestIncrementalUpdates(unittest.TestCase):
+    """Test learning from planner verification results and Supabase seeding"""
+
+    def test_planner_results_update_index(self):
+        index = EmailFormatIndex()
+
+        class Verifier:
+            def verify_batch(self, emails):
+                return [{'email': e, 'status': 'deliverable' if e == 'john.doe@acme.com' else 'undeliverable',
+                         'is_safe': e == 'john.doe@acme.com'} for e in emails]
+
+        planner = EmailVerificationPlanner(Verifier(), likelihood=index.template_probabilities,
+                                           on_verified=index.record_verification)
+        planner.verify([{'key': 1, 'full_name': 'John Doe', 'domain': 'acme.com'}])
+
+        self.assertEqual(index.known_format('acme.com'), 'first.last')
+        self.assertEqual(index.most_likely_email('Mary Major', 'acme.com'), 'mary.major@acme.com')
+
+    def test_load_from_supabase(self):
+        client = MagicMock()
+        enrichments = MagicMock()
+        enrichments.data = [
+            {'business_id': 'b1', 'person_name': 'John Doe', 'primary_email': 'jdoe@acme.com'},
+            {'business_id': 'b2', 'person_name': 'Jane Roe', 'primary_email': 'info@beta.com'},
+        ]
+        businesses = MagicMock()
+        businesses.data = [{'id': 'b1', 'category': 'Dentist'}, {'id': 'b2', 'category': 'Spa'}]
+        client.table.return_value.select.return_value.eq.return_value.range.return_value.execute.return_value = enrichments
+        client.table.return_value.select.return_value.in_.return_value.execute.return_value = businesses
+
+        index = EmailFormatIndex()
+        learned = index.load_from_supabase(client)
+
+        self.assertEqual(learned, 1)
+        self.assertEqual(index.known_format('acme.com'), 'flast')
+
+    def test_load_from_supabase_chunks_business_ids(self):
+        client = MagicMock()
+        enrichments = MagicMock()
+        enrichments.data = [{'business_id': f'b{i}', 'person_name': 'John Doe',
+                             'primary_email': f'jdoe@acme{i}.com'} for i in range(250)]
+        client.table.return_value.select.return_value.eq.return_value.range.return_value.execute.return_value = enrichments
+        client.table.return_value.select.return_value.in_.return_value.execute.return_value = MagicMock(data=[])
+
+        EmailFormatIndex().load_from_supabase(client)
+
+        chunks = [c.args[1] for c in client.table.return_value.select.return_value.in_.call_args_list]
+        self.assertEqual([len(c) for c in chunks], [100, 100, 50])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
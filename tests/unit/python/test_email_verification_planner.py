@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Email Verification Planner
+Tests candidate ranking, round-based batching and early exit on deliverable hits
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.email_verification_planner import (
+    EmailVerificationPlanner,
+    build_candidates,
+    detect_template,
+    normalize_name_parts,
+)
+
+
+class FakeVerifier:
+    """Bouncer stand-in that marks a fixed set of emails as deliverable"""
+
+    def __init__(self, safe_emails=(), catch_all_domains=()):
+        self.safe_emails = set(safe_emails)
+        self.catch_all_domains = set(catch_all_domains)
+        self.calls = []
+
+    def verify_batch(self, emails):
+        self.calls.append(list(emails))
+        results = []
+        for email in emails:
+            if email.split('@')[1] in self.catch_all_domains:
+                results.append({'email': email, 'status': 'accept_all', 'is_safe': False})
+            elif email in self.safe_emails:
+                results.append({'email': email, 'status': 'deliverable', 'is_safe': True})
+            else:
+                results.append({'email': email, 'status': 'undeliverable', 'is_safe': False})
+        return results
+
+
+class TestCandidateRanking(unittest.TestCase):
+    """Test name normalization and candidate ordering"""
+
+    def test_name_noise_removed(self):
+        self.assertEqual(normalize_name_parts('Dr. José Álvarez, DDS'), ('jose', 'alvarez'))
+        self.assertEqual(normalize_name_parts("Mary O'Brien"), ('mary', 'obrien'))
+
+    def test_candidates_follow_priors(self):
+        candidates = build_candidates('John Doe', 'https://www.acme.com/about',
+                                      {'flast': 0.7, 'first': 0.2, 'first.last': 0.1})
+        self.assertEqual([c[0] for c in candidates],
+                         ['jdoe@acme.com', 'john@acme.com', 'john.doe@acme.com'])
+        self.assertAlmostEqual(sum(c[2] for c in candidates), 1.0)
+
+    def test_single_name_only_first_template(self):
+        candidates = build_candidates('Cher', 'acme.com')
+        self.assertEqual([c[0] for c in candidates], ['cher@acme.com'])
+
+    def test_detect_template(self):
+        self.assertEqual(detect_template('jdoe', 'John Doe'), 'flast')
+        self.assertEqual(detect_template('john.doe', 'John Doe'), 'first.last')
+        self.assertIsNone(detect_template('info', 'John Doe'))
+
+
+class TestSequentialVerification(unittest.TestCase):
+    """Test round-based verification with early exit"""
+
+    def test_stops_at_first_safe_hit(self):
+        verifier = FakeVerifier(safe_emails={'john@acme.com', 'jsmith@beta.com'})
+        planner = EmailVerificationPlanner(verifier)
+        people = [
+            {'key': 'a', 'full_name': 'John Doe', 'domain': 'acme.com'},
+            {'key': 'b', 'full_name': 'Jane Smith', 'domain': 'beta.com'},
+        ]
+
+        outcomes = planner.verify(people)
+
+        self.assertEqual(outcomes['a']['status'], 'found')
+        self.assertEqual(outcomes['a']['email'], 'john@acme.com')
+        self.assertEqual(outcomes['a']['attempts'], 1)
+        self.assertEqual(outcomes['b']['email'], 'jsmith@beta.com')
+        # One batch call per round, and resolved people drop out of later rounds
+        self.assertEqual(len(verifier.calls[0]), 2)
+        self.assertTrue(all('acme.com' not in e for call in verifier.calls[1:] for e in call))
+        stats = planner.get_stats()
+        self.assertLess(stats['credits_used'], stats['credits_blind'])
+        self.assertEqual(stats['rounds'], len(verifier.calls))
+
+    def test_catch_all_domain_stops_after_one_credit(self):
+        verifier = FakeVerifier(catch_all_domains={'acme.com'})
+        planner = EmailVerificationPlanner(verifier)
+
+        outcomes = planner.verify([{'key': 'a', 'full_name': 'John Doe', 'domain': 'acme.com'}])
+
+        self.assertEqual(outcomes['a']['status'], 'catch_all')
+        self.assertEqual(planner.get_stats()['credits_used'], 1)
+
+    def test_pending_people_on_catch_all_domain_marked_catch_all(self):
+        verifier = FakeVerifier()
+        # Bouncer flags the domain as accept-all on one address only
+        verifier.verify_batch = lambda emails: [
+            {'email': e, 'status': 'accept_all' if e == 'john@acme.com' else 'undeliverable', 'is_safe': False}
+            for e in emails]
+        planner = EmailVerificationPlanner(verifier)
+
+        outcomes = planner.verify([{'key': 'a', 'full_name': 'John Doe', 'domain': 'acme.com'},
+                                   {'key': 'b', 'full_name': 'Jane Smith', 'domain': 'acme.com'}])
+
+        self.assertEqual(outcomes['b']['status'], 'catch_all')
+        self.assertEqual(outcomes['b']['email'], 'jane@acme.com')
+        self.assertEqual(outcomes['b']['attempts'], 1)
+
+    def test_no_candidates_without_domain(self):
+        verifier = FakeVerifier()
+        planner = EmailVerificationPlanner(verifier)
+
+        outcomes = planner.verify([{'key': 'a', 'full_name': 'John Doe', 'domain': ''}])
+
+        self.assertEqual(outcomes['a']['status'], 'no_candidates')
+        self.assertEqual(verifier.calls, [])
+
+    def test_on_verified_callback_receives_every_result(self):
+        seen = []
+        verifier = FakeVerifier(safe_emails={'jdoe@acme.com'})
+        planner = EmailVerificationPlanner(
+            verifier, on_verified=lambda person, email, template, result: seen.append((email, template)))
+
+        planner.verify([{'key': 'a', 'full_name': 'John Doe', 'domain': 'acme.com'}])
+
+        self.assertEqual(seen[-1], ('jdoe@acme.com', 'flast'))
+        self.assertEqual(len(seen), planner.get_stats()['credits_used'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Enrichment Policy Engine
+Tests rule evaluation, budget admission and savings reporting
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.enrichment_policy import EnrichmentPolicy, is_role_email
+
+
+class TestRules(unittest.TestCase):
+    """Test default and custom rules"""
+
+    def setUp(self):
+        self.businesses = [
+            {'id': 'personal', 'email': 'joe@joesdental.com', 'email_source': 'google_maps'},
+            {'id': 'role', 'email': 'info@smile.com', 'email_source': 'facebook'},
+            {'id': 'none', 'email': None, 'email_source': 'not_found'},
+        ]
+
+    def test_role_email_detection(self):
+        self.assertTrue(is_role_email('Info@acme.com'))
+        self.assertTrue(is_role_email('frontdesk@acme.com'))
+        self.assertFalse(is_role_email('joe@acme.com'))
+        self.assertFalse(is_role_email(None))
+
+    def test_skip_linkedin_when_personal_email_exists(self):
+        policy = EnrichmentPolicy()
+
+        selected = policy.filter_for_stage(self.businesses, 'linkedin_search')
+
+        self.assertEqual([b['id'] for b in selected], ['role', 'none'])
+        report = policy.get_report()
+        self.assertEqual(report['calls_skipped']['linkedin_search'], 1)
+        self.assertEqual(report['skips_by_rule'], {'personal_email_on_file': 1})
+        self.assertAlmostEqual(report['dollars_saved'], 0.0035)
+
+    def test_personal_email_still_verified(self):
+        policy = EnrichmentPolicy()
+
+        selected = policy.filter_for_stage(self.businesses, 'bouncer')
+
+        self.assertEqual(len(selected), 3)
+        self.assertEqual(policy.get_report()['calls_skipped']['bouncer'], 0)
+
+    def test_decide_lists_stages(self):
+        decision = EnrichmentPolicy().decide(self.businesses[1])
+
+        self.assertIn('linkedin_search', decision['run'])
+        self.assertEqual(decision['skipped']['facebook_discovery'], 'role_email_on_file')
+
+    def test_custom_rules(self):
+        policy = EnrichmentPolicy(rules=[
+            {'name': 'tiny_business', 'when': {'max_reviews': 2}, 'skip': ['linkedin_search']},
+            {'name': 'restaurants', 'when': {'category_in': ['restaurant']}, 'skip': ['linkedin_search']},
+        ])
+        businesses = [
+            {'id': 1, 'reviews_count': 1, 'category': 'Dentist'},
+            {'id': 2, 'reviews_count': 50, 'category': 'Mexican Restaurant'},
+            {'id': 3, 'reviews_count': 50, 'category': 'Dentist'},
+        ]
+
+        selected = policy.filter_for_stage(businesses, 'linkedin_search')
+
+        self.assertEqual([b['id'] for b in selected], [3])
+        self.assertEqual(policy.get_report()['skips_by_rule'], {'tiny_business': 1, 'restaurants': 1})
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            EnrichmentPolicy(rules=[{'name': 'bad', 'when': {}, 'skip': ['carrier_pigeon']}])
+        with self.assertRaises(ValueError):
+            EnrichmentPolicy(rules=[{'name': 'bad', 'when': {'zodiac': 'leo'}, 'skip': ['bouncer']}]) \
+                .filter_for_stage([{'id': 1}], 'bouncer')
+
+
+class TestBudget(unittest.TestCase):
+    """Test budget-limited admission"""
+
+    def test_budget_spent_on_highest_priority_first(self):
+        policy = EnrichmentPolicy(rules=[], budget_usd=0.02)
+        businesses = [{'id': i, 'reviews_count': reviews} for i, reviews in enumerate([5, 500, 50])]
+
+        selected = policy.filter_for_stage(businesses, 'linkedin_scrape')
+
+        self.assertEqual([b['id'] for b in selected], [1, 2])
+        report = policy.get_report()
+        self.assertEqual(report['skips_by_rule'], {'budget_exhausted': 1})
+        self.assertEqual(report['calls_over_budget']['linkedin_scrape'], 1)
+        self.assertEqual(report['dollars_saved'], 0)
+        self.assertAlmostEqual(report['dollars_spent'], 0.02)
+        self.assertEqual(policy.remaining_budget(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Enrichment Write Buffer
+Tests size/time/close flushes, batch RPC payloads and failure handling
+"""
+
+import time
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.enrichment_write_buffer import EnrichmentWriteBuffer, linkedin_enrichment_row
+
+
+FACEBOOK = {'facebook_url': 'https://facebook.com/brightsmiles', 'page_name': 'Bright Smiles',
+            'emails': ['hello@brightsmiles.com'], 'primary_email': 'hello@brightsmiles.com', 'success': True}
+LINKEDIN = {'linkedin_url': 'https://linkedin.com/in/sarah', 'person_name': 'Sarah Lee',
+            'primary_email': 'sarah@brightsmiles.com'}
+
+
+def make_client(fail_times=0):
+    client = Mock()
+    state = {'failures': fail_times}
+
+    def execute():
+        if state['failures']:
+            state['failures'] -= 1
+            raise ConnectionError('reset by peer')
+        return Mock(data=len(client.rpc.call_args.args[1]['p_rows']))
+
+    client.rpc.return_value.execute.side_effect = execute
+    return client
+
+
+class TestEnrichmentWriteBuffer(unittest.TestCase):
+    """Test buffering and flushing"""
+
+    def test_writes_are_deferred_and_batched(self):
+        client = make_client()
+        buffer = EnrichmentWriteBuffer(client, max_rows=10, register_atexit=False)
+        for n in range(3):
+            self.assertTrue(buffer.save_facebook_enrichment(f"b{n}", 'c1', FACEBOOK))
+        client.rpc.assert_not_called()
+
+        self.assertEqual(buffer.flush(), 3)
+        name, params = client.rpc.call_args.args
+        self.assertEqual(name, 'save_facebook_enrichment_atomic_batch')
+        row = params['p_rows'][0]
+        self.assertEqual(row['enrichment']['business_id'], 'b0')
+        self.assertEqual(row['enrichment']['enrichment_source'], 'facebook_scraper')
+        self.assertEqual((row['business_update']['email'], row['business_update']['email_source']),
+                         ('hello@brightsmiles.com', 'facebook'))
+
+    def test_linkedin_verification_columns_kept(self):
+        client = make_client()
+        buffer = EnrichmentWriteBuffer(client, register_atexit=False)
+        buffer.save_linkedin_enrichment('b1', 'c1', dict(LINKEDIN, is_safe=True, bouncer_status='deliverable',
+                                                         bouncer_score=99, email_verified=True))
+        buffer.flush()
+
+        enrichment = client.rpc.call_args.args[1]['p_rows'][0]['enrichment']
+        self.assertTrue(enrichment['is_safe'])
+        self.assertEqual((enrichment['bouncer_status'], enrichment['bouncer_score']), ('deliverable', 99))
+        self.assertTrue(enrichment['email_verified'])
+
+    def test_linkedin_email_source_derived(self):
+        def source(**data):
+            return linkedin_enrichment_row('b1', 'c1', dict(LINKEDIN, **data))['business_update']['email_source']
+
+        self.assertEqual(source(email_verified_source='linkedin_public'), 'linkedin')
+        self.assertEqual(source(email_quality_tier='linkedin_verified'), 'linkedin_verified')
+        self.assertEqual(source(is_safe=True), 'linkedin_verified')
+        self.assertEqual(linkedin_enrichment_row('b1', 'c1', dict(LINKEDIN, is_safe=True), 'facebook')
+                         ['business_update']['email_source'], 'facebook')
+
+    def test_size_flush(self):
+        client = make_client()
+        buffer = EnrichmentWriteBuffer(client, max_rows=2, register_atexit=False)
+        buffer.save_facebook_enrichment('b1', 'c1', FACEBOOK)
+        buffer.save_linkedin_enrichment('b2', 'c1', LINKEDIN)
+
+        self.assertEqual(sorted(c.args[0] for c in client.rpc.call_args_list),
+                         ['save_facebook_enrichment_atomic_batch', 'save_linkedin_enrichment_atomic_batch'])
+        self.assertEqual(buffer.get_stats()['size_flushes'], 1)
+
+    def test_time_flush(self):
+        client = make_client()
+        with EnrichmentWriteBuffer(client, max_wait=0.05, register_atexit=False) as buffer:
+            buffer.save_linkedin_enrichment('b1', 'c1', LINKEDIN)
+            deadline = time.time() + 2
+            while not client.rpc.called and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(client.rpc.called)
+            self.assertEqual(buffer.get_stats()['timer_flushes'], 1)
+
+    def test_close_flushes_and_rejects_new_writes(self):
+        client = make_client()
+        buffer = EnrichmentWriteBuffer(client, register_atexit=False)
+        buffer.save_linkedin_enrichment('b1', 'c1', LINKEDIN)
+        stats = buffer.close()
+
+        self.assertEqual((stats['written'], stats['waiting']), (1, 0))
+        with self.assertRaises(RuntimeError):
+            buffer.save_linkedin_enrichment('b2', 'c1', LINKEDIN)
+
+    def test_one_business_update_per_business(self):
+        client = make_client()
+        buffer = EnrichmentWriteBuffer(client, register_atexit=False)
+        buffer.save_facebook_enrichment('b1', 'c1', dict(FACEBOOK, primary_email=None))
+        buffer.save_facebook_enrichment('b1', 'c1', FACEBOOK)
+        buffer.flush()
+
+        updates = [r['business_update'] for r in client.rpc.call_args.args[1]['p_rows']]
+        self.assertEqual(updates[0]['email'], 'hello@brightsmiles.com')
+        self.assertEqual(updates[0]['attempts'], 2)
+        self.assertNotIn('enrichment_attempts', updates[0])
+        self.assertIsNone(updates[1])
+
+    def test_failed_flush_is_retried(self):
+        client = make_client(fail_times=1)
+        buffer = EnrichmentWriteBuffer(client, register_atexit=False)
+        buffer.save_facebook_enrichment('b1', 'c1', FACEBOOK)
+
+        self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(buffer.get_stats()['waiting'], 1)
+        self.assertEqual(buffer.flush(), 1)
+
+    def test_bad_row_isolated_after_first_failure(self):
+        client = Mock()
+
+        def execute():
+            rows = client.rpc.call_args.args[1]['p_rows']
+            if any(r['enrichment']['business_id'] == 'bad' for r in rows):
+                raise ValueError('invalid input syntax for type uuid')
+            return Mock(data=len(rows))
+
+        client.rpc.return_value.execute.side_effect = execute
+        buffer = EnrichmentWriteBuffer(client, max_attempts=2, register_atexit=False)
+        for business_id in ('b1', 'b2', 'bad', 'b3'):
+            buffer.save_facebook_enrichment(business_id, 'c1', FACEBOOK)
+
+        self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(buffer.flush(), 3)
+        stats = buffer.get_stats()
+        self.assertEqual((stats['written'], stats['dropped'], stats['waiting']), (3, 1, 0))
+
+    def test_direct_backend(self):
+        client = make_client()
+        backend = Mock()
+        backend.call_function.return_value = 1
+        buffer = EnrichmentWriteBuffer(client, register_atexit=False, backend=backend)
+        buffer.save_linkedin_enrichment('b1', 'c1', LINKEDIN)
+
+        self.assertEqual(buffer.flush(), 1)
+        name, rows = backend.call_function.call_args.args
+        self.assertEqual(name, 'save_linkedin_enrichment_atomic_batch')
+        self.assertEqual(rows[0]['business_update']['email'], 'sarah@brightsmiles.com')
+        client.rpc.assert_not_called()
+
+    def test_rows_dropped_after_max_attempts(self):
+        client = make_client(fail_times=10)
+        buffer = EnrichmentWriteBuffer(client, max_attempts=2, register_atexit=False)
+        buffer.save_facebook_enrichment('b1', 'c1', FACEBOOK)
+        stats = buffer.close()
+
+        self.assertEqual((stats['written'], stats['dropped'], stats['waiting']), (0, 1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Experiment Rollup
+Tests per-variant delta aggregation and the watermarked run
+"""
+
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.experiment_rollup import ExperimentRollup, aggregate_deltas
+
+
+BUSINESSES = {
+    'b1': {'id': 'b1', 'campaign_id': 'c1', 'icebreaker_variant': 'control'},
+    'b2': {'id': 'b2', 'campaign_id': 'c1', 'icebreaker_variant': 'question'},
+    'b3': {'id': 'b3', 'campaign_id': 'c1', 'icebreaker_variant': None},
+}
+
+
+def event(business_id, event_type, **fields):
+    return dict({'business_id': business_id, 'event_type': event_type, 'organization_id': 'o1',
+                 'campaign_id': 'c1'}, **fields)
+
+
+def by_variant(deltas):
+    return {d['variant_name']: (d['opens'], d['replies'], d['positive_replies']) for d in deltas}
+
+
+class TestAggregateDeltas(unittest.TestCase):
+    """Test in-memory aggregation"""
+
+    def test_counts_per_variant(self):
+        events = [event('b1', 'email_opened'), event('b2', 'email_opened'), event('b2', 'reply_received'),
+                  event('b2', 'lead_interested'), event('b3', 'email_opened')]
+        self.assertEqual(by_variant(aggregate_deltas(events, BUSINESSES, set())),
+                         {'control': (2, 0, 0), 'question': (1, 1, 1)})
+
+    def test_business_counted_once_per_metric(self):
+        events = [event('b1', 'email_opened')] * 4 + [event('b1', 'reply_received')]
+        deltas = aggregate_deltas(events, BUSINESSES, {('b1', 'replies')})
+        self.assertEqual(by_variant(deltas), {'control': (1, 0, 0)})
+
+    def test_skips_unmatched_and_irrelevant_events(self):
+        events = [event('missing', 'email_opened'), event('b1', 'link_clicked'),
+                  event(None, 'email_opened')]
+        self.assertEqual(aggregate_deltas(events, BUSINESSES, set()), [])
+
+    def test_campaign_falls_back_to_business(self):
+        deltas = aggregate_deltas([event('b1', 'email_opened', campaign_id=None)], BUSINESSES, set())
+        self.assertEqual(deltas[0]['campaign_id'], 'c1')
+
+
+class TestExperimentRollupRun(unittest.TestCase):
+    """Test the watermarked run"""
+
+    def make_rollup(self, watermark):
+        client = Mock()
+        rollup = ExperimentRollup(client, lag_seconds=30,
+                                  clock=lambda: datetime(2026, 10, 18, 12, 0, 30, tzinfo=timezone.utc))
+        rollup.get_watermark = Mock(return_value=watermark)
+        rollup._fetch_events = Mock(return_value=[event('b1', 'email_opened'), event('b2', 'email_opened')])
+        rollup._fetch_businesses = Mock(return_value=BUSINESSES)
+        rollup._already_counted = Mock(return_value={('b2', 'opens')})
+        return rollup, client
+
+    def test_applies_deltas_and_watermark_in_one_call(self):
+        rollup, client = self.make_rollup('2026-10-18T11:00:00+00:00')
+        stats = rollup.run()
+
+        name, params = client.rpc.call_args.args
+        self.assertEqual(name, 'apply_icebreaker_experiment_deltas')
+        self.assertEqual(by_variant(params['p_deltas']), {'control': (1, 0, 0)})
+        self.assertEqual(params['p_watermark'], '2026-10-18T12:00:00+00:00')
+        rollup._fetch_events.assert_called_once_with('2026-10-18T11:00:00+00:00', '2026-10-18T12:00:00+00:00')
+        self.assertEqual(stats['events'], 2)
+
+    def test_already_counted_pages_through_history(self):
+        client = Mock()
+        query = (client.table.return_value.select.return_value.in_.return_value.in_.return_value
+                 .lte.return_value.order.return_value.range.return_value)
+        query.execute.side_effect = [Mock(data=[event('b1', 'email_opened')] * 2),
+                                     Mock(data=[event('b2', 'reply_received')]),
+                                     Mock(data=[event('b3', 'email_opened')])]
+        rollup = ExperimentRollup(client, page_size=2, id_chunk_size=2)
+
+        counted = rollup._already_counted(['b1', 'b2', 'b3'], '2026-10-18T11:00:00+00:00')
+
+        self.assertEqual(counted, {('b1', 'opens'), ('b2', 'replies'), ('b3', 'opens')})
+        chunks = [c.args[1] for c in client.table.return_value.select.return_value.in_.call_args_list]
+        self.assertEqual(chunks, [['b1', 'b2'], ['b1', 'b2'], ['b3']])
+
+    def test_nothing_to_do_inside_lag_window(self):
+        rollup, client = self.make_rollup('2026-10-18T12:00:00+00:00')
+        self.assertEqual(rollup.run()['events'], 0)
+        client.rpc.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Facebook Enrichment Queue
+Tests size/timer batch cutting, page de-duplication and draining on close
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.facebook_enrichment_queue import FacebookEnrichmentQueue
+from lead_generation.modules.facebook_page_index import FacebookPageCache
+
+
+def scrape_results(batch):
+    return [{'facebook_url': b['facebook_url'], 'primary_email': f"info@{b['id']}.com", 'success': True}
+            for b in batch]
+
+
+class TestFacebookEnrichmentQueue(unittest.TestCase):
+    """Test the continuous Facebook enrichment queue"""
+
+    def setUp(self):
+        self.results = {}
+        self.lock = threading.Lock()
+
+    def on_result(self, business, enrichment):
+        with self.lock:
+            self.results[business['id']] = enrichment
+
+    def business(self, n):
+        return {'id': f"b{n}", 'facebook_url': f"https://www.facebook.com/page{n}"}
+
+    def test_full_batches_cut_by_size(self):
+        scrape = Mock(side_effect=scrape_results)
+        with FacebookEnrichmentQueue(scrape, self.on_result, max_batch_size=5, max_wait=60) as fb_queue:
+            fb_queue.put_many([self.business(n) for n in range(12)])
+
+        self.assertEqual(sorted(len(call.args[0]) for call in scrape.call_args_list), [2, 5, 5])
+        self.assertEqual(len(self.results), 12)
+        self.assertEqual(fb_queue.stats['size_flushes'], 2)
+        self.assertEqual(fb_queue.stats['close_flushes'], 1)
+
+    def test_partial_batch_cut_by_timer(self):
+        scraped = threading.Event()
+
+        def scrape(batch):
+            scraped.set()
+            return scrape_results(batch)
+
+        fb_queue = FacebookEnrichmentQueue(scrape, self.on_result, max_batch_size=15, max_wait=0.05).start()
+        fb_queue.put(self.business(1))
+
+        # Scraped before close() - the discovery phase keeps running meanwhile
+        self.assertTrue(scraped.wait(2))
+        fb_queue.close()
+        self.assertEqual(fb_queue.stats['timer_flushes'], 1)
+        self.assertIn('b1', self.results)
+
+    def test_late_discoveries_join_the_same_queue(self):
+        scrape = Mock(side_effect=scrape_results)
+        fb_queue = FacebookEnrichmentQueue(scrape, self.on_result, max_batch_size=3, max_wait=60).start()
+        fb_queue.put_many([self.business(1), self.business(2)])   # Phase 1 pages
+        time.sleep(0.01)
+        fb_queue.put(self.business(3))                            # found by discovery
+        fb_queue.close()
+
+        self.assertEqual(scrape.call_count, 1)
+        self.assertEqual(sorted(self.results), ['b1', 'b2', 'b3'])
+
+    def test_shared_page_scraped_once(self):
+        scrape = Mock(side_effect=scrape_results)
+        fb_queue = FacebookEnrichmentQueue(scrape, self.on_result, max_batch_size=5, max_wait=60).start()
+        self.assertTrue(fb_queue.put({'id': 'b1', 'facebook_url': 'https://www.facebook.com/JoesPizza'}))
+        self.assertFalse(fb_queue.put({'id': 'b2', 'facebook_url': 'https://m.facebook.com/joespizza/?ref=x'}))
+        self.assertFalse(fb_queue.put({'id': 'b3', 'facebook_url': 'https://www.facebook.com/sharer.php'}))
+        fb_queue.close()
+
+        self.assertEqual(scrape.call_count, 1)
+        self.assertEqual(self.results['b2']['primary_email'], 'info@b1.com')
+        self.assertEqual(self.results['b2']['facebook_url'], 'https://m.facebook.com/joespizza/?ref=x')
+        self.assertNotIn('b3', self.results)
+
+    def test_duplicate_after_completion_uses_result(self):
+        scrape = Mock(side_effect=scrape_results)
+        fb_queue = FacebookEnrichmentQueue(scrape, self.on_result, max_batch_size=1, max_wait=60).start()
+        fb_queue.put(self.business(1))
+        deadline = time.time() + 2
+        while 'b1' not in self.results and time.time() < deadline:
+            time.sleep(0.01)
+        fb_queue.put({'id': 'b9', 'facebook_url': 'https://facebook.com/page1'})
+        fb_queue.close()
+
+        self.assertEqual(scrape.call_count, 1)
+        self.assertEqual(self.results['b9']['primary_email'], 'info@b1.com')
+
+    def test_duplicate_after_not_found_counted_as_not_found(self):
+        fb_queue = FacebookEnrichmentQueue(Mock(return_value=[]), self.on_result, max_batch_size=1,
+                                           max_wait=60).start()
+        fb_queue.put(self.business(1))
+        deadline = time.time() + 2
+        while 'b1' not in self.results and time.time() < deadline:
+            time.sleep(0.01)
+        fb_queue.put({'id': 'b9', 'facebook_url': 'https://facebook.com/page1'})
+        fb_queue.close()
+
+        self.assertFalse(self.results['b9']['success'])
+        self.assertEqual((fb_queue.stats['not_found'], fb_queue.stats['enriched']), (2, 0))
+
+    def test_failed_batch_does_not_stop_queue(self):
+        calls = {'n': 0}
+
+        def scrape(batch):
+            calls['n'] += 1
+            if calls['n'] == 1:
+                raise Exception('actor crashed')
+            return scrape_results(batch)
+
+        with FacebookEnrichmentQueue(scrape, self.on_result, max_batch_size=2, max_wait=60,
+                                     max_parallel_batches=1) as fb_queue:
+            fb_queue.put_many([self.business(n) for n in range(4)])
+
+        self.assertEqual(fb_queue.stats['errors'], 2)
+        self.assertEqual(fb_queue.stats['enriched'], 2)
+        # Businesses of the failed batch still get a (failed) result
+        self.assertEqual(sorted(b for b, r in self.results.items() if not r['success']), ['b0', 'b1'])
+
+    def test_failed_batch_resolves_followers(self):
+        release = threading.Event()
+
+        def scrape(batch):
+            release.wait(2)
+            raise Exception('actor crashed')
+
+        fb_queue = FacebookEnrichmentQueue(scrape, self.on_result, max_batch_size=1, max_wait=60).start()
+        fb_queue.put(self.business(1))
+        fb_queue.put({'id': 'follower', 'facebook_url': 'https://facebook.com/page1'})
+        release.set()
+        fb_queue.close()
+
+        self.assertFalse(self.results['follower']['success'])
+        self.assertEqual(fb_queue.stats['errors'], 2)
+
+    def test_page_missing_from_results_resolved_as_not_found(self):
+        scrape = Mock(side_effect=lambda batch: scrape_results(batch[:1]))
+        fb_queue = FacebookEnrichmentQueue(scrape, self.on_result, max_batch_size=5, max_wait=60).start()
+        fb_queue.put_many([self.business(1), self.business(2)])
+        fb_queue.put({'id': 'follower', 'facebook_url': 'https://facebook.com/page2'})
+        fb_queue.close()
+
+        self.assertTrue(self.results['b1']['success'])
+        self.assertFalse(self.results['b2']['success'])
+        self.assertFalse(self.results['follower']['success'])
+        self.assertEqual(fb_queue.stats['not_found'], 2)
+
+    def test_page_cache_consulted(self):
+        cache = FacebookPageCache()
+        cache.set('https://www.facebook.com/page1', {'primary_email': 'cached@b1.com', 'success': True})
+        scrape = Mock(side_effect=scrape_results)
+
+        with FacebookEnrichmentQueue(scrape, self.on_result, page_cache=cache) as fb_queue:
+            fb_queue.put_many([self.business(1), self.business(2)])
+
+        self.assertEqual([b['id'] for b in scrape.call_args.args[0]], ['b2'])
+        self.assertEqual(self.results['b1']['primary_email'], 'cached@b1.com')
+
+    def test_put_after_close_raises(self):
+        fb_queue = FacebookEnrichmentQueue(Mock(return_value=[]), self.on_result).start()
+        fb_queue.close()
+        with self.assertRaises(RuntimeError):
+            fb_queue.put(self.business(1))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
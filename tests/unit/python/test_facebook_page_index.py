@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Facebook Page Index
+Tests page URL canonicalization and cached page enrichment
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.cache_store import MISS
+from lead_generation.modules.facebook_page_index import FacebookPageCache, canonicalize_facebook_url
+
+
+class TestCanonicalization(unittest.TestCase):
+    """Test canonical page keys"""
+
+    def test_vanity_url_variants(self):
+        variants = [
+            'https://www.facebook.com/JoesDentistry',
+            'https://m.facebook.com/joesdentistry/?ref=page_internal',
+            'http://web.facebook.com/joesdentistry/about/',
+            'https://www.facebook.com/pg/JoesDentistry/posts/',
+            'facebook.com/joesdentistry#reviews',
+            'https://fb.com/joesdentistry',
+        ]
+        for url in variants:
+            self.assertEqual(canonicalize_facebook_url(url)['key'], 'name:joesdentistry', url)
+
+    def test_numeric_page_ids(self):
+        variants = [
+            'https://www.facebook.com/pages/Joes-Dentistry/123456789',
+            'https://www.facebook.com/pages/category/Dentist/Joes-Dentistry-123456789/',
+            'https://www.facebook.com/profile.php?id=123456789&sk=about',
+            'https://www.facebook.com/people/Joe-Smith/123456789/',
+            'https://www.facebook.com/p/Joes-Dentistry-123456789/',
+            'https://m.facebook.com/123456789',
+        ]
+        for url in variants:
+            canonical = canonicalize_facebook_url(url)
+            self.assertEqual(canonical['key'], 'id:123456789', url)
+            self.assertEqual(canonical['url'], 'https://www.facebook.com/123456789')
+
+    def test_non_page_urls(self):
+        for url in ['https://www.facebook.com/sharer.php?u=x', 'https://www.facebook.com/groups/123',
+                    'https://www.facebook.com/', 'https://notfacebook.com/joes', None]:
+            self.assertIsNone(canonicalize_facebook_url(url), url)
+
+
+class TestPageCache(unittest.TestCase):
+    """Test cached enrichment across URL forms and campaigns"""
+
+    def scrape_result(self, url):
+        return {'facebook_url': url, 'page_name': "Joe's Dentistry", 'emails': ['joe@joesdentistry.com'],
+                'primary_email': 'joe@joesdentistry.com', 'phone_numbers': ['(555) 123-4567'], 'success': True}
+
+    def test_same_page_scraped_once(self):
+        cache = FacebookPageCache()
+        scrape = Mock(side_effect=lambda batch: [self.scrape_result(b['facebook_url']) for b in batch])
+
+        pairs = cache.scrape_with_cache([
+            {'id': 'b1', 'facebook_url': 'https://m.facebook.com/JoesDentistry/'},
+            {'id': 'b2', 'facebook_url': 'https://www.facebook.com/joesdentistry?ref=br_rs'},
+        ], scrape)
+        later = cache.scrape_with_cache([
+            {'id': 'b3', 'facebook_url': 'https://facebook.com/pg/joesdentistry/about'},
+        ], scrape)
+
+        self.assertEqual(scrape.call_count, 1)
+        self.assertEqual(scrape.call_args.args[0][0]['facebook_url'], 'https://www.facebook.com/joesdentistry')
+        self.assertEqual(sorted(b['id'] for b, _ in pairs), ['b1', 'b2'])
+        business, enrichment = later[0]
+        self.assertEqual(enrichment['primary_email'], 'joe@joesdentistry.com')
+        self.assertEqual(enrichment['facebook_url'], 'https://facebook.com/pg/joesdentistry/about')
+        self.assertEqual(cache.get_stats()['actor_pages_saved'], 1)
+
+    def test_failed_scrapes_not_cached(self):
+        cache = FacebookPageCache()
+        scrape = Mock(return_value=[{'facebook_url': 'https://www.facebook.com/broken',
+                                     'success': False, 'error_message': 'timeout'}])
+
+        pairs = cache.scrape_with_cache([{'id': 'b1', 'facebook_url': 'https://www.facebook.com/broken'}], scrape)
+
+        self.assertEqual(len(pairs), 1)
+        self.assertFalse(pairs[0][1]['success'])
+        self.assertIs(cache.get('https://www.facebook.com/broken'), MISS)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Icebreaker Batch Mode
+Tests the offline batch path end to end against the local stand-in backend
+"""
+
+import json
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.icebreaker_batch import (
+    IcebreakerBatchJob,
+    LocalBatchBackend,
+    parse_batch_output,
+    save_icebreakers,
+)
+
+
+BUSINESSES = [{'id': f"b{n}", 'name': f"Business {n}", 'category': 'Dentist'} for n in range(5)]
+
+
+def build_messages(business):
+    return [{'role': 'system', 'content': 'Write icebreakers.'},
+            {'role': 'user', 'content': f"Business: {business['name']}"}]
+
+
+def respond(body):
+    name = body['messages'][-1]['content'].replace('Business: ', '')
+    if name == 'Business 3':
+        raise RuntimeError('content filter')
+    content = json.dumps({'icebreaker': f"Hi {name}", 'subject_line': 'quick question'})
+    return {'choices': [{'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 20, 'completion_tokens': 10, 'total_tokens': 30}}
+
+
+class TestIcebreakerBatchJob(unittest.TestCase):
+    """Test submit, poll and collect"""
+
+    def test_full_offline_path(self):
+        backend = LocalBatchBackend(respond, polls_until_complete=2)
+        sleep = Mock()
+        job = IcebreakerBatchJob(backend, build_messages, model='gpt-4o-mini', sleep=sleep,
+                                 max_requests_per_batch=2)
+
+        results, errors = job.run(BUSINESSES)
+
+        self.assertEqual(len(backend.batches), 3)
+        self.assertEqual(sorted(results), ['b0', 'b1', 'b2', 'b4'])
+        self.assertEqual(results['b0']['icebreaker'], 'Hi Business 0')
+        self.assertEqual(results['b0']['usage']['total_tokens'], 30)
+        self.assertEqual(errors, {'b3': 'content filter'})
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_request_lines(self):
+        job = IcebreakerBatchJob(LocalBatchBackend(respond), build_messages, model='gpt-4o', temperature=0.3)
+        line = job.build_lines(BUSINESSES[:1])[0]
+
+        self.assertEqual(line['custom_id'], 'b0')
+        self.assertEqual(line['url'], '/v1/chat/completions')
+        self.assertEqual(line['body']['temperature'], 0.3)
+        self.assertEqual(line['body']['response_format'], {'type': 'json_object'})
+
+    def test_timeout(self):
+        backend = LocalBatchBackend(respond, polls_until_complete=10 ** 6)
+        job = IcebreakerBatchJob(backend, build_messages, timeout=0, sleep=Mock())
+
+        with self.assertRaises(TimeoutError):
+            job.run(BUSINESSES[:1])
+
+    def test_unparseable_output(self):
+        output = json.dumps({'custom_id': 'b1', 'response': {'status_code': 200, 'body': {
+            'choices': [{'message': {'content': 'not json'}}]}}})
+        backend = LocalBatchBackend(respond)
+        backend.files['file-out'] = output
+        job = IcebreakerBatchJob(backend, build_messages)
+
+        results, errors = job.collect({'batch_1': {'id': 'batch_1', 'status': 'completed',
+                                                   'output_file_id': 'file-out', 'error_file_id': None}})
+
+        self.assertEqual(results, {})
+        self.assertIn('unparseable', errors['b1'])
+
+    def test_parse_http_errors(self):
+        output = json.dumps({'custom_id': 'b1', 'response': {'status_code': 400, 'body': {
+            'error': {'message': 'bad request'}}}})
+        self.assertEqual(parse_batch_output(output), {'b1': {'error': 'bad request'}})
+
+
+class TestSaveIcebreakers(unittest.TestCase):
+    """Test bulk writes"""
+
+    def test_chunks_rpc_calls(self):
+        client = Mock()
+        client.rpc.return_value.execute.return_value = Mock(data=2)
+        results = {f"b{n}": {'icebreaker': f"Hi {n}", 'subject_line': 'q'} for n in range(4)}
+
+        updated = save_icebreakers(client, results, variant='short_question', chunk_size=2, model='gpt-4o')
+
+        self.assertEqual(updated, 4)
+        self.assertEqual(client.rpc.call_count, 2)
+        name, params = client.rpc.call_args.args
+        self.assertEqual(name, 'bulk_update_icebreakers')
+        self.assertEqual(params['p_rows'][0]['icebreaker_variant'], 'short_question')
+        self.assertEqual(params['p_rows'][0]['icebreaker_metadata']['generation_mode'], 'batch')
+
+    def test_long_subject_line_truncated(self):
+        client = Mock()
+        client.rpc.return_value.execute.return_value = Mock(data=1)
+
+        save_icebreakers(client, {'b1': {'icebreaker': 'Hi', 'subject_line': 'x' * 400}})
+
+        self.assertEqual(len(client.rpc.call_args.args[1]['p_rows'][0]['subject_line']), 255)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Icebreaker Cache
+Tests content-addressed keys, deterministic reruns and prompt invalidation
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.icebreaker_cache import IcebreakerCache, icebreaker_cache_key
+
+
+CONTACT = {'id': 'c1', 'first_name': 'Sarah', 'headline': 'VP of Marketing', 'company_name': 'TechFlow'}
+SUMMARIES = ['TechFlow provides workflow automation tools.']
+PROMPT = 'Write a short, human icebreaker.'
+
+
+class TestIcebreakerCacheKey(unittest.TestCase):
+    """Test which inputs split the cache"""
+
+    def key(self, **overrides):
+        args = dict(contact=CONTACT, website_summaries=SUMMARIES, prompt=PROMPT, model='gpt-4o',
+                    temperature=0.7, variant='control')
+        args.update(overrides)
+        return icebreaker_cache_key(**args)
+
+    def test_irrelevant_fields_ignored(self):
+        self.assertEqual(self.key(), self.key(contact={**CONTACT, 'id': 'c2', 'created_at': 'now'}))
+        self.assertEqual(self.key(), self.key(website_summaries=SUMMARIES + ['  ']))
+
+    def test_every_input_splits(self):
+        base = self.key()
+        for override in ({'contact': {**CONTACT, 'first_name': 'Mike'}},
+                         {'website_summaries': ['Other company.']},
+                         {'prompt': PROMPT + ' Be brief.'},
+                         {'model': 'gpt-4o-mini'},
+                         {'temperature': 0.2},
+                         {'variant': 'short_question'},
+                         {'organization_data': {'product_name': 'ReignOver'}}):
+            self.assertNotEqual(base, self.key(**override), override)
+
+
+class TestIcebreakerCache(unittest.TestCase):
+    """Test cached generation"""
+
+    def generate(self, cache, generate, prompt=PROMPT):
+        return cache.generate_with_cache(CONTACT, SUMMARIES, generate, prompt=prompt,
+                                         model='gpt-4o', temperature=0.7)
+
+    def test_rerun_is_free(self):
+        cache = IcebreakerCache()
+        generate = Mock(return_value={'icebreaker': 'Hey Sarah', 'subject_line': 'quick q'})
+
+        first = self.generate(cache, generate)
+        first['icebreaker'] = 'mutated by caller'
+        second = self.generate(cache, generate)
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(second['icebreaker'], 'Hey Sarah')
+        self.assertEqual(cache.get_stats()['icebreakers_reused'], 1)
+
+    def test_errors_not_cached(self):
+        cache = IcebreakerCache()
+        generate = Mock(side_effect=[{'error': 'insufficient_quota'}, {'icebreaker': 'Hey Sarah'}])
+
+        self.assertIn('error', self.generate(cache, generate))
+        self.assertEqual(self.generate(cache, generate)['icebreaker'], 'Hey Sarah')
+
+    def test_prompt_change_invalidates(self):
+        cache = IcebreakerCache()
+        generate = Mock(side_effect=[{'icebreaker': 'old'}, {'icebreaker': 'new'}])
+
+        self.generate(cache, generate)
+        result = self.generate(cache, generate, prompt='A reloaded ICEBREAKER_PROMPT')
+
+        self.assertEqual(result['icebreaker'], 'new')
+        self.assertEqual(cache.get_stats()['prompt_changes'], 1)
+        self.assertEqual(len(cache.cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
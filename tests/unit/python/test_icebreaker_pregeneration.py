@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Icebreaker Pre-generation
+Tests background generation, skipping rules and bulk saves per variant
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.icebreaker_pregeneration import IcebreakerPregenerator
+
+
+def business(n, **fields):
+    return dict({'id': f"b{n}", 'name': f"Business {n}", 'email': f"owner{n}@example.com"}, **fields)
+
+
+def generate(b):
+    return {'icebreaker': f"Hi {b['name']}", 'subject_line': 'quick question'}
+
+
+class TestIcebreakerPregenerator(unittest.TestCase):
+    """Test queueing and saving"""
+
+    def test_generates_and_saves_on_close(self):
+        save = Mock(side_effect=lambda results, variant: len(results))
+        with IcebreakerPregenerator(generate, save=save, save_batch_size=100) as pregen:
+            self.assertEqual(pregen.submit_many([business(n) for n in range(3)]), 3)
+
+        results, variant = save.call_args.args
+        self.assertEqual(sorted(results), ['b0', 'b1', 'b2'])
+        self.assertEqual(variant, 'control')
+        self.assertEqual(pregen.get_stats()['saved'], 3)
+
+    def test_skipping_rules(self):
+        pregen = IcebreakerPregenerator(generate, save=Mock(return_value=0))
+        self.assertTrue(pregen.submit(business(1)))
+        self.assertFalse(pregen.submit(business(1)))
+        self.assertFalse(pregen.submit(business(2, email=None)))
+        self.assertFalse(pregen.submit(business(3, icebreaker='Already done')))
+        self.assertTrue(pregen.submit(business(4, icebreaker='Already done'), force=True))
+        stats = pregen.close()
+
+        self.assertEqual((stats['submitted'], stats['duplicates'], stats['skipped_no_email'],
+                          stats['skipped_existing']), (2, 1, 1, 1))
+        self.assertFalse(pregen.submit(business(5)))
+
+    def test_saves_per_variant(self):
+        save = Mock(side_effect=lambda results, variant: len(results))
+        pregen = IcebreakerPregenerator(generate, save=save,
+                                        variant=lambda b: 'short' if b['id'] in ('b0', 'b2') else 'control')
+        pregen.submit_many([business(n) for n in range(4)])
+        pregen.close()
+
+        saved = {call.args[1]: sorted(call.args[0]) for call in save.call_args_list}
+        self.assertEqual(saved, {'short': ['b0', 'b2'], 'control': ['b1', 'b3']})
+
+    def test_variant_resolved_once_for_prompt_and_save(self):
+        calls = []
+
+        def next_variant(b):
+            calls.append(b['id'])
+            return 'short' if len(calls) == 1 else 'control'
+
+        prompted = {}
+
+        def generate_with_variant(b):
+            prompted[b['id']] = b['icebreaker_variant']
+            return generate(b)
+
+        save = Mock(side_effect=lambda results, variant: len(results))
+        pregen = IcebreakerPregenerator(generate_with_variant, save=save, variant=next_variant)
+        pregen.submit(business(0))
+        pregen.close()
+
+        self.assertEqual(calls, ['b0'])
+        self.assertEqual(prompted, {'b0': 'short'})
+        self.assertEqual(save.call_args.args[1], 'short')
+
+    def test_flushes_when_batch_full(self):
+        save = Mock(side_effect=lambda results, variant: len(results))
+        pregen = IcebreakerPregenerator(generate, save=save, max_workers=1, save_batch_size=2)
+        pregen.submit_many([business(n) for n in range(5)])
+        pregen.close()
+
+        self.assertEqual([len(call.args[0]) for call in save.call_args_list], [2, 2, 1])
+
+    def test_runs_in_background(self):
+        release = threading.Event()
+
+        def slow(b):
+            release.wait(5)
+            return generate(b)
+
+        pregen = IcebreakerPregenerator(slow, save=Mock(return_value=1))
+        pregen.submit(business(1))
+        self.assertEqual(pregen.get_stats()['generated'], 0)
+        release.set()
+        self.assertEqual(pregen.close()['generated'], 1)
+
+    def test_failures_not_saved(self):
+        def flaky(b):
+            if b['id'] == 'b1':
+                raise RuntimeError('quota')
+            return {'icebreaker': '', 'error': 'empty'} if b['id'] == 'b2' else generate(b)
+
+        save = Mock(side_effect=lambda results, variant: len(results))
+        pregen = IcebreakerPregenerator(flaky, save=save)
+        pregen.submit_many([business(n) for n in range(3)])
+        stats = pregen.close()
+
+        self.assertEqual((stats['generated'], stats['failed'], stats['saved']), (1, 2, 1))
+
+    def test_default_writer_uses_bulk_rpc(self):
+        client = Mock()
+        client.rpc.return_value.execute.return_value = Mock(data=1)
+        pregen = IcebreakerPregenerator(generate, client=client, model='gpt-4o-mini')
+        pregen.submit(business(1))
+        pregen.close()
+
+        name, params = client.rpc.call_args.args
+        self.assertEqual(name, 'bulk_update_icebreakers')
+        self.assertEqual(params['p_rows'][0]['icebreaker_metadata'],
+                         {'generation_mode': 'pregenerated', 'model': 'gpt-4o-mini'})
+
+    def test_requires_writer(self):
+        with self.assertRaises(ValueError):
+            IcebreakerPregenerator(generate)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
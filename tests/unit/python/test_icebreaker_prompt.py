@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Icebreaker Prompt
+Tests stable prompt prefixes and cached-token accounting
+"""
+
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.icebreaker_prompt import (
+    PromptCacheStats,
+    build_icebreaker_messages,
+    prefix_fingerprint,
+    prompt_cache_usage,
+)
+
+
+PROMPT = 'Write a short, human icebreaker. Return JSON with icebreaker and subject_line.'
+
+
+class TestPromptLayout(unittest.TestCase):
+    """Test that per-contact data stays out of the prefix"""
+
+    def test_prefix_identical_across_contacts(self):
+        org_a = {'product_name': 'Lead Engine', 'tone': 'casual', 'id': 'org-1'}
+        org_b = {'tone': 'casual', 'product_name': 'Lead Engine', 'updated_at': '2026-10-01'}
+        first = build_icebreaker_messages(PROMPT, {'first_name': 'Sarah', 'name': 'Bright Dental'},
+                                          ['Family dentist in Miami.'], org_a)
+        second = build_icebreaker_messages(PROMPT, {'first_name': 'Mike', 'name': 'Oak Plumbing'},
+                                           ['Plumber in Austin.'], org_b)
+
+        self.assertEqual(prefix_fingerprint(first), prefix_fingerprint(second))
+        self.assertEqual(first[:-1], second[:-1])
+        self.assertIn('Sarah', first[-1]['content'])
+        self.assertNotIn('Sarah', ''.join(m['content'] for m in first[:-1]))
+
+    def test_example_kept_in_prefix(self):
+        messages = build_icebreaker_messages(PROMPT, {'first_name': 'Sarah'}, example='{"icebreaker": "Hey"}')
+        self.assertEqual([m['role'] for m in messages], ['system', 'user', 'assistant', 'user'])
+
+
+class TestCachedTokenAccounting(unittest.TestCase):
+    """Test usage parsing and totals"""
+
+    def test_usage_object_and_dict(self):
+        usage = SimpleNamespace(prompt_tokens=1500, completion_tokens=80,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=1280))
+        self.assertEqual(prompt_cache_usage(usage),
+                         {'prompt_tokens': 1500, 'cached_tokens': 1280, 'uncached_tokens': 220,
+                          'completion_tokens': 80})
+        self.assertEqual(prompt_cache_usage({'prompt_tokens': 900, 'completion_tokens': 50})['cached_tokens'], 0)
+
+    def test_stats_cost_reflects_cache_discount(self):
+        cached = PromptCacheStats('gpt-4o')
+        uncached = PromptCacheStats('gpt-4o')
+        cached.record({'prompt_tokens': 2000, 'completion_tokens': 100,
+                       'prompt_tokens_details': {'cached_tokens': 1024}}, latency=1.0)
+        uncached.record({'prompt_tokens': 2000, 'completion_tokens': 100}, latency=2.0)
+
+        stats = cached.get_stats()
+        self.assertAlmostEqual(stats['cache_hit_ratio'], 0.512)
+        self.assertAlmostEqual(uncached.get_stats()['cost_usd'] - stats['cost_usd'], 1024 * 0.00125 / 1000)
+        self.assertEqual(stats['avg_latency'], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
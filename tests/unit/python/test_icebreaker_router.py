@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Icebreaker Router
+Tests tier selection, escalation and template fallback
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.icebreaker_router import IcebreakerRouter, signal_score, template_icebreaker
+
+
+SPARSE = {'first_name': 'Sarah', 'name': 'Bright Smiles'}
+ORDINARY = {'first_name': 'Sarah', 'name': 'Bright Smiles', 'category': 'Dentist', 'city': 'Miami',
+            'rating': 4.8, 'reviews_count': 120}
+RICH = dict(ORDINARY, headline='Owner, cosmetic dentistry')
+RICH_SUMMARIES = ["Bright Smiles has served Miami families since 1998 with cosmetic and general dentistry. " * 12]
+
+
+def ok(model, contact, summaries):
+    return {'icebreaker': f"{model} line for {contact['first_name']}", 'subject_line': 'hi'}
+
+
+class TestRouting(unittest.TestCase):
+    """Test which tier a contact is routed to"""
+
+    def test_sparse_contact_uses_template(self):
+        generate = Mock(side_effect=ok)
+        result = IcebreakerRouter(generate).generate_icebreaker(SPARSE)
+
+        generate.assert_not_called()
+        self.assertEqual(result['routing']['tier'], 'template')
+        self.assertEqual(result['icebreaker'], template_icebreaker(SPARSE)['icebreaker'])
+
+    def test_ordinary_contact_uses_small_model(self):
+        result = IcebreakerRouter(ok).generate_icebreaker(ORDINARY)
+        self.assertEqual(result['routing']['tier'], 'small')
+        self.assertTrue(result['icebreaker'].startswith('gpt-4o-mini'))
+
+    def test_rich_contact_uses_large_model(self):
+        result = IcebreakerRouter(ok).generate_icebreaker(RICH, RICH_SUMMARIES)
+        self.assertEqual(result['routing']['tier'], 'large')
+        self.assertEqual(result['routing']['model'], 'gpt-4o')
+
+    def test_signal_score_features(self):
+        signal = signal_score(RICH, RICH_SUMMARIES)
+        self.assertIn('rich_summary', signal['features'])
+        self.assertEqual(signal_score({})['score'], 0)
+
+
+class TestEscalation(unittest.TestCase):
+    """Test escalation and fallback"""
+
+    def test_unusable_small_result_escalates(self):
+        def generate(model, contact, summaries):
+            if model == 'gpt-4o-mini':
+                return {'icebreaker': ''}
+            return ok(model, contact, summaries)
+
+        router = IcebreakerRouter(generate)
+        result = router.generate_icebreaker(ORDINARY)
+
+        self.assertEqual(result['routing'], {'tier': 'large', 'initial_tier': 'small',
+                                             'score': result['routing']['score'], 'model': 'gpt-4o'})
+        self.assertEqual(router.get_stats()['escalations'], 1)
+        self.assertEqual(router.get_stats()['tiers']['small']['failures'], 1)
+        self.assertEqual(router.get_stats()['routed'], {'template': 0, 'small': 1, 'large': 0})
+
+    def test_model_errors_fall_back_to_template(self):
+        router = IcebreakerRouter(Mock(side_effect=RuntimeError('quota')))
+        result = router.generate_icebreaker(ORDINARY)
+
+        self.assertEqual(result['routing']['tier'], 'template')
+        self.assertIn('Bright Smiles', result['icebreaker'])
+        self.assertEqual(router.get_stats()['served'], {'template': 1, 'small': 0, 'large': 0})
+
+    def test_latency_per_tier(self):
+        ticks = iter([0.0, 1.5])
+        router = IcebreakerRouter(ok, clock=lambda: next(ticks))
+        router.generate_icebreaker(ORDINARY)
+
+        self.assertEqual(router.get_stats()['tiers']['small']['avg_latency'], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
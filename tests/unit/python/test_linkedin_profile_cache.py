@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for LinkedIn Profile Cache
+Tests URL canonicalization and actor call avoidance
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.cache_store import MISS
+from lead_generation.modules.linkedin_profile_cache import (
+    LinkedInProfileCache,
+    canonicalize_linkedin_url,
+)
+
+
+class TestCanonicalization(unittest.TestCase):
+    """Test canonical LinkedIn URLs"""
+
+    def test_url_variants_collapse(self):
+        variants = [
+            'https://www.linkedin.com/company/acme-corp',
+            'https://www.linkedin.com/company/acme-corp/',
+            'http://linkedin.com/company/Acme-Corp/about/',
+            'https://uk.linkedin.com/company/acme-corp?trk=public_profile',
+            'https://m.linkedin.com/company/acme-corp/#main',
+            'linkedin.com/company/acme-corp',
+        ]
+        for url in variants:
+            self.assertEqual(canonicalize_linkedin_url(url), 'https://www.linkedin.com/company/acme-corp', url)
+
+    def test_personal_profiles(self):
+        self.assertEqual(canonicalize_linkedin_url('https://de.linkedin.com/in/John-Doe-123/'),
+                         'https://www.linkedin.com/in/john-doe-123')
+
+    def test_non_profile_urls(self):
+        for url in ['https://www.linkedin.com/feed', 'https://linkedin.com/jobs/view/1',
+                    'https://facebook.com/company/acme', 'https://notlinkedin.com/in/x', None]:
+            self.assertIsNone(canonicalize_linkedin_url(url), url)
+
+
+class TestScrapeWithCache(unittest.TestCase):
+    """Test that cache hits skip the actor"""
+
+    def test_hits_skip_actor(self):
+        cache = LinkedInProfileCache()
+        scrape = Mock(return_value=[
+            {'url': 'https://www.linkedin.com/company/acme-corp', 'name': 'Acme Corp'},
+        ])
+
+        first = cache.scrape_with_cache(['https://www.linkedin.com/company/acme-corp/',
+                                         'https://uk.linkedin.com/company/acme-corp'], scrape)
+        second = cache.scrape_with_cache(['http://linkedin.com/company/ACME-CORP'], scrape)
+
+        scrape.assert_called_once_with(['https://www.linkedin.com/company/acme-corp'])
+        self.assertEqual(first['https://uk.linkedin.com/company/acme-corp']['name'], 'Acme Corp')
+        self.assertEqual(second['http://linkedin.com/company/ACME-CORP']['name'], 'Acme Corp')
+        self.assertEqual(cache.get_stats()['actor_items_saved'], 2)
+
+    def test_missing_items_cached_negative(self):
+        cache = LinkedInProfileCache()
+        scrape = Mock(return_value=[{'url': 'https://www.linkedin.com/company/a', 'name': 'A'}])
+
+        results = cache.scrape_with_cache(['https://www.linkedin.com/company/a',
+                                           'https://www.linkedin.com/company/gone'], scrape)
+
+        self.assertIsNone(results['https://www.linkedin.com/company/gone'])
+        self.assertIsNone(cache.get('https://www.linkedin.com/company/gone'))
+
+    def test_redirected_item_matched_by_input_url(self):
+        cache = LinkedInProfileCache()
+        scrape = Mock(return_value=[{'url': 'https://www.linkedin.com/company/acme-inc',
+                                     'inputUrl': 'https://www.linkedin.com/company/acme-corp',
+                                     'name': 'Acme'}])
+
+        results = cache.scrape_with_cache(['https://www.linkedin.com/company/acme-corp'], scrape)
+
+        self.assertEqual(results['https://www.linkedin.com/company/acme-corp']['name'], 'Acme')
+        self.assertEqual(cache.get('https://www.linkedin.com/company/acme-corp')['name'], 'Acme')
+
+    def test_empty_batch_is_not_cached(self):
+        cache = LinkedInProfileCache()
+
+        cache.scrape_with_cache(['https://www.linkedin.com/company/a'], Mock(return_value=[]))
+
+        self.assertIs(cache.get('https://www.linkedin.com/company/a'), MISS)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
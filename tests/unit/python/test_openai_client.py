@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for OpenAI Client
+Tests RPM/TPM admission, usage reconciliation and 429 backoff
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.openai_client import (
+    ConcurrentOpenAIClient,
+    RateLimiter,
+    estimate_request_tokens,
+    is_quota_error,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, message='Rate limit reached', headers=None):
+        super().__init__(message)
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def completion(total_tokens=100):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"icebreaker": "Hi"}'))],
+                           usage=SimpleNamespace(total_tokens=total_tokens))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test request and token buckets"""
+
+    def test_request_budget(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rpm=60, tpm=1_000_000, clock=clock, sleep=clock.sleep)
+        for _ in range(60):
+            self.assertEqual(limiter.try_acquire(10), 0)
+
+        self.assertAlmostEqual(limiter.try_acquire(10), 1.0)
+        self.assertAlmostEqual(limiter.acquire(10), 1.0)
+
+    def test_token_budget(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rpm=1000, tpm=6000, clock=clock, sleep=clock.sleep)
+        self.assertEqual(limiter.try_acquire(5000), 0)
+
+        # 4000 more tokens need 3000 refilled at 100 tokens/s
+        self.assertAlmostEqual(limiter.try_acquire(4000), 30.0)
+
+    def test_adjust_and_pause(self):
+        clock = FakeClock()
+        limiter = RateLimiter(rpm=1000, tpm=6000, clock=clock, sleep=clock.sleep)
+        limiter.try_acquire(1000)
+        limiter.adjust(-800)   # used 200, estimated 1000
+        self.assertAlmostEqual(limiter.tokens, 5800)
+
+        limiter.pause(5)
+        self.assertAlmostEqual(limiter.try_acquire(1), 5.0)
+
+
+class TestConcurrentOpenAIClient(unittest.TestCase):
+    """Test the chat wrapper"""
+
+    def make(self, create, **kwargs):
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        clock = FakeClock()
+        return ConcurrentOpenAIClient(client=client, clock=clock, sleep=Mock(side_effect=clock.sleep), **kwargs)
+
+    def test_estimate_includes_completion_allowance(self):
+        messages = [{'role': 'user', 'content': 'x' * 400}]
+        self.assertGreater(estimate_request_tokens(messages, 'gpt-4o', max_tokens=300), 300)
+
+    def test_retries_rate_limits_with_retry_after(self):
+        create = Mock(side_effect=[RateLimitError(headers={'retry-after': '2'}), completion()])
+        client = self.make(create)
+
+        response = client.chat('gpt-4o', [{'role': 'user', 'content': 'hi'}])
+
+        self.assertEqual(response.usage.total_tokens, 100)
+        client.sleep.assert_any_call(2.0)
+        stats = client.get_stats()
+        self.assertEqual((stats['rate_limited'], stats['retries'], stats['tokens_used']), (1, 1, 100))
+
+    def test_quota_errors_not_retried(self):
+        create = Mock(side_effect=RateLimitError('Error code: 429 - insufficient_quota'))
+        client = self.make(create)
+
+        with self.assertRaises(RateLimitError):
+            client.chat('gpt-4o', [{'role': 'user', 'content': 'hi'}])
+        self.assertEqual(create.call_count, 1)
+        self.assertTrue(is_quota_error(RateLimitError('insufficient_quota')))
+
+    def test_gives_up_after_max_retries(self):
+        create = Mock(side_effect=RateLimitError())
+        client = self.make(create, max_retries=2)
+
+        with self.assertRaises(RateLimitError):
+            client.chat('gpt-4o-mini', [{'role': 'user', 'content': 'hi'}])
+        self.assertEqual(create.call_count, 3)
+
+    def test_failed_attempts_refund_token_estimate(self):
+        create = Mock(side_effect=[RateLimitError(headers={'retry-after': '0'}), ValueError('invalid request')])
+        client = self.make(create, tpm=100_000)
+
+        with self.assertRaises(ValueError):
+            client.chat('gpt-4o', [{'role': 'user', 'content': 'hi'}])
+        self.assertAlmostEqual(client.limiter_for('gpt-4o').tokens, 100_000)
+
+    def test_chat_many_keeps_order(self):
+        def create(model, messages, **kwargs):
+            if messages[0]['content'] == 'bad':
+                raise ValueError('invalid request')
+            return SimpleNamespace(content=messages[0]['content'], usage=SimpleNamespace(total_tokens=5))
+
+        client = self.make(create, max_workers=4)
+        results = client.chat_many([{'model': 'gpt-4o', 'messages': [{'role': 'user', 'content': c}]}
+                                    for c in ['a', 'bad', 'c']])
+
+        self.assertEqual(results[0].content, 'a')
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2].content, 'c')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Postgres COPY Backend
+Tests COPY payload rendering, merge SQL and the staging/merge sequence
+"""
+
+import threading
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.postgres_copy import (
+    PostgresCopyBackend,
+    array_literal,
+    build_copy_csv,
+    build_merge_sql,
+    get_copy_backend,
+    quote_ident,
+)
+
+
+TYPES = {'place_id': 'text', 'name': 'text', 'rating': 'numeric', 'emails': 'ARRAY', 'raw_data': 'jsonb',
+         'has_website': 'boolean'}
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.log.append(sql)
+        if 'information_schema' in sql:
+            self.result = list(TYPES.items())
+        elif sql.startswith('INSERT'):
+            self.result = [(True,), (False,), (True,)]
+
+    def copy_expert(self, sql, body):
+        self.log.append(sql)
+        self.log.append(body.getvalue())
+
+    def fetchall(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self):
+        self.log = []
+        self.committed = False
+
+    def cursor(self):
+        return FakeCursor(self.log)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn):
+        pass
+
+
+def make_backend():
+    backend = PostgresCopyBackend.__new__(PostgresCopyBackend)
+    backend.pool = FakePool()
+    backend._types = {}
+    backend._lock = threading.Lock()
+    return backend
+
+
+class TestRendering(unittest.TestCase):
+    """Test COPY payload and SQL rendering"""
+
+    def test_copy_csv_types(self):
+        body = build_copy_csv([{'place_id': 'p1', 'name': 'Joe "The" Plumber', 'rating': 4.5,
+                                'emails': ['a@x.com', None], 'raw_data': {'k': 'v'}, 'has_website': True},
+                               {'place_id': 'p2', 'name': '', 'rating': None}],
+                              list(TYPES), TYPES).getvalue().splitlines()
+
+        self.assertEqual(body[0], '"p1","Joe ""The"" Plumber","4.5","{""a@x.com"",NULL}",'
+                                  '"{""k"": ""v""}","true"')
+        # '' stays an empty string, None becomes NULL
+        self.assertEqual(body[1], '"p2","",,,,')
+
+    def test_array_literal_escaping(self):
+        self.assertEqual(array_literal(['a"b', 'c\\d']), '{"a\\"b","c\\\\d"}')
+
+    def test_merge_sql(self):
+        sql = build_merge_sql('gmaps_businesses', '_stage', ['place_id', 'name'], ['place_id'])
+        self.assertIn('ON CONFLICT ("place_id") DO UPDATE SET "name" = EXCLUDED."name"', sql)
+        self.assertTrue(sql.endswith('RETURNING (xmax = 0) AS inserted'))
+        self.assertIn('DO NOTHING', build_merge_sql('t', 's', ['place_id'], ['place_id']))
+
+    def test_quote_ident(self):
+        self.assertEqual(quote_ident('gmaps_scraper.facebook_enrichments'), '"gmaps_scraper"."facebook_enrichments"')
+        self.assertEqual(quote_ident('bad"name'), '"bad""name"')
+
+
+class TestCopyUpsert(unittest.TestCase):
+    """Test the staging + merge sequence"""
+
+    def test_copy_then_merge(self):
+        backend = make_backend()
+        counts = backend.copy_upsert('gmaps_businesses', [{'place_id': 'p1', 'name': 'A'},
+                                                          {'place_id': 'p2', 'name': 'B'},
+                                                          {'place_id': 'p1', 'name': 'A2'},
+                                                          {'place_id': 'p3', 'name': 'C'},
+                                                          {'name': 'no key'}], ['place_id'])
+
+        log = backend.pool.conn.log
+        self.assertEqual(counts, {'inserted': 2, 'updated': 1})
+        self.assertTrue(log[1].startswith('CREATE TEMP TABLE "_copy_stage_gmaps_businesses" ON COMMIT DROP'))
+        self.assertTrue(log[2].startswith('COPY "_copy_stage_gmaps_businesses" ("place_id", "name")'))
+        self.assertEqual(log[3].splitlines(), ['"p1","A2"', '"p2","B"', '"p3","C"'])
+        self.assertTrue(log[4].startswith('INSERT INTO "gmaps_businesses"'))
+        self.assertTrue(backend.pool.conn.committed)
+
+    def test_unknown_columns_rejected(self):
+        with self.assertRaises(ValueError):
+            make_backend().copy_upsert('gmaps_businesses', [{'place_id': 'p1', 'typo': 1}], ['place_id'])
+
+    def test_backend_disabled_without_dsn(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(get_copy_backend())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for SERP Cache
+Tests key normalization, TTL/LRU behaviour, negative caching and discovery integration
+"""
+
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.cache_store import MISS, SupabaseCacheBackend, TTLCache
+from lead_generation.modules.serp_cache import SerpCache, serp_key
+from lead_generation.modules.serp_discovery import UnifiedSerpDiscovery, build_combined_query
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test the shared cache store"""
+
+    def test_lru_eviction(self):
+        cache = TTLCache('test', ttl_seconds=60, max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIs(cache.get('b'), MISS)
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    @patch('lead_generation.modules.cache_store.time.time')
+    def test_expiry_and_negative_ttl(self, mock_time):
+        mock_time.return_value = 1000.0
+        cache = TTLCache('test', ttl_seconds=100, negative_ttl_seconds=10)
+        cache.set('found', {'url': 'x'})
+        cache.set('missing', None)
+
+        mock_time.return_value = 1005.0
+        self.assertIsNone(cache.get('missing'))
+        mock_time.return_value = 1050.0
+        self.assertIs(cache.get('missing'), MISS)
+        self.assertEqual(cache.get('found'), {'url': 'x'})
+
+    def test_backend_read_through(self):
+        backend = Mock()
+        backend.get.return_value = {'value': None, 'is_negative': True, 'expires_at': 9e12}
+        cache = TTLCache('serp', ttl_seconds=60, backend=backend)
+
+        self.assertIsNone(cache.get('k'))
+        self.assertIsNone(cache.get('k'))
+        backend.get.assert_called_once_with('serp', 'k')
+
+    def test_backend_errors_are_swallowed(self):
+        client = MagicMock()
+        client.table.side_effect = Exception('PostgREST down')
+        backend = SupabaseCacheBackend(client)
+
+        self.assertIsNone(backend.get('serp', 'k'))
+        backend.set('serp', 'k', None, True, 9e9)
+
+
+class TestSerpCache(unittest.TestCase):
+    """Test normalized keys and cached lookups"""
+
+    def test_key_normalization(self):
+        self.assertEqual(serp_key("  JOE'S Dentistry & Co. ", 'Miami', 'linkedin.com'),
+                         serp_key("Joe’s dentistry and co", 'miami', 'LinkedIn.com'))
+        self.assertNotEqual(serp_key('Joes', 'Miami', 'linkedin.com'),
+                            serp_key('Joes', 'Miami', 'facebook.com'))
+
+    def test_negative_results_not_refetched(self):
+        cache = SerpCache()
+        fetch = Mock(return_value=None)
+
+        self.assertIsNone(cache.cached_lookup('Obscure Biz', 'Nowhere', 'linkedin.com', fetch))
+        self.assertIsNone(cache.cached_lookup('obscure biz', 'NOWHERE', 'linkedin.com', fetch))
+        fetch.assert_called_once()
+        self.assertEqual(cache.get_stats()['negative_hits'], 1)
+
+    def test_fetch_errors_not_cached(self):
+        cache = SerpCache()
+        with self.assertRaises(RuntimeError):
+            cache.cached_lookup('Biz', 'City', 'linkedin.com', Mock(side_effect=RuntimeError('apify')))
+        self.assertIs(cache.get('Biz', 'City', 'linkedin.com'), MISS)
+
+
+class TestDiscoveryCaching(unittest.TestCase):
+    """Test that unified discovery skips cached businesses"""
+
+    @patch('requests.post')
+    def test_second_campaign_hits_cache(self, mock_post):
+        query = build_combined_query('Acme Dental', 'Austin')
+        response = Mock()
+        response.status_code = 201
+        response.json.return_value = [{'searchQuery': {'term': query}, 'organicResults': [
+            {'url': 'https://www.linkedin.com/company/acme-dental', 'title': 'Acme Dental'}]}]
+        mock_post.return_value = response
+
+        cache = SerpCache()
+        businesses = [{'id': 'a', 'name': 'Acme Dental', 'city': 'Austin'},
+                      {'id': 'b', 'name': 'Nothing Here', 'city': 'Austin'}]
+        UnifiedSerpDiscovery(apify_key='k', cache=cache).discover(businesses)
+
+        second = UnifiedSerpDiscovery(apify_key='k', cache=cache)
+        discovered = second.discover([{'id': 'c', 'name': 'ACME dental', 'city': 'austin'},
+                                      {'id': 'd', 'name': 'Nothing Here', 'city': 'Austin'}])
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(second.stats['cache_hits'], 2)
+        self.assertEqual(discovered['c']['linkedin_url'], 'https://www.linkedin.com/company/acme-dental')
+        self.assertIsNone(discovered['d']['linkedin_url'])
+
+    @patch('requests.post')
+    def test_failed_batch_not_cached_as_negative(self, mock_post):
+        mock_post.side_effect = Exception('Network Error')
+        cache = SerpCache()
+
+        UnifiedSerpDiscovery(apify_key='k', cache=cache).discover([{'id': 'a', 'name': 'Acme', 'city': 'X'}])
+
+        self.assertIs(cache.get('Acme', 'X', 'social'), MISS)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Unified SERP Discovery
+Tests combined query building, social URL extraction and batched actor calls
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.serp_discovery import (
+    UnifiedSerpDiscovery,
+    apply_discoveries,
+    build_combined_query,
+    extract_social_urls,
+)
+
+
+class TestQueryAndExtraction(unittest.TestCase):
+    """Test query format and URL extraction from organic results"""
+
+    def test_combined_query_format(self):
+        query = build_combined_query("Joe's Dentistry", 'Miami')
+        self.assertEqual(query, '"Joe\'s Dentistry" Miami '
+                                '(site:facebook.com OR site:linkedin.com OR site:instagram.com)')
+
+    def test_extracts_all_sites_from_one_page(self):
+        results = [
+            {'url': 'https://www.facebook.com/sharer.php?u=joes', 'title': "Joe's Dentistry"},
+            {'url': 'https://m.facebook.com/joesdentistry/posts/123', 'title': "Joe's Dentistry - Posts"},
+            {'url': 'https://www.linkedin.com/in/joe-smith-dds', 'title': "Joe Smith - Joe's Dentistry"},
+            {'url': 'https://www.linkedin.com/company/joes-dentistry/about/', 'title': "Joe's Dentistry | LinkedIn"},
+            {'url': 'https://www.instagram.com/p/abc123/', 'title': "Joe's Dentistry on Instagram"},
+            {'url': 'https://www.instagram.com/joesdentistry/', 'title': "Joe's Dentistry (@joesdentistry)"},
+        ]
+
+        found = extract_social_urls("Joe's Dentistry", results)
+
+        self.assertEqual(found['facebook_url'], 'https://www.facebook.com/joesdentistry')
+        self.assertEqual(found['linkedin_url'], 'https://www.linkedin.com/company/joes-dentistry')
+        self.assertEqual(found['linkedin_profile_type'], 'company')
+        self.assertEqual(found['instagram_url'], 'https://www.instagram.com/joesdentistry')
+
+    def test_unrelated_results_ignored(self):
+        results = [{'url': 'https://www.facebook.com/otherbusiness', 'title': 'Totally Different Bakery'}]
+        self.assertIsNone(extract_social_urls("Joe's Dentistry", results)['facebook_url'])
+
+
+class TestBatchedDiscovery(unittest.TestCase):
+    """Test that one actor call serves every site for a batch"""
+
+    @patch('requests.post')
+    def test_single_call_feeds_facebook_and_linkedin(self, mock_post):
+        query_a = build_combined_query('Acme Dental', 'Austin')
+        query_b = build_combined_query('Beta Spa', 'Austin')
+        response = Mock()
+        response.status_code = 201
+        response.json.return_value = [
+            {'searchQuery': {'term': query_a}, 'organicResults': [
+                {'url': 'https://www.facebook.com/acmedental', 'title': 'Acme Dental'},
+                {'url': 'https://www.linkedin.com/company/acme-dental', 'title': 'Acme Dental | LinkedIn'},
+            ]},
+            {'searchQuery': {'term': query_b}, 'organicResults': []},
+        ]
+        mock_post.return_value = response
+
+        discovery = UnifiedSerpDiscovery(apify_key='test_key')
+        businesses = [
+            {'id': 'a', 'name': 'Acme Dental', 'city': 'Austin'},
+            {'id': 'b', 'name': 'Beta Spa', 'city': 'Austin', 'facebook_url': None},
+        ]
+        discovered = discovery.discover(businesses)
+        split = apply_discoveries(businesses, discovered)
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(mock_post.call_args.kwargs['json']['queries'], f"{query_a}\n{query_b}")
+        self.assertEqual([b['id'] for b in split['facebook']], ['a'])
+        self.assertEqual([b['id'] for b in split['linkedin']], ['a'])
+        self.assertTrue(businesses[0]['needs_enrichment'])
+        self.assertIsNone(discovered['b']['linkedin_url'])
+
+    @patch('requests.post')
+    def test_actor_failure_returns_empty_results(self, mock_post):
+        mock_post.side_effect = Exception('Network Error')
+
+        discovery = UnifiedSerpDiscovery(apify_key='test_key')
+        discovered = discovery.discover([{'id': 'a', 'name': 'Acme Dental', 'city': 'Austin'}])
+
+        self.assertIsNone(discovered['a']['facebook_url'])
+        self.assertEqual(discovery.stats['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Website Summary Cache
+Tests summary reuse across contacts, content changes and prompt versions
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.summary_cache import WebsiteSummaryCache, content_hash, prompt_version
+
+
+HOMEPAGE = "Joe's Dentistry offers family and cosmetic dentistry in Miami since 1998."
+
+
+class TestWebsiteSummaryCache(unittest.TestCase):
+    """Test per-domain summary caching"""
+
+    def test_colleagues_share_summary(self):
+        cache = WebsiteSummaryCache()
+        summarize = Mock(return_value='Family dental practice in Miami')
+
+        first = cache.get_or_summarize('https://www.joesdentistry.com/', HOMEPAGE, summarize)
+        second = cache.get_or_summarize('joesdentistry.com/about', HOMEPAGE + '  \n', summarize)
+
+        self.assertEqual(first, second)
+        self.assertEqual(summarize.call_count, 1)
+        self.assertEqual(cache.get_stats()['summaries_reused'], 1)
+
+    def test_changed_content_resummarized(self):
+        cache = WebsiteSummaryCache()
+        summarize = Mock(side_effect=['old summary', 'new summary'])
+
+        cache.get_or_summarize('joesdentistry.com', HOMEPAGE, summarize)
+        updated = cache.get_or_summarize('joesdentistry.com', HOMEPAGE + ' Now open Saturdays.', summarize)
+
+        self.assertEqual(updated, 'new summary')
+        self.assertEqual(summarize.call_count, 2)
+
+    def test_prompt_version_invalidates(self):
+        old = WebsiteSummaryCache(version='1')
+        new = WebsiteSummaryCache(version=prompt_version('Summarize this website in two sentences.'))
+        self.assertNotEqual(old.key('joesdentistry.com', HOMEPAGE), new.key('joesdentistry.com', HOMEPAGE))
+
+    def test_failed_summary_not_cached(self):
+        cache = WebsiteSummaryCache()
+        summarize = Mock(side_effect=[None, 'summary'])
+
+        self.assertIsNone(cache.get_or_summarize('joesdentistry.com', HOMEPAGE, summarize))
+        self.assertEqual(cache.get_or_summarize('joesdentistry.com', HOMEPAGE, summarize), 'summary')
+
+    def test_concurrent_callers_summarize_once(self):
+        cache = WebsiteSummaryCache()
+        calls = []
+
+        def summarize(content):
+            calls.append(content)
+            time.sleep(0.05)
+            return 'summary'
+
+        threads = [threading.Thread(target=cache.get_or_summarize, args=('joesdentistry.com', HOMEPAGE, summarize))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+
+    def test_summarize_pages_skips_empty(self):
+        cache = WebsiteSummaryCache()
+        summaries = cache.summarize_pages('joesdentistry.com', [HOMEPAGE, '   ', 'Contact us'],
+                                          lambda content: f"summary of {len(content)} chars")
+        self.assertEqual(len(summaries), 2)
+
+    def test_content_hash_ignores_whitespace(self):
+        self.assertEqual(content_hash('a  b\nc'), content_hash(' a b c '))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Summary Trimming
+Tests token budgets, relevance ranking and order preservation
+"""
+
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.summary_trimming import split_sentences, trim_summaries, sentence_tokens
+
+
+CONTACT = {'first_name': 'Sarah', 'headline': 'Owner, cosmetic dentistry', 'company_name': 'Bright Smiles',
+           'city': 'Miami'}
+
+SUMMARIES = [
+    "Bright Smiles is a family dental office in Miami. Parking is available behind the building. "
+    "The office was renovated last spring with new flooring. Our cosmetic dentistry team offers veneers "
+    "and whitening with results in 2 visits.",
+    "We accept most insurance plans. Cookie policy and privacy terms apply to this website. "
+    "Bright Smiles is a family dental office in Miami.",
+]
+
+
+class TestSummaryTrimming(unittest.TestCase):
+    """Test budgeted trimming"""
+
+    def test_under_budget_unchanged(self):
+        self.assertEqual(trim_summaries(SUMMARIES, CONTACT, token_budget=10000), SUMMARIES)
+
+    def test_trimmed_to_budget(self):
+        trimmed = trim_summaries(SUMMARIES, CONTACT, token_budget=45)
+        self.assertLessEqual(sum(sentence_tokens(s) for s in trimmed), 45 + len(trimmed))
+
+    def test_relevant_sentences_kept_in_order(self):
+        trimmed = trim_summaries(SUMMARIES, CONTACT, token_budget=45)
+        text = ' '.join(trimmed)
+
+        self.assertIn('cosmetic dentistry team', text)
+        self.assertNotIn('Cookie policy', text)
+        self.assertLess(text.index('family dental office'), text.index('cosmetic dentistry team'))
+
+    def test_duplicate_sentences_dropped(self):
+        trimmed = trim_summaries(SUMMARIES, CONTACT, token_budget=80)
+        self.assertEqual(' '.join(trimmed).count('family dental office in Miami'), 1)
+
+    def test_summary_without_sentence_breaks_truncated(self):
+        summary = ' '.join(['cosmetic dentistry and family care in Miami'] * 80)
+
+        trimmed = trim_summaries([summary], CONTACT, token_budget=50)
+
+        self.assertEqual(len(trimmed), 1)
+        self.assertTrue(summary.startswith(trimmed[0]))
+        self.assertLessEqual(sentence_tokens(trimmed[0]), 50)
+        self.assertGreater(sentence_tokens(trimmed[0]), 40)
+
+    def test_split_sentences(self):
+        self.assertEqual(split_sentences('Open daily. Call (555) 234-5678! Dr. Smith leads the team.'),
+                         ['Open daily.', 'Call (555) 234-5678!', 'Dr. Smith leads the team.'])
+
+    def test_empty_input(self):
+        self.assertEqual(trim_summaries(None, CONTACT), [])
+        self.assertEqual(trim_summaries(['  '], CONTACT), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
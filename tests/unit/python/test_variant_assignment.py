@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Variant Assignment
+Tests deterministic weighted bucketing and bulk writes
+"""
+
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+
+from lead_generation.modules.variant_assignment import VariantAssigner, apply_assignments, assign_campaign
+
+
+BUSINESSES = [{'id': f"b{n}", 'place_id': f"ChIJ{n:06d}"} for n in range(10000)]
+
+
+class TestVariantAssigner(unittest.TestCase):
+    """Test bucketing"""
+
+    def test_deterministic_and_order_independent(self):
+        first = VariantAssigner('exp-1', {'control': 1, 'question': 1})
+        second = VariantAssigner('exp-1', {'question': 1, 'control': 1})
+        self.assertEqual([first.assign(b['place_id']) for b in BUSINESSES[:200]],
+                         [second.assign(b['place_id']) for b in BUSINESSES[:200]])
+
+    def test_weights_respected(self):
+        assignments = VariantAssigner('exp-1', {'control': 0.5, 'question': 0.3, 'observation': 0.2}) \
+            .assign_many(BUSINESSES)
+        shares = {v: len(ids) / len(BUSINESSES) for v, ids in assignments.items()}
+
+        self.assertAlmostEqual(shares['control'], 0.5, delta=0.02)
+        self.assertAlmostEqual(shares['question'], 0.3, delta=0.02)
+        self.assertAlmostEqual(shares['observation'], 0.2, delta=0.02)
+
+    def test_experiment_id_reshuffles(self):
+        a = VariantAssigner('exp-1', {'control': 1, 'question': 1})
+        b = VariantAssigner('exp-2', {'control': 1, 'question': 1})
+        differing = sum(a.assign(x['place_id']) != b.assign(x['place_id']) for x in BUSINESSES[:1000])
+        self.assertGreater(differing, 300)
+
+    def test_zero_weight_and_missing_place_id(self):
+        assigner = VariantAssigner('exp-1', {'control': 1, 'paused': 0})
+        self.assertEqual(assigner.assign_many([{'id': 'b1'}, {'place_id': 'no-id'}]), {'control': ['b1']})
+        with self.assertRaises(ValueError):
+            VariantAssigner('exp-1', {'control': 0})
+
+
+class TestBulkWrites(unittest.TestCase):
+    """Test writes go out in bulk"""
+
+    def test_apply_assignments(self):
+        client = Mock()
+        counts = apply_assignments(client, 'c1', {'control': ['b1', 'b2', 'b3'], 'question': ['b4']},
+                                   organization_id='o1', chunk_size=2)
+
+        self.assertEqual(counts, {'control': 3, 'question': 1})
+        table = client.table.return_value
+        variant_updates = [c for c in table.update.call_args_list if 'icebreaker_variant' in c.args[0]]
+        self.assertEqual(len(variant_updates), 3)
+        self.assertEqual(table.update.return_value.in_.call_args_list[0].args, ('id', ['b1', 'b2']))
+        rows = table.upsert.call_args.args[0]
+        self.assertEqual(rows[0], {'campaign_id': 'c1', 'organization_id': 'o1', 'variant_name': 'control',
+                                   'sample_size': 3})
+        self.assertEqual(table.upsert.call_args.kwargs, {'on_conflict': 'campaign_id,variant_name'})
+        self.assertEqual(table.upsert.call_count, 1)
+
+    def test_apply_assignments_keeps_existing_organization(self):
+        client = Mock()
+        apply_assignments(client, 'c1', {'control': ['b1']})
+
+        rows = client.table.return_value.upsert.call_args.args[0]
+        self.assertNotIn('organization_id', rows[0])
+
+    def test_apply_assignments_zeroes_removed_variants(self):
+        client = Mock()
+        apply_assignments(client, 'c1', {'control': ['b1'], 'question': ['b2']})
+
+        table = client.table.return_value
+        table.update.assert_called_with({'sample_size': 0})
+        removed = table.update.return_value.eq
+        removed.assert_called_with('campaign_id', 'c1')
+        removed.return_value.not_.in_.assert_called_once_with('variant_name', ['control', 'question'])
+        removed.return_value.not_.in_.return_value.execute.assert_called_once()
+
+    def test_assign_campaign_pages(self):
+        client = Mock()
+        select = client.table.return_value.select.return_value.eq.return_value.range.return_value
+        select.execute.side_effect = [Mock(data=BUSINESSES[:2]), Mock(data=BUSINESSES[2:3])]
+
+        counts = assign_campaign(client, 'c1', 'exp-1', {'control': 1, 'question': 1}, page_size=2)
+
+        self.assertEqual(sum(counts.values()), 3)
+        self.assertEqual(select.execute.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)